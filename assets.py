@@ -0,0 +1,152 @@
+"""이미지 자산 캐시.
+
+PNG 원본은 처음 필요할 때(그 이미지를 쓰는 단계에 처음 들어갈 때) 한 번만 읽고,
+화면 너비에 맞게 줄인 JPEG 바이트를 (경로, 너비) 키로 메모리에 보관합니다. 캐시는
+전체 바이트 수로 크기가 제한되며, 가장 오래 쓰지 않은 항목부터 버립니다. 모든
+세션이 같은 캐시를 공유합니다.
+
+st.image는 JPEG/PNG/GIF 바이트이면서 본문 너비보다 작을 때만 받은 바이트를 그대로
+내보내고, 그 밖의 형식(WebP 등)은 화면을 그릴 때마다 PNG로 다시 인코딩합니다.
+그래서 WebP가 더 작더라도 쓰지 않고, 투명 배경은 흰색으로 합성해 JPEG로 저장합니다.
+
+인코딩한 결과는 DISK_CACHE_DIR에도 저장해 두므로, 프로세스가 다시 시작되어도
+원본보다 새로운 파일이 있으면 Pillow로 다시 인코딩하지 않고 바로 읽습니다. 디스크
+캐시 파일 이름에는 원본의 (BASE_DIR 기준) 상대 경로 해시가 들어가므로, 폴더가 달라
+이름이 같은 이미지끼리 덮어쓰지 않습니다.
+
+배포 전에 warm_up()(python assets.py)으로 모든 이미지를 미리 인코딩하면 캐시 크기를
+한 번 로그로 남깁니다.
+
+    python assets.py   # 배포 전에 image/의 모든 이미지를 미리 인코딩
+"""
+
+import glob
+import hashlib
+import io
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DISK_CACHE_DIR = os.path.join(BASE_DIR, ".cache", "images")
+
+DEFAULT_WIDTH = 704  # Streamlit 기본 레이아웃의 본문 너비(px)
+MAX_CACHE_BYTES = 8 * 1024 * 1024
+IMAGE_FORMAT = "JPEG"  # st.image가 다시 인코딩하지 않는 형식 (WebP는 매번 PNG로 바뀜)
+IMAGE_QUALITY = 80
+
+logger = logging.getLogger(__name__)
+
+_cache = OrderedDict()  # (경로, 너비) -> 인코딩된 바이트
+_cache_bytes = 0
+_lock = threading.Lock()
+
+
+def _resolve(path):
+    """상대 경로는 이 파일이 있는 폴더를 기준으로 해석합니다."""
+    return path if os.path.isabs(path) else os.path.join(BASE_DIR, path)
+
+
+def _disk_path(path, width):
+    """디스크 캐시 파일 경로. 같은 원본이면 절대/상대 경로로 불러도 같은 파일입니다."""
+    relative = os.path.relpath(_resolve(path), BASE_DIR).replace(os.sep, "/")
+    digest = hashlib.sha1(relative.encode("utf-8")).hexdigest()[:12]
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(DISK_CACHE_DIR, f"{name}-{digest}-{width}.jpg")
+
+
+def _read_disk(path, width):
+    """원본보다 새로운 디스크 캐시가 있으면 읽어 돌려줍니다. 원본이 없으면 FileNotFoundError."""
+    source_mtime = os.path.getmtime(_resolve(path))
+    cached = _disk_path(path, width)
+    try:
+        if os.path.getmtime(cached) >= source_mtime:
+            with open(cached, "rb") as f:
+                return f.read()
+    except OSError:
+        pass
+    return None
+
+
+def _write_disk(path, width, data):
+    """인코딩 결과를 디스크 캐시에 씁니다. 쓸 수 없는 환경이면 조용히 건너뜁니다."""
+    cached = _disk_path(path, width)
+    try:
+        os.makedirs(DISK_CACHE_DIR, exist_ok=True)
+        temp_path = f"{cached}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, cached)
+    except OSError:
+        pass
+
+
+def _encode(path, width):
+    """원본을 읽어 width 이하로 줄이고 IMAGE_FORMAT(JPEG)으로 인코딩합니다."""
+    from PIL import Image  # Pillow는 실제로 인코딩할 때만 불러옵니다.
+
+    with Image.open(_resolve(path)) as original:
+        image = original.copy()
+    if image.width > width:
+        image = image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+    if image.mode != "RGB":
+        # JPEG는 투명도를 지원하지 않으므로 흰 배경에 합성합니다.
+        background = Image.new("RGB", image.size, "white")
+        background.paste(image, mask=image.convert("RGBA").getchannel("A"))
+        image = background
+    buffer = io.BytesIO()
+    image.save(buffer, IMAGE_FORMAT, quality=IMAGE_QUALITY)
+    return buffer.getvalue()
+
+
+def get_image_bytes(path, width=DEFAULT_WIDTH):
+    """캐시된 이미지 바이트를 돌려줍니다. 파일이 없으면 FileNotFoundError가 발생합니다."""
+    global _cache_bytes
+    key = (path, width)
+    with _lock:
+        data = _cache.get(key)
+        if data is not None:
+            _cache.move_to_end(key)
+            return data
+
+    data = _read_disk(path, width)
+    if data is None:
+        data = _encode(path, width)
+        _write_disk(path, width, data)
+    with _lock:
+        if key not in _cache:
+            _cache[key] = data
+            _cache_bytes += len(data)
+            while _cache_bytes > MAX_CACHE_BYTES and len(_cache) > 1:
+                _, evicted = _cache.popitem(last=False)
+                _cache_bytes -= len(evicted)
+    return data
+
+
+def cache_report():
+    """현재 캐시 상태(항목 수, 총 바이트, 항목별 크기)를 돌려줍니다."""
+    with _lock:
+        return {
+            "entries": len(_cache),
+            "bytes": _cache_bytes,
+            "max_bytes": MAX_CACHE_BYTES,
+            "items": {f"{path}@{width}": len(data) for (path, width), data in _cache.items()},
+        }
+
+
+def warm_up(paths, width=DEFAULT_WIDTH):
+    """이미지를 미리 인코딩해 메모리와 디스크 캐시에 넣고 캐시 크기를 한 번 로그로 남깁니다."""
+    for path in paths:
+        try:
+            get_image_bytes(path, width)
+        except FileNotFoundError:
+            logger.warning("이미지 파일을 찾을 수 없습니다: %s", path)
+    report = cache_report()
+    logger.info("이미지 캐시 준비 완료: %d개, %.1f KB (%s)", report["entries"], report["bytes"] / 1024, IMAGE_FORMAT)
+    return report
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="[assets] %(message)s")
+    warm_up(sorted(os.path.relpath(path, BASE_DIR) for path in glob.glob(os.path.join(BASE_DIR, "image", "*.png"))))
@@ -0,0 +1,226 @@
+"""상담 엔진과 화면 재실행 비용을 재는 벤치마크 묶음 (기준값 대비 회귀 검사).
+
+시나리오마다 다음을 잽니다. 엔진 항목은 한 번 호출의 중앙값(µs), 화면 항목은
+같은 단계를 다시 그리는 AppTest 재실행 한 번의 중앙값(µs)입니다.
+
+- init_session: 새 상담 레코드 만들기 (engine.initialize_session)
+- recommend: 진통제 추천 단계의 결과 계산 (결과표 조회 + 상호작용 확인, engine.recommend)
+- expand_history: 결과 화면의 상담 기록 풀어내기 (가장 긴 경로, engine.expand_history)
+- intent_match: 직접 입력한 질문 하나를 질문 의도로 연결하기 (intents.match)
+- rerun:<단계>: 그 단계 화면의 스크립트 한 번 재실행 (Streamlit AppTest)
+
+    python benchmark.py                          # 측정만
+    python benchmark.py --save                   # benchmarks/core_baseline.json에 기준 저장
+    python benchmark.py --compare                # 기준보다 느려진 항목이 있으면 종료 코드 1
+    python benchmark.py --scenario warfarin --skip-app
+
+µs 단위 시간은 CPU와 파이썬 빌드마다 크게 다르므로 기준 파일은 저장소에 올리지 않습니다
+(.gitignore). 바꾸기 전 코드로 같은 컴퓨터(또는 같은 CI 작업)에서 --save 한 뒤, 바꾼
+코드로 --compare 합니다. 1ms보다 짧은 항목은 잡음이 커서 허용치를 넓게 잡고, 회귀로
+보이는 엔진 항목은 RETRIES번까지 다시 재서 가장 빠른 측정으로 판정합니다.
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+import engine
+import intents
+import simulate
+from scenario import PAINKILLERS, SCENARIOS, get_scenario
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BASE_DIR, "benchmarks", "core_baseline.json")
+REGRESSION_TOLERANCE = 1.3  # 기준 중앙값보다 30% 이상 느려지면 회귀로 표시
+SHORT_TOLERANCE = 1.6       # 1ms보다 짧은 항목의 허용치 (타이머/캐시 잡음이 큼)
+SHORT_US = 1000
+RETRIES = 2                 # 회귀로 보이는 엔진 항목을 다시 재는 횟수
+REPEAT = 7                  # 측정 반복 횟수 (반복마다 number번 호출한 평균, 그 중앙값을 씀)
+MIN_REPEAT_S = 0.05         # 반복 한 번이 적어도 이 시간 이상 걸리도록 호출 횟수를 정함
+
+
+# --- 측정 도구 ---
+def _time_calls(func, args_list):
+    started = time.perf_counter()
+    for args in args_list:
+        func(*args)
+    return (time.perf_counter() - started) / len(args_list)
+
+
+def measure(func, make_args, repeat=REPEAT):
+    """func(*make_args())의 한 번 호출 시간을 잽니다. 인자 준비 시간은 빼고 잽니다."""
+    number = 1
+    while _time_calls(func, [make_args() for _ in range(number)]) * number < MIN_REPEAT_S and number < 1_000_000:
+        number *= 4
+    samples = [_time_calls(func, [make_args() for _ in range(number)]) for _ in range(repeat)]
+    return {
+        "median_us": round(statistics.median(samples) * 1e6, 2),
+        "min_us": round(min(samples) * 1e6, 2),
+        "calls": number * repeat,
+    }
+
+
+# --- 엔진 측정용 상태 ---
+def longest_record(scenario, step=None):
+    """가능한 경로 중 기록이 가장 긴 레코드를 돌려줍니다. step을 주면 그 단계에 도착한 레코드 중에서 고릅니다."""
+    best = None
+    stack = [simulate.new_record(scenario)]
+    while stack:
+        record = stack.pop()
+        if record.step == step or (step is None and not simulate.step_choices(record, scenario)):
+            if best is None or len(record.history) > len(best.history):
+                best = record
+            continue
+        for func, arg in simulate.step_choices(record, scenario):
+            branch = record.copy()
+            func(branch, scenario, arg)
+            stack.append(branch)
+    return best
+
+
+def engine_cases(scenario):
+    """항목 이름 -> (잴 함수, 인자를 만드는 함수)."""
+    at_drug = longest_record(scenario, "drug_recommendation")
+    finished = longest_record(scenario)
+    drug = next(iter(PAINKILLERS))
+    return {
+        "init_session": (engine.initialize_session, lambda: (scenario,)),
+        "recommend": (engine.recommend, lambda: (at_drug.copy(), scenario, drug)),
+        "expand_history": (engine.expand_history, lambda: (finished, scenario)),
+        "intent_match": (intents.match, lambda: ("요즘 드시는 약 있으세요?", set(scenario["first_options"].values()))),
+    }
+
+
+def bench_engine(scenario):
+    """엔진 함수(순수 파이썬 부분)를 잽니다."""
+    return {name: measure(func, make_args) for name, (func, make_args) in engine_cases(scenario).items()}
+
+
+# --- 화면 재실행 측정 ---
+def bench_app(scenario_id, reruns):
+    """AppTest 세션 하나로 단계를 차례로 진행하며, 단계마다 같은 화면을 reruns번 다시 그립니다."""
+    from streamlit.testing.v1 import AppTest
+
+    import loadtest  # 로그/프로필 경로를 부하 테스트용으로 돌리고 위젯 표를 함께 씀
+
+    rng = random.Random(0)
+    at = AppTest.from_file(loadtest.APP_PATH, default_timeout=30)
+    at.query_params["scenario"] = scenario_id
+    at.run()
+    results = {}
+    while True:
+        step = at.session_state["record"].step
+        samples = []
+        for _ in range(reruns):
+            started = time.perf_counter()
+            at.run()
+            samples.append(time.perf_counter() - started)
+        if at.exception:
+            raise RuntimeError(f"앱 실행 중 예외: {at.exception[0].message}")
+        results[f"rerun:{step}"] = {
+            "median_us": round(statistics.median(samples) * 1e6, 2),
+            "min_us": round(min(samples) * 1e6, 2),
+            "calls": reruns,
+        }
+        if step == "start":
+            at.button[0].click()
+        elif step == "simulation_result":
+            at.button(key="view_summary_and_exit_final_v2").click()
+        elif step == "final_summary":
+            return results
+        else:
+            kind, widget_key, button_key = loadtest.STEP_WIDGETS[step]
+            widget = getattr(at, kind)(key=widget_key)
+            widget.set_value(loadtest.careful_policy(step, list(widget.options), rng))
+            at.button(key=button_key).click()
+        at.run()
+
+
+# --- 기준 비교 ---
+def allowed(base, tolerance=REGRESSION_TOLERANCE):
+    """기준 항목의 허용 중앙값 (µs). 1ms보다 짧은 항목은 SHORT_TOLERANCE 이상으로 넓힙니다."""
+    if base["median_us"] < SHORT_US:
+        tolerance = max(tolerance, SHORT_TOLERANCE)
+    return base["median_us"] * tolerance
+
+
+def remeasure(results, baseline, tolerance=REGRESSION_TOLERANCE, retries=RETRIES):
+    """허용치를 넘은 엔진 항목을 retries번까지 다시 재서, 가장 빠른 측정으로 results를 고칩니다.
+
+    화면 재실행 항목은 AppTest 세션을 처음부터 다시 진행해야 하므로 다시 재지 않습니다.
+    """
+    for scenario_id, benches in results.items():
+        base_benches = baseline.get(scenario_id, {})
+        cases = None
+        for name, result in benches.items():
+            base = base_benches.get(name)
+            if not base or name.startswith("rerun:"):
+                continue
+            for _ in range(retries):
+                if result["median_us"] <= allowed(base, tolerance):
+                    break
+                cases = cases or engine_cases(get_scenario(scenario_id))
+                retry = measure(*cases[name])
+                if retry["median_us"] < result["median_us"]:
+                    result = benches[name] = retry
+
+
+def compare(results, baseline, tolerance=REGRESSION_TOLERANCE):
+    """기준 결과와 비교해 중앙값이 허용치를 넘게 느려진 항목을 돌려줍니다."""
+    regressions = []
+    for scenario_id, benches in results.items():
+        base_benches = baseline.get(scenario_id, {})
+        for name, result in benches.items():
+            base = base_benches.get(name)
+            if base and result["median_us"] > allowed(base, tolerance):
+                regressions.append(
+                    f"{scenario_id} {name}: {base['median_us']}µs -> {result['median_us']}µs "
+                    f"(x{result['median_us'] / base['median_us']:.2f})"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="상담 엔진/화면 재실행 벤치마크")
+    parser.add_argument("--scenario", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument("--reruns", type=int, default=30, help="단계마다 화면을 다시 그리는 횟수")
+    parser.add_argument("--skip-app", action="store_true", help="AppTest 재실행 측정을 건너뜀")
+    parser.add_argument("--tolerance", type=float, default=REGRESSION_TOLERANCE, help=f"1ms 이상 항목의 허용 배율 (짧은 항목은 최소 x{SHORT_TOLERANCE})")
+    parser.add_argument("--save", nargs="?", const=DEFAULT_BASELINE, help="결과를 기준 JSON으로 저장")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, help="기준 JSON과 비교")
+    args = parser.parse_args()
+    if args.compare and not os.path.exists(args.compare):
+        parser.error(f"기준 파일이 없습니다: {args.compare} (바꾸기 전 코드로 먼저 --save 하세요)")
+
+    results = {}
+    for scenario_id in args.scenario:
+        results[scenario_id] = bench_engine(get_scenario(scenario_id))
+        if not args.skip_app:
+            results[scenario_id].update(bench_app(scenario_id, args.reruns))
+        for name, result in results[scenario_id].items():
+            print(f"{scenario_id:<16} {name:<34} median={result['median_us']:>10.2f}µs min={result['min_us']:>10.2f}µs calls={result['calls']}")
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"기준 결과 저장: {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        remeasure(results, baseline, args.tolerance)
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"[회귀] {line}")
+        if regressions:
+            sys.exit(1)
+        print(f"기준 대비 회귀 없음 (허용치 x{args.tolerance}, 1ms 미만 항목 x{max(args.tolerance, SHORT_TOLERANCE)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""반(class)별로 재현 가능한 환자 케이스 풀.
+
+반 코드와 시나리오로 정한 시드로 POOL_SIZE명의 숨겨진 상태를 NumPy로 한 번에
+만들어 두고(비트마스크 uint8 배열, 읽기 전용), 모든 세션이 같은 풀을 공유합니다.
+새 세션은 풀의 다음 칸을 받으므로 배정은 O(1)이고, 같은 반 코드는 언제 다시
+만들어도 같은 순서의 환자들이 나옵니다.
+
+    ?class=3A  -> 3반 A조 풀에서 환자를 차례로 배정
+    (반 코드가 없거나 쓸 수 없는 값이면 시나리오에 정해진 고정 환자)
+
+반 코드는 주소에서 그대로 오므로 normalize_class_code()로 앞뒤 공백을 떼고 길이와 글자를
+확인한 뒤에만 씁니다. 풀은 최근에 쓴 MAX_POOLS개만 메모리에 두고 가장 오래 쓰지 않은
+것부터 버립니다. (버린 반이 다시 오면 같은 시드로 다시 만들고 배정은 처음 칸부터 합니다)
+"""
+
+import itertools
+import threading
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+from session_record import CONDITION_KEYS
+
+POOL_SIZE = 4096
+MAX_POOLS = 256            # 메모리에 두는 (시나리오, 반 코드) 풀 수 (풀 하나 약 4KB)
+MAX_CLASS_CODE_LENGTH = 32
+
+_lock = threading.Lock()
+_pools = OrderedDict()  # (시나리오 id, 반 코드) -> {"seed", "masks", "counter"}
+
+# 비트마스크 -> 숨겨진 상태 사전 (CONDITION_KEYS 순서대로 하위 비트부터)
+_CONDITIONS_BY_MASK = tuple(
+    {key: bool(mask >> bit & 1) for bit, key in enumerate(CONDITION_KEYS)}
+    for mask in range(1 << len(CONDITION_KEYS))
+)
+
+
+def normalize_class_code(value):
+    """주소의 반 코드를 풀 키로 쓸 값으로 바꿉니다. 비었거나 너무 길거나 보이지 않는 글자가 있으면 None."""
+    code = (value or "").strip()
+    if not code or len(code) > MAX_CLASS_CODE_LENGTH or not code.isprintable():
+        return None
+    return code
+
+
+def class_seed(scenario_id, class_code):
+    """반 코드와 시나리오로 정해지는 시드 (프로세스나 서버가 달라도 같음)."""
+    return zlib.crc32(f"{scenario_id}:{class_code}".encode("utf-8"))
+
+
+def generate_masks(rates, seed, size=POOL_SIZE):
+    """상태별 확률(rates)로 size명의 숨겨진 상태 비트마스크를 만듭니다."""
+    rng = np.random.default_rng(seed)
+    draws = rng.random((size, len(CONDITION_KEYS)))
+    probabilities = np.array([rates.get(key, 0.0) for key in CONDITION_KEYS])
+    bits = (draws < probabilities).astype(np.uint8)
+    masks = (bits << np.arange(len(CONDITION_KEYS), dtype=np.uint8)).sum(axis=1).astype(np.uint8)
+    masks.flags.writeable = False
+    return masks
+
+
+def get_pool(scenario, class_code):
+    """반의 케이스 풀을 돌려줍니다. 처음 요청될 때 한 번만 만듭니다. (class_code는 normalize_class_code()의 값)"""
+    key = (scenario["id"], class_code)
+    with _lock:
+        pool = _pools.get(key)
+        if pool is None:
+            seed = class_seed(scenario["id"], class_code)
+            pool = _pools[key] = {
+                "seed": seed,
+                "masks": generate_masks(scenario["case_rates"], seed),
+                "counter": itertools.count(),
+            }
+            while len(_pools) > MAX_POOLS:
+                _pools.popitem(last=False)
+        else:
+            _pools.move_to_end(key)
+    return pool
+
+
+def mask_conditions(mask):
+    """비트마스크 하나를 숨겨진 상태 사전으로 바꿉니다."""
+    return dict(_CONDITIONS_BY_MASK[mask])
+
+
+def case_conditions(pool, number):
+    """풀의 number번째 환자의 숨겨진 상태입니다."""
+    return mask_conditions(pool["masks"][number % POOL_SIZE])
+
+
+def assign_case(scenario, class_code):
+    """새 세션에 반의 다음 환자를 배정하고 (케이스 번호, 숨겨진 상태)를 돌려줍니다."""
+    pool = get_pool(scenario, class_code)
+    with _lock:
+        number = next(pool["counter"]) % POOL_SIZE
+    return number, case_conditions(pool, number)
@@ -0,0 +1,206 @@
+"""상담 도중 새로 고치거나 다시 접속해도 이어서 하도록 세션을 저장하는 체크포인트.
+
+주소의 ?resume=토큰마다 진행 중인 판의 상태(시나리오, 단계, 비트 필드, 점수, 판 번호,
+힌트, 이벤트 기록)를 고정 배치의 바이너리 레코드(머리 12바이트 + 이벤트마다 2바이트)로
+저장합니다. 화면 전환마다 save()는 바이트열을 만들어 메모리 사전에 넣기만 하고,
+백그라운드 쓰기 스레드(writebehind)가 FLUSH_INTERVAL초마다 바뀐 체크포인트를
+SQLite(WAL 모드)에 씁니다. 쓰기에 실패한 체크포인트는 버리지 않고 다음에 다시 씁니다.
+load()는 메모리에서 먼저 찾으므로 같은 프로세스에서 반 전체가 한꺼번에 다시 접속해도
+디스크를 읽지 않고, 서버가 다시 시작된 뒤에만 파일에서 읽습니다.
+
+레코드 배치 (little-endian):
+    B 버전  B 시나리오 번호  B 단계 번호  B 숨겨진 상태  B 질문 비트  B 알게 된 정보 비트
+    h 점수  H 판 번호  B 힌트 질문 번호(없으면 0xFF)  B 이벤트 수  + H * 이벤트 수
+
+파일: profiles/checkpoints.db (MAX_AGE초보다 오래된 체크포인트는 처음 열 때 지움)
+
+    python checkpoint.py   # 레코드 크기와 저장/복원 시간 측정
+"""
+
+import atexit
+import os
+import sqlite3
+import struct
+import threading
+import time
+from array import array
+from collections import OrderedDict
+
+from scenario import SCENARIOS
+from session_record import QUESTION_IDS, SessionRecord
+from writebehind import WriteBehind
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(BASE_DIR, "profiles", "checkpoints.db")
+FLUSH_INTERVAL = 1.0
+MAX_CACHED = 4096      # 메모리에 들고 있는 체크포인트 수
+MAX_AGE = 24 * 3600    # 이보다 오래된 체크포인트는 지움 (초)
+
+VERSION = 1
+NO_HINT = 0xFF
+
+
+def _codes(saved, names):
+    """저장된 번호 목록 뒤에 아직 번호가 없는 이름을 처음 나온 순서대로 붙입니다."""
+    return saved + tuple(name for name in dict.fromkeys(names) if name not in saved)
+
+
+# 체크포인트에 이미 저장된 번호가 바뀌지 않도록, 번호는 아래 목록 뒤에 시나리오 등록 순서
+# (scenario.SCENARIOS, 새 시나리오는 맨 뒤에 등록)대로 이어 붙여 정합니다.
+SCENARIO_IDS = _codes(("warfarin", "warfarin_implant"), SCENARIOS)
+STEP_IDS = _codes(
+    (
+        "start", "patient_presentation", "first_question_follow_up", "action_decision",
+        "drug_recommendation", "simulation_result", "final_summary",
+    ),
+    (step for spec in SCENARIOS.values() for source, targets in spec["transitions"].items() for step in (source, *targets.values())),
+)
+assert len(SCENARIO_IDS) < 0x100 and len(STEP_IDS) < 0x100, "체크포인트의 시나리오/단계 번호는 1바이트입니다"
+HEADER = struct.Struct("<BBBBBBhHBB")
+
+_lock = threading.Lock()
+_cache = OrderedDict()  # 토큰 -> 레코드 바이트
+_conn_lock = threading.Lock()  # 쓰기 스레드와 load()가 연결 하나를 함께 씀
+_conn = None
+
+
+# --- 바이너리 레코드 ---
+def pack(scenario_id, record, play, hint):
+    """진행 중인 판을 바이트열로 만듭니다."""
+    history = record.history
+    return HEADER.pack(
+        VERSION, SCENARIO_IDS.index(scenario_id), STEP_IDS.index(record.step), record.conditions, record.asked,
+        record.discovered, record.safety_score, play, NO_HINT if hint is None else QUESTION_IDS.index(hint), len(history),
+    ) + struct.pack(f"<{len(history)}H", *history)
+
+
+def unpack(data):
+    """pack()의 바이트열을 (시나리오 id, 레코드, 판 번호, 힌트)로 되돌립니다.
+
+    버전이 다르거나 이 프로세스가 모르는 번호(되돌린 배포에서 저장된 체크포인트 등)면 None.
+    """
+    version, scenario, step, conditions, asked, discovered, score, play, hint, length = HEADER.unpack_from(data)
+    if version != VERSION or scenario >= len(SCENARIO_IDS) or step >= len(STEP_IDS):
+        return None
+    if hint != NO_HINT and hint >= len(QUESTION_IDS):
+        return None
+    record = SessionRecord()
+    record.step = STEP_IDS[step]
+    record.conditions = conditions
+    record.asked = asked
+    record.discovered = discovered
+    record.safety_score = score
+    record.game_over = record.step in ("simulation_result", "final_summary")
+    record.history = array("H", struct.unpack_from(f"<{length}H", data, HEADER.size))
+    return SCENARIO_IDS[scenario], record, play, None if hint == NO_HINT else QUESTION_IDS[hint]
+
+
+# --- 저장소 ---
+def _connect():
+    """쓰기 스레드와 복원이 함께 쓰는 연결을 엽니다. 처음 열 때 테이블을 만들고 오래된 행을 지웁니다."""
+    global _conn
+    if _conn is None:
+        os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+        conn = sqlite3.connect(DB_PATH, timeout=5.0, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoints (token TEXT PRIMARY KEY, data BLOB NOT NULL, updated_at REAL NOT NULL) WITHOUT ROWID"
+            )
+            conn.execute("DELETE FROM checkpoints WHERE updated_at < ?", (time.time() - MAX_AGE,))
+        _conn = conn
+    return _conn
+
+
+def _remember(token, data):
+    """체크포인트를 메모리 캐시에 넣고 오래된 항목을 버립니다. (_lock 안에서 호출)"""
+    _cache[token] = data
+    _cache.move_to_end(token)
+    while len(_cache) > MAX_CACHED:
+        _cache.popitem(last=False)
+
+
+def save(token, scenario_id, record, play, hint):
+    """체크포인트를 저장합니다. 메모리만 고치고 바로 돌아오며 파일 쓰기는 백그라운드에서 합니다.
+
+    화면을 다시 그릴 때마다 불러도 되도록, 마지막 체크포인트와 같으면 아무것도 하지 않습니다.
+    """
+    data = pack(scenario_id, record, play, hint)
+    with _lock:
+        if _cache.get(token) == data:
+            return data
+        _remember(token, data)
+        _writes.pending[token] = data
+    _writes.wake()
+    return data
+
+
+def load(token):
+    """토큰의 체크포인트를 (시나리오 id, 레코드, 판 번호, 힌트)로 돌려줍니다. 없으면 None."""
+    with _lock:
+        data = _writes.pending.get(token) or _cache.get(token)
+    if data is None:
+        with _conn_lock:
+            row = _connect().execute("SELECT data FROM checkpoints WHERE token = ?", (token,)).fetchone()
+        if row is None:
+            return None
+        data = row[0]
+        with _lock:
+            data = _writes.pending.get(token) or data  # 읽는 사이에 save()가 먼저 고쳤다면 그 값을 씀
+            _remember(token, data)
+    return unpack(data)
+
+
+def _write(batch):
+    """바뀐 체크포인트 묶음을 트랜잭션 하나로 씁니다."""
+    now = time.time()
+    with _conn_lock:
+        conn = _connect()
+        with conn:
+            conn.executemany(
+                "INSERT INTO checkpoints (token, data, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (token) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at",
+                [(token, data, now) for token, data in batch],
+            )
+
+
+_writes = WriteBehind("checkpoint-writer", _write, FLUSH_INTERVAL, lock=_lock)
+
+
+def flush():
+    """아직 쓰지 않은 체크포인트를 지금 씁니다. (프로세스 종료 시 자동 호출)"""
+    _writes.flush()
+
+
+atexit.register(flush)
+
+
+def _measure():
+    """가장 긴 경로로 레코드 크기와 저장/복원 시간을 잽니다. (임시 폴더의 DB 사용)"""
+    import tempfile
+    import timeit
+
+    import benchmark
+    from scenario import get_scenario
+
+    global DB_PATH
+    DB_PATH = os.path.join(tempfile.mkdtemp(), "checkpoints.db")
+    scenario = get_scenario("warfarin_implant")
+    record = benchmark.longest_record(scenario)
+    data = pack(scenario["id"], record, 3, "current_meds")
+    assert unpack(data)[1].history == record.history
+    number = 20_000
+    save_us = timeit.timeit(lambda: save("measure", scenario["id"], record, 3, "current_meds"), number=number) / number * 1e6
+    load_us = timeit.timeit(lambda: load("measure"), number=number) / number * 1e6
+    flush()
+    _cache.clear()
+    started = time.perf_counter()
+    load("measure")
+    cold_us = (time.perf_counter() - started) * 1e6
+    print(f"가장 긴 경로의 레코드: {len(data)}바이트 (이벤트 {len(record.history)}개)")
+    print(f"저장 {save_us:.2f}µs, 복원 {load_us:.2f}µs (메모리), 서버 재시작 후 복원 {cold_us:.0f}µs (SQLite)")
+
+
+if __name__ == "__main__":
+    _measure()
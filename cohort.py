@@ -0,0 +1,154 @@
+"""학급(코호트) 전체의 상담 통계를 누적하는 프로세스 전역 저장소.
+
+한 판이 끝날 때마다 add_play()가 카운터 몇 개만 올리므로, 강사용 화면은
+기록 전체를 다시 훑지 않고 snapshot()으로 바로 읽습니다. 카운터의 크기는
+질문/결과 종류 수에만 비례하고 상담 수와는 무관합니다.
+
+의사결정나무 학습용으로 판마다 0/1 특징 한 줄(uint8)도 쌓아 두며, 학습한 나무는
+새 상담이 들어올 때까지 캐시합니다.
+
+프로세스가 다시 시작되면 오늘 날짜의 상담 로그(eventlog)로 카운터를 복원합니다.
+"""
+
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+
+import decision_tree
+import eventlog
+from outcome_table import SEVERITY_KINDS, severity_code
+from scenario import get_scenario
+
+SCORE_BIN = 10        # 점수 히스토그램 구간 너비
+SENIOR_OUTCOME = "senior"  # 약 추천 없이 선배 약사에게 넘긴 판
+OUTCOME_KINDS = SEVERITY_KINDS + (SENIOR_OUTCOME,)
+OUTCOME_LABELS = {
+    "success": "안전한 추천",
+    "warning": "주의 필요",
+    "error": "위험한 추천",
+    SENIOR_OUTCOME: "선배 약사에게 도움 요청",
+}
+OUTCOME_COLORS = {"success": "#c8e6c9", "warning": "#fff9c4", "error": "#ffcdd2", SENIOR_OUTCOME: "#bbdefb"}
+MIN_TREE_PLAYS = 10  # 이보다 적으면 나무를 학습하지 않음
+
+_lock = threading.Lock()
+_cohorts = {}     # 시나리오 id -> 누적 통계
+_tree_cache = {}  # 시나리오 id -> (학습에 쓴 판 수, DOT 문자열)
+_started_at = time.time()
+
+
+def _new_cohort():
+    return {
+        "plays": 0,
+        "score_sum": 0,
+        "first_question": Counter(),    # 첫 질문 id -> 횟수
+        "question_orders": Counter(),   # 질문 순서 ("a → b") -> 횟수
+        "score_bins": Counter(),        # 구간 시작 점수 -> 횟수
+        "outcomes": Counter(),          # success/warning/error/senior -> 횟수
+        "outcome_messages": Counter(),  # 결과 규칙 번호 -> 횟수
+        "drug_by_warfarin": Counter(),  # (진통제, 와파린 복용 여부) -> 횟수
+        # 나무 학습용 표본: 앞의 plays개 행만 유효하고, 가득 차면 두 배로 늘립니다.
+        "features": np.zeros((64, len(decision_tree.FEATURES)), dtype=np.uint8),
+        "labels": np.zeros(64, dtype=np.int8),
+    }
+
+
+def outcome_category(scenario, entry):
+    """로그 한 줄의 결과를 success/warning/error/senior 중 하나로 분류합니다."""
+    if entry["outcome"] is None:
+        return SENIOR_OUTCOME
+    rules = scenario["outcome_rules"]
+    if not 0 <= entry["outcome"] < len(rules):
+        raise IndexError(f"결과 규칙 번호가 범위를 벗어났습니다: {entry['outcome']}")
+    rule = rules[entry["outcome"]]
+    return SEVERITY_KINDS[severity_code(rule["score"])]
+
+
+def add_play(entry):
+    """끝난 상담(eventlog.play_entry 형식) 하나를 카운터에 더합니다.
+
+    기록에서 쓰는 값을 모두 먼저 꺼내므로, 잘못된 기록이면 카운터를 고치기 전에 KeyError나
+    IndexError가 납니다.
+    """
+    scenario = get_scenario(entry["scenario"])
+    order = entry["asked_order"]
+    score, outcome, drug = entry["score"], entry["outcome"], entry["drug"]
+    warfarin = entry["conditions"]["is_warfarin_user"]
+    score_bin = score // SCORE_BIN * SCORE_BIN
+    question_order = " → ".join(order)
+    category = outcome_category(scenario, entry)
+    row = decision_tree.encode(entry)
+    with _lock:
+        cohort = _cohorts.get(scenario["id"])
+        if cohort is None:
+            cohort = _cohorts[scenario["id"]] = _new_cohort()
+        _append_sample(cohort, row, OUTCOME_KINDS.index(category))
+        cohort["plays"] += 1
+        cohort["score_sum"] += score
+        if order:
+            cohort["first_question"][order[0]] += 1
+        cohort["question_orders"][question_order] += 1
+        cohort["score_bins"][score_bin] += 1
+        cohort["outcomes"][category] += 1
+        if outcome is not None:
+            cohort["outcome_messages"][outcome] += 1
+        if drug is not None:
+            cohort["drug_by_warfarin"][drug, warfarin] += 1
+
+
+def _append_sample(cohort, row, label):
+    plays = cohort["plays"]
+    if plays == len(cohort["labels"]):
+        cohort["features"] = np.concatenate([cohort["features"], np.zeros_like(cohort["features"])])
+        cohort["labels"] = np.concatenate([cohort["labels"], np.zeros_like(cohort["labels"])])
+    cohort["features"][plays] = row
+    cohort["labels"][plays] = label
+
+
+def snapshot(scenario_id):
+    """시나리오 하나의 누적 카운터를 복사해 돌려줍니다. (학습용 표본은 제외)"""
+    with _lock:
+        cohort = _cohorts.get(scenario_id) or _new_cohort()
+        return {
+            key: value.copy() if isinstance(value, Counter) else value
+            for key, value in cohort.items()
+            if key not in ("features", "labels")
+        }
+
+
+def learned_tree_dot(scenario_id):
+    """학급 상담 기록으로 학습한 의사결정나무(DOT)입니다. 표본이 부족하면 None.
+
+    새 상담이 더해지지 않았으면 지난번에 학습한 결과를 그대로 돌려줍니다.
+    """
+    with _lock:
+        cohort = _cohorts.get(scenario_id)
+        plays = cohort["plays"] if cohort else 0
+        if plays < MIN_TREE_PLAYS:
+            return None
+        cached = _tree_cache.get(scenario_id)
+        if cached and cached[0] == plays:
+            return cached[1]
+        X, y = cohort["features"][:plays].copy(), cohort["labels"][:plays].copy()
+
+    tree = decision_tree.fit(X, y, len(OUTCOME_KINDS))
+    dot = decision_tree.to_dot(
+        tree, [OUTCOME_LABELS[kind] for kind in OUTCOME_KINDS], [OUTCOME_COLORS[kind] for kind in OUTCOME_KINDS]
+    )
+    with _lock:
+        _tree_cache[scenario_id] = (plays, dot)
+    return dot
+
+
+def started_at():
+    return _started_at
+
+
+def load_log(path):
+    """상담 로그 파일 하나를 읽어 카운터를 채우고 더한 판 수를 돌려줍니다. 잘못된 기록은 건너뜁니다."""
+    return eventlog.replay(path, add_play)[0]
+
+
+load_log(eventlog.log_path(time.time()))
@@ -0,0 +1,116 @@
+"""콜드 스타트(새 프로세스의 첫 화면) 측정.
+
+시도마다 새 파이썬 프로세스에서 Streamlit만 먼저 불러온 뒤(서버가 이미 떠 있는
+상태와 같음), AppTest로 앱을 처음 실행해 첫 화면을 그리는 시간과 '시작하기'를
+눌러 다음 단계를 처음 그리는 시간을 잽니다. 비교 대상은 git 기록에 남아 있는
+분리 전 단일 파일 앱입니다.
+
+    python coldstart.py                      # 현재 app.py vs 분리 전 app2.py, 5회씩
+    python coldstart.py --scenario warfarin --trials 10 --baseline-ref 3528aad
+
+결과: 방식별 중앙값(ms) - Streamlit 불러오기, 첫 화면, 첫 단계 전환, 두 번째 실행,
+첫 화면까지 불러온 모듈 수.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(BASE_DIR, "app.py")
+DISK_CACHE_DIR = os.path.join(BASE_DIR, ".cache", "images")
+# 시나리오 -> 분리 전(시나리오마다 파일이 따로 있던 때)의 앱 파일
+BASELINE_APPS = {"warfarin": "app.py", "warfarin_implant": "app2.py"}
+
+
+def measure_child(app_path, scenario_id=None):
+    """(자식 프로세스) 앱 하나의 콜드 스타트 시간을 재서 JSON으로 출력합니다."""
+    started = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+
+    streamlit_loaded = time.perf_counter()
+    modules_before = len(sys.modules)
+    at = AppTest.from_file(app_path, default_timeout=60)
+    if scenario_id:
+        at.query_params["scenario"] = scenario_id
+    at.run()
+    first_paint = time.perf_counter()
+    modules_after = len(sys.modules)
+    at.button[0].click()  # 시작 화면의 '시뮬레이션 시작하기'
+    at.run()
+    first_step = time.perf_counter()
+    at.run()
+    warm = time.perf_counter()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    print(json.dumps({
+        "streamlit_ms": (streamlit_loaded - started) * 1000,
+        "first_paint_ms": (first_paint - streamlit_loaded) * 1000,
+        "first_step_ms": (first_step - first_paint) * 1000,
+        "warm_run_ms": (warm - first_step) * 1000,
+        "modules_loaded": modules_after - modules_before,
+    }))
+
+
+def run_trials(app_path, trials, scenario_id=None, clear_disk_cache=False):
+    """새 프로세스에서 trials번 재고 항목별 중앙값을 돌려줍니다."""
+    samples = []
+    for _ in range(trials):
+        if clear_disk_cache:
+            shutil.rmtree(DISK_CACHE_DIR, ignore_errors=True)
+        output = subprocess.run(
+            [sys.executable, __file__, "--child", app_path] + (["--scenario", scenario_id] if scenario_id else []),
+            cwd=BASE_DIR, capture_output=True, text=True, check=True,
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    return {key: round(statistics.median(sample[key] for sample in samples), 1) for key in samples[0]}
+
+
+def baseline_app(ref, app_name):
+    """git 기록에서 분리 전 앱 파일을 꺼내 임시 경로에 씁니다."""
+    source = subprocess.run(
+        ["git", "show", f"{ref}:{app_name}"], cwd=BASE_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    path = os.path.join(tempfile.mkdtemp(prefix="coldstart-"), app_name)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(source)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="새 프로세스의 첫 화면 시간 측정")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--scenario", default="warfarin_implant", choices=sorted(BASELINE_APPS))
+    parser.add_argument("--trials", type=int, default=5)
+    parser.add_argument("--baseline-ref", help="비교할 단일 파일 앱의 git 커밋 (기본: 첫 커밋)")
+    args = parser.parse_args()
+
+    if args.child:
+        measure_child(args.child, args.scenario)
+        return
+
+    ref = args.baseline_ref or subprocess.run(
+        ["git", "rev-list", "--max-parents=0", "HEAD"], cwd=BASE_DIR, capture_output=True, text=True, check=True
+    ).stdout.split()[0]
+    baseline_name = BASELINE_APPS[args.scenario]
+    rows = {
+        f"분리 전 {baseline_name} ({ref[:7]})": run_trials(baseline_app(ref, baseline_name), args.trials),
+        "현재 (이미지 디스크 캐시 없음)": run_trials(APP_PATH, args.trials, args.scenario, clear_disk_cache=True),
+        "현재 (이미지 디스크 캐시 있음)": run_trials(APP_PATH, args.trials, args.scenario),
+    }
+    print(f"{'':<34} {'streamlit':>10} {'첫 화면':>9} {'첫 전환':>9} {'재실행':>9} {'모듈 수':>7}")
+    for name, row in rows.items():
+        print(
+            f"{name:<34} {row['streamlit_ms']:>8.1f}ms {row['first_paint_ms']:>7.1f}ms "
+            f"{row['first_step_ms']:>7.1f}ms {row['warm_run_ms']:>7.1f}ms {row['modules_loaded']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
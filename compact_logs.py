@@ -0,0 +1,93 @@
+"""logs/plays-*.jsonl 상담 로그를 분석용 열 기반(Parquet/Arrow) 파일로 변환합니다.
+
+    python compact_logs.py                 # 날짜별 plays-YYYYMMDD.parquet 생성
+    python compact_logs.py --format arrow  # Arrow IPC(.arrow) 파일로 생성
+
+이미 변환된 파일이 원본 로그보다 새로우면 건너뜁니다. 원본 .jsonl은 지우지 않습니다.
+학급 통계, 힌트, 보고서, 다시 채점하기(rescore.py), 의사결정나무가 모두 .jsonl을 읽기
+때문입니다.
+"""
+
+import argparse
+import glob
+import os
+
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+from eventlog import LOG_DIR, read_entries
+from session_record import CONDITION_KEYS
+
+SCHEMA = pa.schema(
+    [
+        ("ts", pa.timestamp("ms")),
+        ("session", pa.string()),
+        ("scenario", pa.dictionary(pa.int8(), pa.string())),
+        ("play", pa.int16()),
+    ]
+    + [(key, pa.bool_()) for key in CONDITION_KEYS]
+    + [
+        ("asked_order", pa.list_(pa.dictionary(pa.int8(), pa.string()))),
+        ("drug", pa.dictionary(pa.int8(), pa.string())),
+        ("outcome", pa.int16()),
+        ("senior", pa.bool_()),
+        ("score", pa.int16()),
+        ("history", pa.list_(pa.uint16())),
+        ("hint", pa.dictionary(pa.int8(), pa.string())),
+        ("class", pa.dictionary(pa.int16(), pa.string())),
+    ]
+)
+
+
+def to_table(entries):
+    """로그 항목 목록을 열 기반 pyarrow 테이블로 바꿉니다."""
+    columns = {
+        "ts": [int(entry["ts"] * 1000) for entry in entries],
+        "session": [entry["session"] for entry in entries],
+        "scenario": [entry["scenario"] for entry in entries],
+        "play": [entry["play"] for entry in entries],
+    }
+    for key in CONDITION_KEYS:
+        columns[key] = [entry["conditions"][key] for entry in entries]
+    for key in ("asked_order", "drug", "outcome", "senior", "score", "history"):
+        columns[key] = [entry[key] for entry in entries]
+    # 힌트 엔진, 반 코드 기록 이전의 로그에는 없는 열
+    columns["hint"] = [entry.get("hint") for entry in entries]
+    columns["class"] = [entry.get("class") for entry in entries]
+    return pa.Table.from_pydict(columns, schema=SCHEMA)
+
+
+def compact(path, fmt):
+    """로그 파일 하나를 변환하고 (출력 경로, 행 수)를 돌려줍니다. 최신이면 행 수는 None."""
+    out_path = os.path.splitext(path)[0] + (".parquet" if fmt == "parquet" else ".arrow")
+    if os.path.exists(out_path) and os.path.getmtime(out_path) >= os.path.getmtime(path):
+        return out_path, None
+    table = to_table(read_entries(path))
+    temp_path = f"{out_path}.{os.getpid()}.tmp"
+    if fmt == "parquet":
+        pq.write_table(table, temp_path, compression="zstd")
+    else:
+        feather.write_feather(table, temp_path, compression="zstd")
+    os.replace(temp_path, out_path)
+    return out_path, table.num_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="상담 로그(JSONL)를 Parquet/Arrow로 변환")
+    parser.add_argument("--log-dir", default=LOG_DIR)
+    parser.add_argument("--format", default="parquet", choices=["parquet", "arrow"])
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.log_dir, "plays-*.jsonl")))
+    if not paths:
+        print(f"변환할 로그가 없습니다: {args.log_dir}")
+        return
+    for path in paths:
+        out_path, rows = compact(path, args.format)
+        status = "최신 상태" if rows is None else f"{rows}행"
+        print(f"{os.path.basename(path)} -> {os.path.basename(out_path)} ({status})")
+
+
+if __name__ == "__main__":
+    main()
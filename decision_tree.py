@@ -0,0 +1,177 @@
+"""상담 기록으로 의사결정나무를 학습하는 NumPy 전용 구현.
+
+특징은 모두 0/1(숨겨진 상태, 질문 여부, 추천한 진통제)이므로, 한 노드의 모든
+특징에 대한 분기 후보를 np.bincount 한 번으로 (특징, 값, 결과) 개수표로 만들고
+지니 불순도가 가장 낮은 특징을 고릅니다. 노드당 O(표본 수 × 특징 수)입니다.
+
+    python decision_tree.py                          # logs/의 상담 기록으로 학습
+    python decision_tree.py --synthetic 50000 --dot  # 무작위 플레이로 학습 시간 측정
+"""
+
+import argparse
+import glob
+import os
+import random
+import time
+
+import numpy as np
+
+from session_record import DRUG_IDS, QUESTION_IDS
+
+# (로그 항목에서 값을 꺼내는 키, 나무에 표시할 질문)
+FEATURES = (
+    (("conditions", "is_warfarin_user"), "와파린 복용 환자인가?"),
+    (("conditions", "has_implant_soon"), "임플란트 예정인가?"),
+    (("asked", "symptom_details"), "증상을 물어봤나?"),
+    (("asked", "current_meds"), "복용 약물을 물어봤나?"),
+    (("asked", "history_headache"), "두통 과거력을 물어봤나?"),
+    (("asked", "medical_history_check"), "병력/치료 계획을 물어봤나?"),
+    (("drug", "nsaids"), "NSAIDs를 추천했나?"),
+    (("drug", "acetaminophen"), "아세트아미노펜을 추천했나?"),
+)
+FEATURE_LABELS = tuple(label for _, label in FEATURES)
+assert {name for (kind, name), _ in FEATURES if kind == "asked"} == set(QUESTION_IDS)
+assert {name for (kind, name), _ in FEATURES if kind == "drug"} == set(DRUG_IDS)
+
+MAX_DEPTH = 4
+MIN_LEAF = 3
+
+
+def encode(entry):
+    """로그 항목(eventlog.play_entry 형식)을 0/1 특징 목록으로 바꿉니다."""
+    row = []
+    for (kind, name), _ in FEATURES:
+        if kind == "conditions":
+            row.append(int(entry["conditions"][name]))
+        elif kind == "asked":
+            row.append(int(name in entry["asked_order"]))
+        else:
+            row.append(int(entry["drug"] == name))
+    return row
+
+
+def _gini(counts):
+    """마지막 축의 결과별 개수로 지니 불순도를 계산합니다."""
+    sizes = counts.sum(axis=-1, keepdims=True)
+    shares = counts / np.maximum(sizes, 1)
+    return 1.0 - (shares ** 2).sum(axis=-1)
+
+
+def best_split(X, y, n_classes, min_leaf=MIN_LEAF):
+    """불순도를 가장 많이 줄이는 특징 번호를 찾습니다. 줄일 수 없으면 None."""
+    n, n_features = X.shape
+    # counts[j, v, k]: 특징 j의 값이 v이고 결과가 k인 표본 수
+    offsets = np.arange(n_features) * (2 * n_classes)
+    codes = offsets + X * n_classes + y[:, None]
+    counts = np.bincount(codes.ravel(), minlength=n_features * 2 * n_classes).reshape(n_features, 2, n_classes)
+    sizes = counts.sum(axis=2)
+    weighted = (sizes * _gini(counts)).sum(axis=1) / n
+    weighted[(sizes < min_leaf).any(axis=1)] = np.inf
+
+    feature = int(np.argmin(weighted))
+    parent = _gini(counts[0].sum(axis=0))
+    if not np.isfinite(weighted[feature]) or parent - weighted[feature] < 1e-9:
+        return None
+    return feature
+
+
+def fit(X, y, n_classes, max_depth=MAX_DEPTH, min_leaf=MIN_LEAF):
+    """0/1 특징 행렬 X(uint8)와 결과 번호 y로 의사결정나무를 학습합니다.
+
+    노드는 {"counts", "feature", "no", "yes"} 사전이고, 잎 노드에는 "feature"가 없습니다.
+    """
+    y = np.asarray(y, dtype=np.int64)
+    node = {"counts": np.bincount(y, minlength=n_classes).tolist()}
+    if max_depth == 0 or len(y) < 2 * min_leaf:
+        return node
+    feature = best_split(X, y, n_classes, min_leaf)
+    if feature is None:
+        return node
+    mask = X[:, feature] == 1
+    no = fit(X[~mask], y[~mask], n_classes, max_depth - 1, min_leaf)
+    yes = fit(X[mask], y[mask], n_classes, max_depth - 1, min_leaf)
+    if "feature" not in no and "feature" not in yes and np.argmax(no["counts"]) == np.argmax(yes["counts"]):
+        return node  # 두 갈래의 결론이 같으면 갈림길을 표시할 필요가 없음
+    node.update(feature=feature, no=no, yes=yes)
+    return node
+
+
+def to_dot(tree, class_labels, class_colors):
+    """학습한 나무를 graphviz DOT 문자열로 바꿉니다."""
+    lines = [
+        "digraph decision_tree {",
+        '  node [shape=box, style="rounded,filled", fontname="sans-serif", fillcolor="#f5f5f5"];',
+        '  edge [fontname="sans-serif"];',
+    ]
+    total = sum(tree["counts"])
+
+    def visit(node, node_id):
+        counts = node["counts"]
+        samples = sum(counts)
+        if "feature" in node:
+            lines.append(f'  n{node_id} [label="{FEATURE_LABELS[node["feature"]]}\\n{samples}판"];')
+            next_id = node_id + 1
+            for answer, child in (("아니오", node["no"]), ("예", node["yes"])):
+                child_id = next_id
+                next_id = visit(child, child_id)
+                lines.append(f'  n{node_id} -> n{child_id} [label="{answer}"];')
+            return next_id
+        majority = int(np.argmax(counts))
+        share = counts[majority] / samples if samples else 0.0
+        lines.append(
+            f'  n{node_id} [label="{class_labels[majority]}\\n{samples}판 중 {share:.0%}\\n(전체의 {samples / total:.0%})", '
+            f'fillcolor="{class_colors[majority]}"];'
+        )
+        return node_id + 1
+
+    visit(tree, 0)
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def main():
+    from cohort import OUTCOME_COLORS, OUTCOME_KINDS, OUTCOME_LABELS, outcome_category
+    from eventlog import LOG_DIR, read_entries
+    from scenario import get_scenario
+
+    parser = argparse.ArgumentParser(description="상담 기록으로 의사결정나무 학습")
+    parser.add_argument("--scenario", default="warfarin_implant")
+    parser.add_argument("--synthetic", type=int, default=0, help="로그 대신 무작위 플레이 N판으로 학습")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dot", action="store_true", help="DOT 문자열 출력")
+    args = parser.parse_args()
+
+    scenario = get_scenario(args.scenario)
+    if args.synthetic:
+        import eventlog
+        import simulate
+
+        rng = random.Random(args.seed)
+        combinations = simulate.condition_combinations(scenario)
+        entries = [
+            eventlog.play_entry(simulate.play_random(scenario, rng, rng.choice(combinations)), args.scenario, "synthetic", 1)
+            for _ in range(args.synthetic)
+        ]
+    else:
+        entries = [
+            entry
+            for path in sorted(glob.glob(os.path.join(LOG_DIR, "plays-*.jsonl")))
+            for entry in read_entries(path)
+            if entry["scenario"] == args.scenario
+        ]
+    if not entries:
+        print("학습할 상담 기록이 없습니다.")
+        return
+
+    X = np.array([encode(entry) for entry in entries], dtype=np.uint8)
+    y = np.array([OUTCOME_KINDS.index(outcome_category(scenario, entry)) for entry in entries], dtype=np.int8)
+    started = time.perf_counter()
+    tree = fit(X, y, len(OUTCOME_KINDS))
+    elapsed = time.perf_counter() - started
+    print(f"{len(entries):,}판, 특징 {X.shape[1]}개로 학습: {elapsed * 1000:.1f} ms")
+    if args.dot:
+        print(to_dot(tree, [OUTCOME_LABELS[kind] for kind in OUTCOME_KINDS], [OUTCOME_COLORS[kind] for kind in OUTCOME_KINDS]))
+
+
+if __name__ == "__main__":
+    main()
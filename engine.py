@@ -0,0 +1,241 @@
+"""Streamlit에 의존하지 않는 상담 진행 로직.
+
+상태는 session_record.SessionRecord 하나에 담깁니다. 앱에서는
+st.session_state.record에, 시뮬레이터에서는 지역 변수에 둡니다.
+각 함수는 화면에 보여줄 피드백을 (종류, 내용) 튜플 목록으로 돌려줍니다. 시나리오에서 온
+내용은 messages의 메시지 id(또는 id 튜플)이며, 화면에 그릴 때 messages.text()로 바꿉니다.
+"""
+
+import interactions
+import messages
+import outcome_table
+from scenario import ACTION_OPTIONS, CONDITION_RISK_FACTORS, FOLLOW_UP_OPTIONS, PAINKILLERS, QUESTIONS
+from session_record import (
+    ACTION_IDS, DISCOVERED_KEYS, DRUG_IDS, EV_ACTION, EV_ANSWER, EV_DRUG, EV_QUESTION, EV_RESULT, EV_SENIOR,
+    QUESTION_IDS, SessionRecord, decode_event,
+)
+
+SENIOR_SCORE = 15  # 선배 약사에게 도움을 요청했을 때의 점수 변동
+GRADE_THRESHOLDS = (80, 50)  # 평가 등급 경계 (이 점수 이상이면 그 등급)
+GRADE_TEXTS = (  # grade_band 순서
+    "🌟 **평가:** 훌륭합니다! 중요한 정보를 정확히 파악하고 환자에게 안전한 선택을 했습니다.",
+    "👍 **평가:** 잘했습니다! 몇 가지 포인트를 더 점검하면 완벽한 상담을 할 수 있을 거예요.",
+    "😥 **평가:** 아쉽지만, 이번 경험을 통해 중요한 것을 배웠을 것입니다. 실제 상황에서는 더 신중해야 합니다.",
+)
+
+# 알게 된 정보 키 -> 공개될 때의 값 (예: headache_details -> "어제 저녁부터 지끈거리며 아픔")
+REVEALED_VALUES = dict(question["yes"]["reveal"] for question in QUESTIONS.values())
+# 알게 된 정보 키 -> 상호작용 지식 베이스의 위험 요인 (예: warfarin_user_revealed -> anticoagulant)
+REVEALED_RISK_FACTORS = {
+    question["yes"]["reveal"][0]: CONDITION_RISK_FACTORS[question["condition"]]
+    for question in QUESTIONS.values() if question["condition"] in CONDITION_RISK_FACTORS
+}
+
+
+def initialize_session(scenario, conditions=None):
+    """한 판의 상담 레코드를 새로 만듭니다."""
+    return SessionRecord(dict(scenario["conditions"], **(conditions or {})))
+
+
+def transition(record, scenario, action):
+    """전이표에 따라 다음 단계로 이동합니다."""
+    record.step = scenario["transitions"][record.step][action]
+    if record.step == "simulation_result":
+        record.game_over = True
+
+
+def discovered_info(record):
+    """플레이어가 알게 된 정보를 {키: 값} 사전으로 풀어냅니다. (모르면 None)"""
+    return {key: REVEALED_VALUES[key] if record.revealed(key) else None for key in DISCOVERED_KEYS}
+
+
+def _answer_branch(record, question, again):
+    """질문에 대한 답변 분기와 (답변, 피드백)을 고릅니다."""
+    condition = question["condition"]
+    is_yes = condition is None or record.condition(condition)
+    branch = question["yes"] if is_yes else question["no"]
+    answer, notes = branch["answer"], branch["notes"]
+    if again and "again" in branch:
+        answer = branch["again"].get("answer", answer)
+        notes = branch["again"].get("notes", notes)
+    return is_yes, branch, answer, notes
+
+
+def ask_question(record, scenario, question_id, again=False):
+    """환자에게 질문하고 답변과 점수를 반영합니다."""
+    question = scenario["questions"][question_id]
+    record.mark_asked(question["flag"])
+    is_yes, branch, answer, notes = _answer_branch(record, question, again)
+    if "reveal" in branch:
+        record.reveal(branch["reveal"][0])
+    record.safety_score += branch["score"]
+    record.add_event(EV_ANSWER, QUESTION_IDS.index(question_id) << 2 | is_yes << 1 | again)
+    return list(notes) + [("patient", answer)]
+
+
+def _senior_advice(senior, matched):
+    """일치한 조언 조각 비트로 선배 약사의 조언을 (머리말, 조각들, 맺음말) 메시지 id 튜플로 만듭니다."""
+    parts = tuple(text for index, (_, text) in enumerate(senior["parts"]) if matched >> index & 1)
+    return (senior["prefix"],) + parts + (senior["suffix"],)
+
+
+def ask_senior(record, scenario, timing):
+    """선배 약사에게 도움을 요청합니다. timing은 "early" 또는 "action"입니다."""
+    senior = scenario["senior"][timing]
+    matched = 0
+    for index, (required, _) in enumerate(senior["parts"]):
+        if all(record.revealed(key) for key in required):
+            matched |= 1 << index
+            if senior["mode"] == "first":
+                break
+
+    record.safety_score += SENIOR_SCORE
+    record.add_event(EV_SENIOR, matched << 1 | (timing == "action"))
+    return list(senior["notes"]) + [("senior", _senior_advice(senior, matched))]
+
+
+def risk_factors(record):
+    """학생이 질문으로 알아낸 환자 정보를 상호작용 지식 베이스의 위험 요인 이름으로 바꿉니다.
+
+    숨겨진 상태를 그대로 쓰면 묻지 않은 정보가 설명으로 드러나므로, 알게 된 정보만 씁니다.
+    """
+    return [factor for key, factor in REVEALED_RISK_FACTORS.items() if record.revealed(key)]
+
+
+def evaluate_recommendation(record, scenario, drug):
+    """진통제 추천 결과를 결과표에서 찾아 반영하고, 학생이 알아낸 위험 요인의 상호작용 정보를 덧붙입니다."""
+    table = scenario["outcomes"]
+    score_change, severity, message_id = outcome_table.lookup(table, drug, record.feature_values())
+    message = table["messages"][message_id]
+
+    record.safety_score += score_change
+    record.add_event(EV_RESULT, message_id)
+    notes = [(outcome_table.SEVERITY_KINDS[severity], message)]
+    notes += interactions.interaction_notes(drug, risk_factors(record))
+    return notes + [(effect, None) for effect in table["effects"][message_id]]
+
+
+# --- 단계별 행동 (기록 + 처리 + 단계 전이) ---
+def choose_first_question(record, scenario, question_id):
+    """환자 등장 단계에서 첫 질문을 합니다."""
+    record.add_event(EV_QUESTION, QUESTION_IDS.index(question_id))
+    notes = ask_question(record, scenario, question_id)
+    transition(record, scenario, "ask")
+    return notes
+
+
+def choose_follow_up(record, scenario, action):
+    """첫 질문 후 다음 행동을 결정합니다."""
+    record.add_event(EV_ACTION, ACTION_IDS.index(action))
+    notes = ask_senior(record, scenario, "early") if action == "ask_senior_pharmacist_early" else []
+    transition(record, scenario, action)
+    return notes
+
+
+def choose_action(record, scenario, action):
+    """행동 결정 단계의 선택(약물 추천, 선배 약사, 추가 질문)을 처리합니다."""
+    record.add_event(EV_ACTION, ACTION_IDS.index(action))
+    if action == "recommend_drug":
+        notes = []
+    elif action == "ask_senior":
+        notes = ask_senior(record, scenario, "action")
+    else:
+        notes = ask_question(record, scenario, action, again=True)
+        action = "ask"
+    transition(record, scenario, action)
+    return notes
+
+
+def action_label(scenario, action):
+    """행동 선택지 문구입니다."""
+    return FOLLOW_UP_OPTIONS.get(action) or ACTION_OPTIONS.get(action) or scenario["action_labels"][action]
+
+
+def available_actions(record, scenario):
+    """행동 결정 단계에서 고를 수 있는 행동 목록입니다."""
+    actions = list(ACTION_OPTIONS)
+    actions += [
+        question_id for question_id in scenario["action_questions"]
+        if not record.was_asked(scenario["questions"][question_id]["flag"])
+    ]
+    return actions
+
+
+def recommend(record, scenario, drug):
+    """진통제를 추천하고 결과 화면으로 넘어갑니다."""
+    record.add_event(EV_DRUG, DRUG_IDS.index(drug))
+    notes = evaluate_recommendation(record, scenario, drug)
+    transition(record, scenario, "recommend")
+    return notes
+
+
+# --- 기록 풀어내기 (화면에 그릴 때만 호출) ---
+def expand_event(scenario, code):
+    """이벤트 코드 하나를 {"type", "content"} 기록 항목으로 바꿉니다."""
+    kind, arg = decode_event(code)
+    if kind == EV_QUESTION:
+        return {"type": "질문", "content": scenario["questions"][QUESTION_IDS[arg]]["text"]}
+    if kind == EV_ANSWER:
+        question = scenario["questions"][QUESTION_IDS[arg >> 2]]
+        branch = question["yes"] if arg >> 1 & 1 else question["no"]
+        answer = branch["answer"]
+        if arg & 1 and "again" in branch:
+            answer = branch["again"].get("answer", answer)
+        return {"type": "환자 답변", "content": answer}
+    if kind == EV_ACTION:
+        return {"type": "약사 행동", "content": action_label(scenario, ACTION_IDS[arg])}
+    if kind == EV_DRUG:
+        return {"type": "약물 추천", "content": PAINKILLERS[DRUG_IDS[arg]]}
+    if kind == EV_RESULT:
+        rule = scenario["outcome_rules"][arg]
+        return {"type": "최종 결과", "content": rule["message"], "score_change": rule["score"]}
+    if kind == EV_SENIOR:
+        senior = scenario["senior"]["action" if arg & 1 else "early"]
+        return {"type": "결과", "content": senior.get("history", _senior_advice(senior, arg >> 1))}
+    raise ValueError(f"알 수 없는 이벤트 코드입니다: {code}")
+
+
+def expand_history(record, scenario):
+    """레코드의 이벤트 기록 전체를 기록 항목 목록으로 바꿉니다."""
+    return [expand_event(scenario, code) for code in record.history]
+
+
+def play_summary(record):
+    """끝난 상담을 분석용 값(질문 순서, 추천 약, 결과 번호, 선배 약사 도움 여부)으로 요약합니다."""
+    asked_order, drug, outcome, senior = [], None, None, False
+    for code in record.history:
+        kind, arg = decode_event(code)
+        if kind == EV_ANSWER:
+            asked_order.append(QUESTION_IDS[arg >> 2])
+        elif kind == EV_DRUG:
+            drug = DRUG_IDS[arg]
+        elif kind == EV_RESULT:
+            outcome = arg
+        elif kind == EV_SENIOR:
+            senior = True
+    return {"asked_order": asked_order, "drug": drug, "outcome": outcome, "senior": senior}
+
+
+def grade_band(score):
+    """최종 점수의 평가 등급 번호 (0: 훌륭함, 1: 잘함, 2: 아쉬움)."""
+    for band, threshold in enumerate(GRADE_THRESHOLDS):
+        if score >= threshold:
+            return band
+    return len(GRADE_THRESHOLDS)
+
+
+def grade(score):
+    """최종 점수의 평가 등급 문구 (메시지 id)."""
+    return messages.message_id(GRADE_TEXTS[grade_band(score)])
+
+
+def missed_hints(record, scenario):
+    """다음 플레이에서 보여줄 힌트 여부를 계산합니다."""
+    return {
+        hint["state_key"]: bool(
+            record.condition(hint["condition"])
+            and not record.was_asked(hint["flag"])
+            and record.safety_score < 50
+        )
+        for hint in scenario["hints"]
+    }
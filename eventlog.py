@@ -0,0 +1,196 @@
+"""학생 상담 기록을 로컬 파일에 남기는 추가 전용(append-only) 로그.
+
+한 판이 끝날 때마다 append()가 기록 한 줄을 큐에 넣기만 하고 바로 돌아오므로,
+화면을 그리는 스레드는 디스크를 기다리지 않습니다. 백그라운드 쓰기 스레드가
+큐를 모아 BATCH_SIZE개 또는 FLUSH_INTERVAL초마다 한 번에 씁니다.
+
+쓰기에 실패하면(디스크 가득 참, 권한 등) 쓰기 스레드는 멈추지 않고 모은 기록을 들고
+있다가 FLUSH_INTERVAL초마다 다시 씁니다. 들고 있는 기록이 MAX_PENDING개를 넘으면
+가장 오래된 것부터 버리고 dropped()로 센 수를 로그에 남깁니다.
+
+파일: logs/plays-YYYYMMDD.jsonl (한 줄에 한 판, JSON)
+분석용 변환: python compact_logs.py
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+
+import engine
+from session_record import CONDITION_KEYS
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LOG_DIR = os.path.join(BASE_DIR, "logs")
+BATCH_SIZE = 256
+FLUSH_INTERVAL = 2.0
+MAX_PENDING = BATCH_SIZE * 64  # 쓰기가 계속 실패할 때 다시 쓰려고 들고 있는 최대 기록 수
+
+logger = logging.getLogger(__name__)
+
+_queue = queue.Queue()
+_writer = None
+_writer_lock = threading.Lock()
+_failing = False  # 마지막 쓰기가 실패했는지
+_dropped = 0      # 쓰기가 계속 실패해 버린 기록 수
+
+
+def play_entry(record, scenario_id, session_id, play, hint=None, class_code=None):
+    """끝난 상담 레코드를 로그 한 줄(사전)로 만듭니다.
+
+    hint는 이번 판에 보여준 힌트의 질문 id, class_code는 ?class=로 들어온 반 코드입니다.
+    """
+    entry = {
+        "ts": round(time.time(), 3),
+        "session": session_id,
+        "scenario": scenario_id,
+        "play": play,
+        "conditions": {key: record.condition(key) for key in CONDITION_KEYS},
+        "score": record.safety_score,
+        "history": list(record.history),
+        "hint": hint,
+        "class": class_code,
+    }
+    entry.update(engine.play_summary(record))
+    return entry
+
+
+def append(entry):
+    """play_entry()로 만든 기록을 쓰기 큐에 넣습니다. (디스크 쓰기는 백그라운드에서)"""
+    _ensure_writer()
+    _queue.put(entry)
+
+
+def log_path(timestamp):
+    return os.path.join(LOG_DIR, time.strftime("plays-%Y%m%d.jsonl", time.localtime(timestamp)))
+
+
+def read_entries(path):
+    """JSONL 로그 파일을 읽습니다. 쓰는 도중 잘린 마지막 줄은 건너뜁니다."""
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return entries
+
+
+def replay(path, add):
+    """로그 파일 하나의 기록을 add(entry)로 차례로 다시 더하고 (더한 수, 건너뛴 수)를 돌려줍니다.
+
+    프로세스가 다시 시작될 때 오늘 로그로 통계를 복원하는 데 씁니다. 모르거나 이름이 바뀐
+    시나리오, 빠진 키, 예전 규칙의 결과 번호처럼 add가 받아들이지 못한 기록은 건너뛰고
+    세기만 하므로, add는 값을 모두 확인한 뒤에 카운터를 고쳐야 합니다.
+    """
+    if not os.path.exists(path):
+        return 0, 0
+    added = skipped = 0
+    for entry in read_entries(path):
+        try:
+            add(entry)
+        except (KeyError, IndexError, TypeError, ValueError, AttributeError):
+            skipped += 1
+        else:
+            added += 1
+    if skipped:
+        logger.warning("%s: 통계에 더할 수 없는 기록 %d개를 건너뛰었습니다", path, skipped)
+    return added, skipped
+
+
+def _write_batch(batch, resync=False):
+    """기록 묶음을 날짜별 파일에 한 번씩 이어 씁니다.
+
+    resync이면 지난번에 실패한 쓰기가 남긴 잘린 줄에 이어 붙지 않도록 빈 줄부터 씁니다.
+    (읽는 쪽은 빈 줄과 잘린 줄을 건너뜀)
+    """
+    by_path = {}
+    for entry in batch:
+        by_path.setdefault(log_path(entry["ts"]), []).append(json.dumps(entry, ensure_ascii=False))
+    os.makedirs(LOG_DIR, exist_ok=True)
+    for path, lines in by_path.items():
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(("\n" if resync else "") + "\n".join(lines) + "\n")
+
+
+def _run_writer():
+    """큐에서 기록을 모아 BATCH_SIZE개가 차거나 FLUSH_INTERVAL초가 지나면 씁니다.
+
+    쓰기에 실패하면 기록을 들고 있다가 다음 FLUSH_INTERVAL에 다시 씁니다.
+    """
+    global _failing, _dropped
+    batch = []
+    deadline = time.monotonic() + FLUSH_INTERVAL
+    while True:
+        try:
+            entry = _queue.get(timeout=max(0.0, deadline - time.monotonic()))
+        except queue.Empty:
+            entry = None
+        if entry is not None:
+            batch.append(entry)
+        if batch and ((len(batch) >= BATCH_SIZE and not _failing) or time.monotonic() >= deadline):
+            try:
+                _write_batch(batch, resync=_failing)
+            except OSError:
+                if not _failing:
+                    logger.exception("상담 로그를 쓰지 못했습니다. %.0f초마다 다시 씁니다", FLUSH_INTERVAL)
+                _failing = True
+                if len(batch) > MAX_PENDING:
+                    dropped = len(batch) - MAX_PENDING
+                    del batch[:dropped]
+                    _dropped += dropped
+                    for _ in range(dropped):
+                        _queue.task_done()
+                    logger.error("상담 로그 %d개를 버렸습니다 (누적 %d개)", dropped, _dropped)
+            else:
+                if _failing:
+                    logger.warning("상담 로그 쓰기가 다시 됩니다 (밀린 기록 %d개를 썼습니다)", len(batch))
+                _failing = False
+                for _ in batch:
+                    _queue.task_done()
+                batch = []
+        if time.monotonic() >= deadline:
+            deadline = time.monotonic() + FLUSH_INTERVAL
+
+
+def _ensure_writer():
+    global _writer
+    if _writer is not None:
+        return
+    with _writer_lock:
+        if _writer is None:
+            _writer = threading.Thread(target=_run_writer, name="eventlog-writer", daemon=True)
+            _writer.start()
+
+
+def dropped():
+    """쓰기가 계속 실패해 버린 기록 수."""
+    return _dropped
+
+
+def flush(timeout=None):
+    """큐에 남은 기록이 모두 파일에 쓰일 때까지 기다리고, 다 썼으면 True를 돌려줍니다.
+
+    쓰기가 실패하고 있으면 더 기다리지 않고 False입니다.
+    """
+    if _writer is None:
+        return True
+    done = threading.Event()
+
+    def wait():
+        _queue.join()
+        done.set()
+
+    threading.Thread(target=wait, daemon=True).start()
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while not done.wait(0.1):
+        if _failing or (deadline is not None and time.monotonic() >= deadline):
+            return False
+    return True
+
+
+atexit.register(flush, 5.0)
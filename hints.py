@@ -0,0 +1,106 @@
+"""학생별/학급별 질문 누락률로 다음 판의 힌트를 고르는 적응형 힌트 엔진.
+
+질문마다 세 가지 통계를 씁니다.
+
+- 학생 본인의 누락률: profiles의 질문별 asked/missed 카운터
+- 학급 전체의 누락률: 이 모듈의 시나리오별 카운터 (질문을 빠뜨린 판 수 / 판 수)
+- 힌트의 효과: 그 질문의 힌트를 본 판에서 학생이 실제로 그 질문을 한 비율
+
+학생 누락률은 학급 누락률을 사전 분포로 삼아 보정하고(기록이 적은 학생은 학급
+평균에 가깝게), 힌트 효과는 Beta 분포에서 표본을 뽑는 톰슨 샘플링으로 다룹니다.
+질문마다 (보정한 누락률 × 질문의 배점 × 힌트 효과 표본)을 계산해 가장 큰 질문의
+힌트를 보여주므로, 효과가 아직 불확실한 힌트도 가끔 시험해 보게 됩니다.
+
+한 판이 끝날 때 record_play()는 질문 수만큼 카운터를 올리기만 하고(판 수와 무관한
+O(1)), choose()는 판을 시작할 때 한 번 질문 수만큼 계산하므로 화면을 그리는
+시간에는 영향이 없습니다. 프로세스가 다시 시작되면 오늘 상담 로그로 복원합니다.
+"""
+
+import random
+import threading
+import time
+
+import eventlog
+from scenario import get_scenario
+
+PRIOR_WEIGHT = 2.0     # 학생 누락률을 보정할 때 학급 누락률에 주는 가상 판 수
+MIN_MISS_RATE = 0.2    # 보정한 누락률이 이보다 낮은 질문은 힌트 후보에서 뺌
+CRITICAL_BONUS = 2.0   # 지난 판에 이 질문을 빠뜨려 나쁜 결과가 났으면 가중치를 곱함
+
+_lock = threading.Lock()
+_stats = {}  # 시나리오 id -> 질문 id -> {"plays", "missed", "shown", "followed"}
+_rng = random.Random()
+
+
+def _new_stats():
+    return {"plays": 0, "missed": 0, "shown": 0, "followed": 0}
+
+
+def _scenario_stats(scenario_id):
+    """시나리오의 질문별 카운터를 돌려줍니다. 없으면 만듭니다. (_lock 안에서 호출)"""
+    stats = _stats.get(scenario_id)
+    if stats is None:
+        stats = _stats[scenario_id] = {}
+    return stats
+
+
+def record_play(scenario, asked_questions, shown_hint):
+    """끝난 판 하나를 학급 카운터에 더합니다. (질문 수만큼의 덧셈)"""
+    with _lock:
+        stats = _scenario_stats(scenario["id"])
+        for question_id in scenario["questions"]:
+            counters = stats.get(question_id)
+            if counters is None:
+                counters = stats[question_id] = _new_stats()
+            counters["plays"] += 1
+            asked = question_id in asked_questions
+            if not asked:
+                counters["missed"] += 1
+            if question_id == shown_hint:
+                counters["shown"] += 1
+                counters["followed"] += asked
+
+
+def add_entry(entry):
+    """상담 로그 한 줄(eventlog.play_entry 형식)을 학급 카운터에 더합니다. (값을 모두 꺼낸 뒤에 고침)"""
+    record_play(get_scenario(entry["scenario"]), set(entry["asked_order"]), entry.get("hint"))
+
+
+def snapshot(scenario_id):
+    """질문 id -> 카운터 복사본."""
+    with _lock:
+        return {question_id: dict(counters) for question_id, counters in _stats.get(scenario_id, {}).items()}
+
+
+def choose(scenario, profile, rng=None):
+    """학생 프로필(profiles.load 형식)에 맞는 힌트 질문 id를 고릅니다. 보여줄 힌트가 없으면 None.
+
+    처음 하는 판에는 학생 기록이 없으므로 힌트를 보여주지 않습니다.
+    """
+    if profile["plays"] == 0:
+        return None
+    rng = rng or _rng
+    cohort = snapshot(scenario["id"])
+    best, best_value = None, 0.0
+    for question_id, question in scenario["questions"].items():
+        counters = cohort.get(question_id) or _new_stats()
+        student = profile["questions"][question_id]
+        cohort_rate = (counters["missed"] + 1) / (counters["plays"] + 2)
+        miss_rate = (student["missed"] + PRIOR_WEIGHT * cohort_rate) / (student["asked"] + student["missed"] + PRIOR_WEIGHT)
+        if miss_rate < MIN_MISS_RATE:
+            continue
+        effect = rng.betavariate(1 + counters["followed"], 1 + counters["shown"] - counters["followed"])
+        value = miss_rate * question["yes"]["score"] * effect
+        if student["critical_missed_last"]:
+            value *= CRITICAL_BONUS
+        if value > best_value:
+            best, best_value = question_id, value
+    return best
+
+
+def load_log(path):
+    """상담 로그 파일 하나를 읽어 카운터를 채우고 더한 판 수를 돌려줍니다. 잘못된 기록은 건너뜁니다."""
+    return eventlog.replay(path, add_entry)[0]
+
+
+load_log(eventlog.log_path(time.time()))
@@ -0,0 +1,70 @@
+"""강사용 학급 통계 화면 (?instructor=1).
+
+cohort.snapshot()의 누적 카운터만 읽으므로 새로고침 비용은 상담 수와 무관합니다.
+화면은 REFRESH_SECONDS마다 통계 부분만 다시 그립니다.
+"""
+
+import time
+
+import streamlit as st
+
+import cohort
+
+REFRESH_SECONDS = 5
+TOP_ORDERS = 10
+
+
+def _share(part, total):
+    return f"{part / total:.0%}" if total else "-"
+
+
+def render_cohort_stats(scenario):
+    """누적 통계를 표와 그래프로 그립니다."""
+    stats = cohort.snapshot(scenario["id"])
+    plays = stats["plays"]
+    st.caption(
+        f"{time.strftime('%H:%M:%S', time.localtime(cohort.started_at()))} 이후 (오늘 로그 포함) · "
+        f"{REFRESH_SECONDS}초마다 갱신"
+    )
+    if not plays:
+        st.info("아직 끝난 상담이 없습니다.")
+        return
+
+    warfarin_drugs = {drug: count for (drug, warfarin), count in stats["drug_by_warfarin"].items() if warfarin}
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("끝난 상담", plays)
+    col2.metric("평균 점수", f"{stats['score_sum'] / plays:.1f}")
+    col3.metric("첫 질문으로 복용 약물 확인", _share(stats["first_question"]["current_meds"], plays))
+    col4.metric(
+        "와파린 환자에게 NSAIDs 추천",
+        _share(warfarin_drugs.get("nsaids", 0), sum(warfarin_drugs.values())),
+    )
+
+    left, right = st.columns(2)
+    with left:
+        st.subheader("첫 질문")
+        st.bar_chart({
+            scenario["questions"][question_id]["text"]: count
+            for question_id, count in stats["first_question"].most_common()
+        })
+        st.subheader("결과 분류")
+        st.bar_chart({
+            cohort.OUTCOME_LABELS[kind]: stats["outcomes"][kind]
+            for kind in cohort.OUTCOME_KINDS
+        })
+    with right:
+        st.subheader("점수 분포")
+        st.bar_chart({f"{start}~{start + cohort.SCORE_BIN - 1}": stats["score_bins"][start] for start in sorted(stats["score_bins"])})
+        st.subheader(f"자주 나온 질문 순서 (상위 {TOP_ORDERS}개)")
+        st.dataframe(
+            [
+                {"질문 순서": order or "(질문 없음)", "횟수": count, "비율": _share(count, plays)}
+                for order, count in stats["question_orders"].most_common(TOP_ORDERS)
+            ],
+            hide_index=True,
+        )
+
+
+def render_instructor_page(scenario):
+    st.title(f"📊 학급 상담 통계: {scenario['title']}")
+    st.fragment(run_every=REFRESH_SECONDS)(render_cohort_stats)(scenario)
@@ -0,0 +1,163 @@
+"""직접 입력한 질문을 기존 질문(의도)에 연결하는 글자 n-gram TF-IDF 검색기.
+
+data/question_intents.csv의 예시 문장과 scenario.QUESTIONS의 질문 문구로 프로세스당
+한 번 색인을 만들고 모든 세션이 공유합니다. 색인은 n-gram(열)마다 그 n-gram이 나오는
+예시 번호와 가중치를 이어 붙인 희소 행렬(CSC 형식의 NumPy 배열 세 개)이며, 질문
+하나의 점수는 질문에 나온 n-gram들의 열만 모아 np.bincount 한 번으로 계산하는 희소
+행렬-벡터 곱입니다. 외부 모델이나 네트워크는 쓰지 않습니다.
+
+    python intents.py "요즘 드시는 약 있어요?" "전에도 머리 아팠어요?"
+"""
+
+import csv
+import math
+import os
+import re
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+
+from scenario import QUESTIONS
+from session_record import QUESTION_IDS
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+EXAMPLES_PATH = os.path.join(BASE_DIR, "data", "question_intents.csv")
+NGRAM_SIZES = (1, 2, 3)
+MIN_SCORE = 0.25  # 가장 가까운 예시와의 코사인 유사도가 이보다 낮으면 알아듣지 못한 질문
+NO_INTENT = "none"  # 인사/잡담 예시. 이쪽이 가장 가까우면 질문으로 보지 않음
+INTENT_IDS = QUESTION_IDS + (NO_INTENT,)
+
+_NON_WORD = re.compile(r"[^0-9a-z가-힣]+")
+
+
+def normalize(text):
+    """소문자로 바꾸고 한글/영문/숫자 외의 글자는 공백 하나로 바꿉니다."""
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+def ngrams(text):
+    """앞뒤에 공백을 붙인 문장의 글자 n-gram들 (공백만으로 된 n-gram은 제외)."""
+    padded = f" {normalize(text)} "
+    for size in NGRAM_SIZES:
+        for start in range(len(padded) - size + 1):
+            gram = padded[start:start + size]
+            if not gram.isspace():
+                yield gram
+
+
+def _weights(counts, idf, vocab):
+    """n-gram 개수를 (열 번호 배열, 길이 1로 맞춘 sublinear TF-IDF 가중치 배열)로 바꿉니다."""
+    columns = np.fromiter((vocab[gram] for gram in counts), dtype=np.int64, count=len(counts))
+    tf = np.fromiter((1.0 + math.log(count) for count in counts.values()), dtype=np.float64, count=len(counts))
+    values = tf * idf[columns]
+    norm = np.linalg.norm(values)
+    return columns, values / norm if norm else values
+
+
+def load_examples(path=EXAMPLES_PATH):
+    """(의도, 예시 문장) 목록. 질문 문구 자체도 예시로 넣습니다.
+
+    "요?", "세요" 같은 공손한 어미는 어느 질문에나 나오므로, 잡담 예시(NO_INTENT)를
+    함께 넣어 어미만 겹치는 문장이 질문으로 연결되지 않게 합니다.
+    """
+    examples = [(question_id, question["text"]) for question_id, question in QUESTIONS.items()]
+    with open(path, encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            if row["intent"] not in INTENT_IDS:
+                raise ValueError(f"알 수 없는 질문 의도입니다: {row['intent']} ({row['example']})")
+            examples.append((row["intent"], row["example"]))
+    return examples
+
+
+def build_index(examples):
+    """예시 문장들로 n-gram 사전, IDF, CSC 희소 행렬을 만듭니다."""
+    examples = sorted(examples, key=lambda example: INTENT_IDS.index(example[0]))  # 의도별로 연속되게
+    counts = [Counter(ngrams(text)) for _, text in examples]
+    document_frequency = Counter(gram for row in counts for gram in row)
+    vocab = {gram: column for column, gram in enumerate(sorted(document_frequency))}
+    n_rows = len(examples)
+    idf = np.array(
+        [math.log((1 + n_rows) / (1 + document_frequency[gram])) + 1.0 for gram in sorted(document_frequency)]
+    )
+
+    # 행 단위로 가중치를 구한 뒤 열 순서로 정렬해 CSC로 만듭니다.
+    row_ids, column_ids, values = [], [], []
+    for row, row_counts in enumerate(counts):
+        columns, weights = _weights(row_counts, idf, vocab)
+        row_ids.append(np.full(len(columns), row, dtype=np.int32))
+        column_ids.append(columns)
+        values.append(weights)
+    row_ids, column_ids, values = np.concatenate(row_ids), np.concatenate(column_ids), np.concatenate(values)
+    order = np.argsort(column_ids, kind="stable")
+    indptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(column_ids, minlength=len(vocab)), out=indptr[1:])
+
+    intents = np.array([INTENT_IDS.index(intent) for intent, _ in examples])
+    intent_ids = sorted(set(intents.tolist()))
+    return {
+        "vocab": vocab,
+        "idf": idf,
+        "indptr": indptr,
+        "rows": row_ids[order],
+        "values": values[order],
+        "n_rows": n_rows,
+        "intent_ids": np.array(intent_ids),                                      # 색인에 있는 의도 번호
+        "intent_starts": np.searchsorted(intents, intent_ids),                   # 의도별 첫 예시 행
+    }
+
+
+INDEX = build_index(load_examples())
+
+
+def scores(text, index=INDEX):
+    """질문 의도별 점수(그 의도의 예시 중 가장 높은 코사인 유사도)를 {의도: 점수}로 돌려줍니다."""
+    counts = Counter(gram for gram in ngrams(text) if gram in index["vocab"])
+    if not counts:
+        return {}
+    columns, weights = _weights(counts, index["idf"], index["vocab"])
+
+    # 희소 행렬-벡터 곱: 질문에 나온 열들의 (행, 가중치)만 모아 행별로 더합니다.
+    starts, ends = index["indptr"][columns], index["indptr"][columns + 1]
+    lengths = ends - starts
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+    row_scores = np.bincount(
+        index["rows"][offsets], weights=index["values"][offsets] * np.repeat(weights, lengths), minlength=index["n_rows"]
+    )
+    best = np.maximum.reduceat(row_scores, index["intent_starts"])
+    return {INTENT_IDS[intent]: float(score) for intent, score in zip(index["intent_ids"], best)}
+
+
+def match(text, allowed=None, index=INDEX):
+    """질문을 가장 가까운 의도로 연결해 (질문 id, 점수)를 돌려줍니다.
+
+    allowed를 주면 그 질문들(과 잡담) 중에서만 고르며, 잡담이 가장 가깝거나 점수가
+    MIN_SCORE보다 낮으면 None입니다.
+    """
+    candidates = {
+        intent: score for intent, score in scores(text, index).items()
+        if allowed is None or intent in allowed or intent == NO_INTENT
+    }
+    if not candidates:
+        return None
+    question_id = max(candidates, key=candidates.get)
+    if question_id == NO_INTENT or candidates[question_id] < MIN_SCORE:
+        return None
+    return question_id, candidates[question_id]
+
+
+def main():
+    queries = sys.argv[1:] or ["요즘 드시는 약 있어요?", "전에도 머리 아팠어요?", "언제부터 그랬어요?", "다음 주에 치과 가세요?", "점심 드셨어요?"]
+    print(f"색인: 예시 {INDEX['n_rows']}개, n-gram {len(INDEX['vocab'])}개, 0이 아닌 값 {len(INDEX['values'])}개")
+    for query in queries:
+        started = time.perf_counter()
+        for _ in range(1000):
+            result = match(query)
+        elapsed = (time.perf_counter() - started) / 1000
+        print(f"{query!r:<32} -> {result[0] if result else '(알 수 없음)':<22} "
+              f"{result[1] if result else 0:.2f}  {elapsed * 1e6:.0f} µs/질문")
+
+
+if __name__ == "__main__":
+    main()
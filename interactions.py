@@ -0,0 +1,69 @@
+"""약물 상호작용 지식 베이스.
+
+data/interactions.csv의 (약물 계열, 위험 요인) 쌍을 프로세스당 한 번 읽어
+(약물 계열, 위험 요인) -> 상호작용 사전으로 색인합니다. 조회는 사전 접근
+한 번이므로 표가 수천 쌍으로 늘어나도 환자 한 명을 확인하는 비용은 환자가 가진
+위험 요인 수에만 비례합니다.
+
+약물 계열 이름은 scenario.PAINKILLERS의 키(nsaids, acetaminophen)와 같고,
+위험 요인 이름은 scenario.CONDITION_RISK_FACTORS로 숨겨진 상태와 연결됩니다.
+
+지식 베이스는 추천 결과에 덧붙이는 설명을 고릅니다. 점수는 학생이 어떤 질문을 했는지에도
+달려 있어 시나리오의 결과 규칙이 정하며, 두 쪽이 어긋나지 않는지는 tests/에서 확인합니다.
+"""
+
+import csv
+import os
+
+import messages
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+KB_PATH = os.path.join(BASE_DIR, "data", "interactions.csv")
+
+# 심각도 -> (Streamlit 표시 함수 이름, 화면 문구)
+SEVERITIES = {
+    "major": ("error", "중대"),
+    "moderate": ("warning", "주의"),
+    "minor": ("info", "참고"),
+}
+
+
+def load_index(path=KB_PATH):
+    """CSV 지식 베이스를 {(약물 계열, 위험 요인): 상호작용} 사전으로 읽습니다."""
+    index = {}
+    with open(path, encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            if row["severity"] not in SEVERITIES:
+                raise ValueError(f"알 수 없는 심각도입니다: {row['severity']} ({row['drug_class']}, {row['risk_factor']})")
+            index[row["drug_class"], row["risk_factor"]] = row
+    return index
+
+
+INDEX = load_index()
+
+
+def lookup(drug_class, risk_factor):
+    """(약물 계열, 위험 요인) 상호작용을 돌려줍니다. 없으면 None."""
+    return INDEX.get((drug_class, risk_factor))
+
+
+def check(drug_class, risk_factors):
+    """환자의 위험 요인 중 이 약물 계열과 상호작용하는 항목들을 돌려줍니다."""
+    return [INDEX[drug_class, factor] for factor in risk_factors if (drug_class, factor) in INDEX]
+
+
+def interaction_notes(drug_class, risk_factors):
+    """상호작용 설명을 engine 피드백 형식 (종류, 내용) 목록으로 만듭니다.
+
+    내용은 messages.Template이라 화면의 언어로 그릴 때 약 이름, 위험 요인, 설명도 번역됩니다.
+    """
+    notes = []
+    for interaction in check(drug_class, risk_factors):
+        kind, label = SEVERITIES[interaction["severity"]]
+        notes.append((kind, messages.Template("interaction", {
+            "drug": messages.message_id(interaction["drug_label"]),
+            "risk": messages.message_id(interaction["risk_label"]),
+            "severity": messages.message_id(label),
+            "explanation": messages.message_id(interaction["explanation"]),
+        })))
+    return notes
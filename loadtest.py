@@ -0,0 +1,215 @@
+"""Streamlit AppTest로 여러 학생의 동시 접속을 흉내 내는 부하 테스트.
+
+네트워크나 브라우저 없이, 학생 한 명당 AppTest 인스턴스(= 세션) 하나를 스레드로
+돌리며 버튼 클릭마다 스크립트 재실행 시간(대기 시간 포함)을 잽니다.
+
+    python loadtest.py --sessions 1,10,40 --plays 3 --policy random
+    python loadtest.py --scenario warfarin_implant --sessions 40
+    python loadtest.py --save benchmarks/loadtest_baseline.json
+    python loadtest.py --compare benchmarks/loadtest_baseline.json
+
+결과: 세션 수별 클릭 지연 p50/p95/p99(ms), 처리량(클릭/초), 클릭당 스크립트 실행 횟수,
+최대 RSS(MB).
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from streamlit.testing.v1 import AppTest
+
+import checkpoint
+import eventlog
+import metrics
+import profiles
+from scenario import SCENARIOS
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(BASE_DIR, "app.py")
+DEFAULT_BASELINE = os.path.join(BASE_DIR, "benchmarks", "loadtest_baseline.json")
+REGRESSION_TOLERANCE = 1.25  # 기준값보다 25% 이상 느려지면 회귀로 표시
+
+# AppTest.run()은 실행할 때마다 프로세스 전역 Runtime 인스턴스를 바꿔 끼우므로
+# 한 프로세스 안에서 동시에 돌릴 수 없습니다. 실행 자체는 한 번에 하나씩 하되,
+# 대기 시간을 지연에 포함시켜 GIL을 나눠 쓰는 단일 서버 프로세스와 비슷하게 잽니다.
+_RUN_LOCK = threading.Lock()
+
+# 부하 테스트 판, 프로필, 체크포인트는 실제 학생 기록과 섞이지 않도록 따로 기록합니다.
+eventlog.LOG_DIR = os.path.join(eventlog.LOG_DIR, "loadtest")
+profiles.DB_PATH = os.path.join(eventlog.LOG_DIR, "profiles.db")
+checkpoint.DB_PATH = os.path.join(eventlog.LOG_DIR, "checkpoints.db")
+
+# 단계 -> (선택 위젯 종류, 위젯 key, 실행 버튼 key)
+STEP_WIDGETS = {
+    "patient_presentation": ("radio", "q1_choice_final_v2", "ask_q1_final_v2"),
+    "first_question_follow_up": ("radio", "follow_up_choice_final_v2", "confirm_follow_up_final_v2"),
+    "action_decision": ("selectbox", "action_choice_dynamic_final_v2", "execute_action_dynamic_final_v2"),
+    "drug_recommendation": ("radio", "pk_choice_radio_final_v2", "confirm_pk_final_v2"),
+}
+
+
+# --- 질문 선택 정책: (단계, 선택지 목록, 난수 생성기) -> 고른 선택지 ---
+def random_policy(step, options, rng):
+    """매 단계 무작위로 고르는 학생."""
+    return rng.choice(options)
+
+
+def careful_policy(step, options, rng):
+    """복용 약물과 병력을 먼저 확인하고 아세트아미노펜을 고르는 학생."""
+    for keyword in ("복용 약물", "다른 약 복용", "병력 및 치료", "추가 정보 수집", "아세트아미노펜"):
+        for option in options:
+            if keyword in option:
+                return option
+    return next((option for option in options if "진통제 종류" in option), options[0])
+
+
+def hasty_policy(step, options, rng):
+    """증상만 묻고 바로 약을 고르는 학생."""
+    if step == "drug_recommendation":
+        return rng.choice(options)
+    for keyword in ("증상 구체화", "바로 약물 추천", "진통제 종류"):
+        for option in options:
+            if keyword in option:
+                return option
+    return options[0]
+
+
+POLICIES = {"random": random_policy, "careful": careful_policy, "hasty": hasty_policy}
+
+
+# --- 학생 한 명 ---
+def _timed_run(at, latencies):
+    started = time.perf_counter()
+    with _RUN_LOCK:
+        at.run()
+    latencies.append(time.perf_counter() - started)
+    if at.exception:
+        raise RuntimeError(f"앱 실행 중 예외: {at.exception[0].message}")
+
+
+def run_student(scenario_id, policy, plays, seed, timeout):
+    """학생 한 명이 plays판을 끝까지 진행하고 클릭별 지연 목록을 돌려줍니다."""
+    rng = random.Random(seed)
+    latencies = []
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    at.query_params["scenario"] = scenario_id
+    _timed_run(at, latencies)
+    at.button[0].click()  # 시작 화면의 '시뮬레이션 시작하기'
+    _timed_run(at, latencies)
+
+    finished = 0
+    while finished < plays:
+        step = at.session_state["record"].step
+        if step == "simulation_result":
+            finished += 1
+            if finished == plays:
+                break
+            at.button(key="restart_game_final_v2").click()
+        else:
+            kind, widget_key, button_key = STEP_WIDGETS[step]
+            widget = getattr(at, kind)(key=widget_key)
+            widget.set_value(policy(step, list(widget.options), rng))
+            at.button(key=button_key).click()
+        _timed_run(at, latencies)
+    return latencies
+
+
+def peak_rss_mb():
+    """현재 프로세스의 최대 RSS (MB)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def percentile(values, q):
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1] if len(values) > 1 else values[0]
+
+
+def run_level(scenario_id, sessions, policy, plays, seed, timeout):
+    """sessions명이 동시에 접속했을 때의 지연/처리량/메모리를 잽니다."""
+    runs_before = sum(stats["runs"] for stats in metrics.snapshot()["steps"].values())
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as executor:
+        futures = [
+            executor.submit(run_student, scenario_id, policy, plays, seed + index, timeout)
+            for index in range(sessions)
+        ]
+        latencies = [latency for future in futures for latency in future.result()]
+    elapsed = time.perf_counter() - started
+    runs = sum(stats["runs"] for stats in metrics.snapshot()["steps"].values()) - runs_before
+    return {
+        "sessions": sessions,
+        "clicks": len(latencies),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "throughput_per_s": round(len(latencies) / elapsed, 1),
+        "script_runs_per_click": round(runs / len(latencies), 2),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "threads": threading.active_count(),
+    }
+
+
+def compare(results, baseline):
+    """기준 결과와 비교해 p95 지연이 허용치를 넘은 항목을 돌려줍니다."""
+    regressions = []
+    for scenario_id, levels in results.items():
+        base_levels = {level["sessions"]: level for level in baseline.get(scenario_id, [])}
+        for level in levels:
+            base = base_levels.get(level["sessions"])
+            if base and level["p95_ms"] > base["p95_ms"] * REGRESSION_TOLERANCE:
+                regressions.append(f"{scenario_id} sessions={level['sessions']}: p95 {base['p95_ms']}ms -> {level['p95_ms']}ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AppTest 기반 동시 접속 부하 테스트")
+    parser.add_argument("--scenario", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument("--sessions", default="1,5,10", help="쉼표로 구분한 동시 세션 수 목록")
+    parser.add_argument("--plays", type=int, default=2, help="학생 한 명이 진행할 판 수")
+    parser.add_argument("--policy", default="random", choices=sorted(POLICIES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=30.0, help="클릭 한 번의 최대 실행 시간(초)")
+    parser.add_argument("--save", nargs="?", const=DEFAULT_BASELINE, help="결과를 기준 JSON으로 저장")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, help="기준 JSON과 비교")
+    args = parser.parse_args()
+
+    policy = POLICIES[args.policy]
+    results = {}
+    for scenario_id in args.scenario:
+        results[scenario_id] = []
+        for sessions in (int(value) for value in args.sessions.split(",")):
+            level = run_level(scenario_id, sessions, policy, args.plays, args.seed, args.timeout)
+            results[scenario_id].append(level)
+            print(
+                f"{scenario_id:<16} sessions={sessions:<4} clicks={level['clicks']:<5} "
+                f"p50={level['p50_ms']:>8}ms p95={level['p95_ms']:>8}ms p99={level['p99_ms']:>8}ms "
+                f"throughput={level['throughput_per_s']:>7}/s runs/click={level['script_runs_per_click']} "
+                f"rss={level['peak_rss_mb']}MB"
+            )
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"policy": args.policy, "plays": args.plays, "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"기준 결과 저장: {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline)
+        for line in regressions:
+            print(f"[회귀] {line}")
+        if regressions:
+            sys.exit(1)
+        print("기준 대비 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""환자 대사, 피드백, 결과 메시지의 언어별 메시지 카탈로그.
+
+시나리오 데이터(scenario.py)의 한국어 문장이 원문이며, 같은 문장은 여러 곳에 나와도
+번호(메시지 id) 하나만 받습니다. 컴파일된 시나리오와 engine은 문장 대신 이 번호를
+들고 다니고, 화면(ui, report)에 그릴 때 text()가 언어별 카탈로그 파일에서 문장을
+꺼냅니다. 번역은 data/messages/<언어>.csv에 (ko, text)로 원문과 번역을 한 줄씩 적고,
+번역이 없는 문장과 번역 파일이 없는 언어는 한국어로 보여줍니다.
+
+카탈로그 파일은 언어마다 하나(CATALOG_DIR/<언어>.bin)이며 mmap으로 열어 읽기만
+하므로, 언어를 늘려도 프로세스마다 문장 사본이 늘지 않고 여러 작업 프로세스가 같은
+페이지를 공유합니다. 파일 배치 (little-endian):
+
+    4s "MSGC"  I 메시지 수 n  I 원문 체크섬(crc32)  I * (n + 1) 오프셋  + UTF-8 본문
+
+원문이 바뀌어 체크섬이 맞지 않거나 파일이 없으면 처음 쓸 때 다시 만듭니다.
+
+    python messages.py   # 배포 전에 모든 언어의 카탈로그를 미리 만듦
+"""
+
+import csv
+import glob
+import mmap
+import os
+import struct
+import threading
+import zlib
+from collections import namedtuple
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DIR = os.path.join(BASE_DIR, "data", "messages")
+CATALOG_DIR = os.path.join(BASE_DIR, ".cache", "messages")
+DEFAULT_LOCALE = "ko"
+MAGIC = b"MSGC"
+HEADER = struct.Struct("<4sII")
+OFFSET = struct.Struct("<I")
+SPAN = struct.Struct("<II")  # 메시지 하나의 (시작, 끝) 오프셋
+
+_lock = threading.Lock()
+_catalog_lock = threading.Lock()  # _open()이 _source()의 _lock을 잡으므로 따로 둠
+_ids = None       # 한국어 원문 -> 메시지 id
+_checksum = None
+_catalogs = {}    # 언어 -> (mmap, 본문 시작 위치)
+
+# scenario.UI_TEXTS의 문구 이름과 {이름} 자리에 넣을 값(메시지 id 또는 문자열). text()가
+# 값을 먼저 번역한 뒤 문구를 채우므로, 피드백 목록에 넣어 두었다가 화면의 언어로 그릴 수 있습니다.
+Template = namedtuple("Template", "key values")
+
+
+# --- 원문 모으기 ---
+def _notes(notes):
+    return [text for _, text in notes if text]
+
+
+def _branch_texts(branch):
+    texts = [branch["answer"]] + _notes(branch["notes"])
+    again = branch.get("again", {})
+    if "answer" in again:
+        texts.append(again["answer"])
+    return texts + _notes(again.get("notes", ()))
+
+
+def source_messages():
+    """시나리오 데이터와 평가 문구의 모든 대사/피드백/결과 문장 (중복 없이, 정의 순서대로)."""
+    import interactions
+    from engine import GRADE_TEXTS
+    from scenario import QUESTIONS, SCENARIOS, UI_TEXTS, UNCLEAR_QUESTION_ANSWER
+
+    texts = []
+    for question in QUESTIONS.values():
+        texts.append(question["hint"])
+        for branch_name in ("yes", "no"):
+            if branch_name in question:
+                texts += _branch_texts(question[branch_name])
+    for spec in SCENARIOS.values():
+        texts += [spec["title"], spec["patient_greeting"]]
+        for override in spec["question_overrides"].values():
+            again = override.get("again", {})
+            texts += ([again["answer"]] if "answer" in again else []) + _notes(again.get("notes", ()))
+        for senior in spec["senior"].values():
+            texts += [senior["prefix"], senior["suffix"]] + [text for _, text in senior["parts"]] + _notes(senior["notes"])
+            if "history" in senior:
+                texts.append(senior["history"])
+        texts += [rule["message"] for rule in spec["outcome_rules"]]
+    texts += list(GRADE_TEXTS) + [UNCLEAR_QUESTION_ANSWER] + list(UI_TEXTS.values())
+    texts += [label for _, label in interactions.SEVERITIES.values()]
+    for interaction in interactions.INDEX.values():
+        texts += [interaction["drug_label"], interaction["risk_label"], interaction["explanation"]]
+    return [text for text in dict.fromkeys(texts) if text]
+
+
+def _source():
+    """(원문 -> id, 체크섬)을 프로세스당 한 번 만듭니다."""
+    global _ids, _checksum
+    if _ids is None:
+        with _lock:
+            if _ids is None:
+                texts = source_messages()
+                _checksum = zlib.crc32("\0".join(texts).encode("utf-8"))
+                _ids = {text: message_id for message_id, text in enumerate(texts)}
+    return _ids, _checksum
+
+
+def message_id(text):
+    """한국어 원문의 메시지 id. 카탈로그에 없는 문장이면 KeyError."""
+    return _source()[0][text]
+
+
+def to_ids(value):
+    """문장 또는 (종류, 문장) 피드백 목록을 메시지 id로 바꿉니다. (시나리오를 컴파일할 때 호출)"""
+    if isinstance(value, str):
+        return message_id(value) if value else value
+    return [(kind, to_ids(text) if text else text) for kind, text in value]
+
+
+# --- 카탈로그 파일 ---
+def locales():
+    """번역 파일이 있는 언어들 (기본 언어 포함)."""
+    names = sorted(os.path.splitext(os.path.basename(path))[0] for path in glob.glob(os.path.join(SOURCE_DIR, "*.csv")))
+    return [DEFAULT_LOCALE] + [name for name in names if name != DEFAULT_LOCALE]
+
+
+def _translations(locale):
+    """원문 -> 번역 사전. 기본 언어는 원문 그대로."""
+    if locale == DEFAULT_LOCALE:
+        return {}
+    with open(os.path.join(SOURCE_DIR, f"{locale}.csv"), encoding="utf-8", newline="") as f:
+        return {row["ko"]: row["text"] for row in csv.DictReader(f) if row["text"]}
+
+
+def build(locale):
+    """언어 하나의 카탈로그 파일을 만들고 경로를 돌려줍니다. 번역이 없는 문장은 빈 문자열로 둡니다."""
+    ids, checksum = _source()
+    translations = _translations(locale)
+    blobs = [(text if locale == DEFAULT_LOCALE else translations.get(text, "")).encode("utf-8") for text in ids]
+    offsets = [0]
+    for blob in blobs:
+        offsets.append(offsets[-1] + len(blob))
+    os.makedirs(CATALOG_DIR, exist_ok=True)
+    path = os.path.join(CATALOG_DIR, f"{locale}.bin")
+    temp = f"{path}.{os.getpid()}.tmp"
+    with open(temp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(blobs), checksum))
+        f.write(struct.pack(f"<{len(offsets)}I", *offsets))
+        f.write(b"".join(blobs))
+    os.replace(temp, path)  # 다른 프로세스가 반쯤 쓴 파일을 열지 않도록
+    return path
+
+
+def _open(locale):
+    """카탈로그 파일을 mmap으로 열어 (mmap, 본문 시작 위치)를 돌려줍니다.
+
+    없거나 원문과 맞지 않으면 다시 만들고, 그래도 열 수 없으면 None입니다.
+    """
+    path = os.path.join(CATALOG_DIR, f"{locale}.bin")
+    for attempt in range(2):
+        try:
+            if attempt:
+                build(locale)
+            with open(path, "rb") as f:
+                catalog = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, count, checksum = HEADER.unpack_from(catalog)
+            if magic == MAGIC and count == len(_source()[0]) and checksum == _source()[1]:
+                return catalog, HEADER.size + (count + 1) * OFFSET.size
+            catalog.close()
+        except (OSError, ValueError, struct.error, csv.Error, KeyError):
+            pass
+    return None
+
+
+def _catalog(locale):
+    """언어의 (mmap, 본문 시작 위치). 번역 파일이 없거나 카탈로그를 만들 수 없는 언어는 기본 언어 것을 씁니다."""
+    catalog = _catalogs.get(locale)
+    if catalog is None:
+        fallback = None if locale == DEFAULT_LOCALE else _catalog(DEFAULT_LOCALE)
+        with _catalog_lock:
+            catalog = _catalogs.get(locale)
+            if catalog is None:
+                catalog = _open(locale) if locale in locales() else None
+                if catalog is None:
+                    if fallback is None:
+                        raise RuntimeError(f"메시지 카탈로그를 만들 수 없습니다: {CATALOG_DIR}")
+                    catalog = fallback
+                _catalogs[locale] = catalog
+    return catalog
+
+
+# --- 문장 꺼내기 ---
+def text(value, locale=DEFAULT_LOCALE):
+    """메시지 id를 그 언어의 문장으로 바꿉니다.
+
+    id 튜플은 이어 붙이고(선배 약사 조언처럼 조각을 고른 문장), Template은 값을 번역해
+    문구를 채우며, 문자열이나 None은 그대로 돌려줍니다. 번역이 없으면 기본 언어 문장입니다.
+    """
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, Template):
+        return ui_text(value.key, locale, **{name: text(part, locale) for name, part in value.values.items()})
+    if isinstance(value, tuple):
+        return "".join(text(part, locale) for part in value)
+    catalog, body = _catalog(locale)
+    start, end = SPAN.unpack_from(catalog, HEADER.size + value * OFFSET.size)
+    if start == end and locale != DEFAULT_LOCALE:
+        return text(value)
+    return catalog[body + start:body + end].decode("utf-8")
+
+
+def ui_text(key, locale=DEFAULT_LOCALE, **values):
+    """scenario.UI_TEXTS의 안내 문구를 그 언어로 바꾸고 {이름} 자리에 values를 넣습니다."""
+    from scenario import UI_TEXTS
+
+    return text(message_id(UI_TEXTS[key]), locale).format(**values)
+
+
+def notes(value, locale=DEFAULT_LOCALE):
+    """(종류, 메시지 id) 피드백 목록의 문장을 그 언어로 바꿉니다."""
+    return [(kind, text(content, locale)) for kind, content in value]
+
+
+if __name__ == "__main__":
+    for name in locales():
+        path = build(name)
+        print(f"{name}: {path} ({os.path.getsize(path)}바이트, 메시지 {len(_source()[0])}개)")
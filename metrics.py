@@ -0,0 +1,163 @@
+"""스크립트 재실행 비용 측정.
+
+단계(step)별, 세션별로 실행 횟수, 실행 시간, st.rerun 횟수, 이미지/마크다운
+표시 횟수를 프로세스 전역 저장소에 모읍니다. 실행이 끝날 때는 메모리의 카운터만
+고치고, 백그라운드 쓰기 스레드가 FLUSH_INTERVAL초마다(바뀐 것이 있을 때만)
+METRICS_PATH에 JSON으로 저장하므로 측정하려는 재실행 시간에 디스크 쓰기가 끼지 않습니다.
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+METRICS_PATH = os.path.join(BASE_DIR, "metrics", "metrics.json")
+FLUSH_INTERVAL = 30.0
+MAX_SESSIONS = 500  # 세션별 통계는 최근 세션만 보관
+
+COUNTERS = ("runs", "reruns", "images", "markdowns")
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_steps = {}                # 단계 -> {"runs", "reruns", "images", "markdowns", "total_s", "max_s"}
+_sessions = OrderedDict()  # 세션 id -> {"runs", "reruns", "images", "markdowns", "total_s"}
+_started_at = time.time()
+_version = 0         # _record()가 부를 때마다 1씩 늘어남
+_flushed_version = 0  # 마지막으로 파일에 쓴 _version
+_write_lock = threading.Lock()
+_writer = None
+_current = threading.local()  # 실행 중인 스크립트의 표시 횟수 (Streamlit은 세션마다 스레드가 다름)
+
+
+def _new_stats():
+    return dict.fromkeys(COUNTERS, 0) | {"total_s": 0.0, "max_s": 0.0}
+
+
+def count(name):
+    """현재 실행 중에 이미지("images") 또는 마크다운("markdowns")을 한 번 표시했음을 기록합니다."""
+    counters = getattr(_current, "counters", None)
+    if counters is not None:
+        counters[name] += 1
+
+
+@contextmanager
+def track_run(session_id, step):
+    """스크립트 한 번의 실행(한 단계 렌더링)을 측정합니다."""
+    _current.counters = {"images": 0, "markdowns": 0}
+    started = time.perf_counter()
+    rerun = False
+    try:
+        yield
+    except BaseException as exc:
+        # st.rerun()은 예외로 실행을 중단시키므로 이름으로 구분합니다.
+        rerun = type(exc).__name__ == "RerunException"
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        counters, _current.counters = _current.counters, None
+        _record(session_id, step, elapsed, rerun, counters)
+        _ensure_writer()
+
+
+def _record(session_id, step, elapsed, rerun, counters):
+    global _version
+    with _lock:
+        _version += 1
+        for stats in (_steps.setdefault(step, _new_stats()), _session_stats(session_id)):
+            stats["runs"] += 1
+            stats["reruns"] += rerun
+            stats["images"] += counters["images"]
+            stats["markdowns"] += counters["markdowns"]
+            stats["total_s"] += elapsed
+            stats["max_s"] = max(stats["max_s"], elapsed)
+
+
+def _session_stats(session_id):
+    stats = _sessions.get(session_id)
+    if stats is None:
+        stats = _sessions[session_id] = _new_stats()
+        while len(_sessions) > MAX_SESSIONS:
+            _sessions.popitem(last=False)
+    else:
+        _sessions.move_to_end(session_id)
+    return stats
+
+
+def snapshot():
+    """현재까지의 통계를 복사해 돌려줍니다."""
+    with _lock:
+        return {
+            "started_at": _started_at,
+            "updated_at": time.time(),
+            "steps": {step: dict(stats) for step, stats in _steps.items()},
+            "sessions": {session_id: dict(stats) for session_id, stats in _sessions.items()},
+        }
+
+
+def session_stats(session_id):
+    with _lock:
+        return dict(_sessions.get(session_id) or _new_stats())
+
+
+def step_rows():
+    """관리자 패널용: 단계별 평균/최대 시간과 횟수."""
+    rows = []
+    for step, stats in snapshot()["steps"].items():
+        runs = stats["runs"] or 1
+        rows.append({
+            "step": step,
+            "runs": stats["runs"],
+            "reruns": stats["reruns"],
+            "avg_ms": round(stats["total_s"] / runs * 1000, 2),
+            "max_ms": round(stats["max_s"] * 1000, 2),
+            "images": stats["images"],
+            "markdowns": stats["markdowns"],
+        })
+    return sorted(rows, key=lambda row: row["avg_ms"] * row["runs"], reverse=True)
+
+
+def flush():
+    """지금까지의 통계를 파일에 씁니다. 마지막 저장 후 바뀐 것이 없으면 쓰지 않고 False."""
+    global _flushed_version
+    with _write_lock:
+        with _lock:
+            version = _version
+        if version == _flushed_version:
+            return False
+        data = snapshot()
+        os.makedirs(os.path.dirname(METRICS_PATH), exist_ok=True)
+        temp_path = f"{METRICS_PATH}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, METRICS_PATH)
+        _flushed_version = version
+        return True
+
+
+def _run_writer():
+    """FLUSH_INTERVAL초마다 통계를 씁니다. 쓰기에 실패해도 다음 주기에 다시 씁니다."""
+    while True:
+        time.sleep(FLUSH_INTERVAL)
+        try:
+            flush()
+        except OSError:
+            logger.exception("실행 비용 통계를 쓰지 못했습니다: %s", METRICS_PATH)
+
+
+def _ensure_writer():
+    global _writer
+    if _writer is not None:
+        return
+    with _write_lock:
+        if _writer is None:
+            _writer = threading.Thread(target=_run_writer, name="metrics-writer", daemon=True)
+            _writer.start()
+
+
+atexit.register(flush)
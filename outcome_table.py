@@ -0,0 +1,96 @@
+"""진통제 추천 결과표.
+
+결과 규칙을 (숨겨진 상태, 질문 여부, 진통제) 모든 조합에 대해 미리 계산해
+NumPy 배열(점수 변동, 심각도 코드, 메시지 번호)에 담습니다. 조회 키는 불리언
+특징들을 비트로 묶은 정수이므로, 결과 조회는 배열 인덱싱 한 번입니다.
+
+비트 배치 (OUTCOME_FEATURES 순서대로 하위 비트부터, 진통제 번호는 그 위):
+    bit 0  is_warfarin_user
+    bit 1  has_implant_soon
+    bit 2  current_meds_asked
+    bit 3  medical_history_asked
+    bit 4+ 진통제 번호 (DRUGS 순서)
+"""
+
+import numpy as np
+
+# 심각도 코드 -> Streamlit 표시 함수 이름
+SEVERITY_KINDS = ("success", "warning", "error")
+
+
+def severity_code(score):
+    """점수 변동으로 심각도 코드를 정합니다 (-50 미만: 위험, 0 미만: 주의)."""
+    if score < -50:
+        return 2
+    if score < 0:
+        return 1
+    return 0
+
+
+def outcome_index(features, drug_code, values):
+    """특징값 사전과 진통제 번호로 결과표 인덱스를 계산합니다."""
+    index = drug_code << len(features)
+    for bit, feature in enumerate(features):
+        if values.get(feature):
+            index |= 1 << bit
+    return index
+
+
+def build_outcome_table(rules, features, drugs):
+    """규칙 목록(위에서부터 첫 일치 우선)을 결과표로 펼칩니다."""
+    size = len(drugs) << len(features)
+    indices = np.arange(size)
+    columns = {feature: (indices >> bit) & 1 == 1 for bit, feature in enumerate(features)}
+    columns["drug"] = indices >> len(features)
+    drug_codes = {drug: code for code, drug in enumerate(drugs)}
+
+    score = np.zeros(size, dtype=np.int16)
+    message_id = np.full(size, -1, dtype=np.int16)
+    messages, effects = [], []
+    # 아래 규칙부터 덮어써서 결과적으로 첫 번째로 일치하는 규칙이 남게 합니다.
+    for rule_id, rule in reversed(list(enumerate(rules))):
+        matched = np.ones(size, dtype=bool)
+        for key, expected in rule["when"].items():
+            matched &= columns[key] == (drug_codes[expected] if key == "drug" else expected)
+        score[matched] = rule["score"]
+        message_id[matched] = rule_id
+    for rule in rules:
+        messages.append(rule["message"])
+        effects.append(tuple(rule.get("effects", ())))
+
+    if (message_id < 0).any():
+        missing = int(np.flatnonzero(message_id < 0)[0])
+        raise ValueError(f"결과 규칙이 없는 조합입니다: index={missing}")
+
+    return {
+        "features": tuple(features),
+        "drug_codes": drug_codes,
+        "score": score,
+        "severity": np.array([severity_code(int(value)) for value in score], dtype=np.int8),
+        "message_id": message_id,
+        "messages": tuple(messages),
+        "effects": tuple(effects),
+    }
+
+
+def lookup(table, drug, values):
+    """한 상담의 결과를 (점수 변동, 심각도 코드, 메시지 번호)로 돌려줍니다."""
+    index = outcome_index(table["features"], table["drug_codes"][drug], values)
+    return int(table["score"][index]), int(table["severity"][index]), int(table["message_id"][index])
+
+
+def table_rows(table):
+    """결과표 전체를 사람이 읽을 수 있는 행 목록으로 풀어냅니다 (분석/검증용)."""
+    features = table["features"]
+    drugs = {code: drug for drug, code in table["drug_codes"].items()}
+    rows = []
+    for index in range(len(table["score"])):
+        row = {"drug": drugs[index >> len(features)]}
+        row.update({feature: bool(index >> bit & 1) for bit, feature in enumerate(features)})
+        row.update(
+            score=int(table["score"][index]),
+            severity=SEVERITY_KINDS[table["severity"][index]],
+            message=table["messages"][table["message_id"][index]],
+        )
+        rows.append(row)
+    return rows
@@ -0,0 +1,220 @@
+"""학생별 학습 프로필 저장소 (브라우저를 새로 고쳐도 남는 힌트 기록).
+
+익명 학생 id(세션마다 만들거나 '이어하기 링크'의 ?student=)와 시나리오마다 지금까지 끝낸 판 수와 질문별
+기록(그 질문을 한 판 수, 빠뜨린 판 수, 지난 판에 중요한 질문을 빠뜨렸는지)을
+SQLite(WAL 모드)에 저장합니다.
+
+- 읽기: 세션이 시작될 때 한 번, 메모리 캐시에 없으면 연결 풀의 연결로 읽습니다.
+- 쓰기: record_play()는 메모리의 프로필만 고치고 바로 돌아옵니다(write-behind).
+  백그라운드 쓰기 스레드(writebehind)가 바뀐 프로필을 모아 FLUSH_INTERVAL초마다
+  트랜잭션 하나로 씁니다. 쓰기에 실패한 프로필은 버리지 않고 다음에 다시 씁니다.
+  아직 쓰이지 않은 프로필도 load()는 메모리에서 최신 값을 읽습니다.
+
+파일: profiles/learners.db
+"""
+
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from scenario import QUESTIONS
+from session_record import QUESTION_IDS
+from writebehind import WriteBehind
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(BASE_DIR, "profiles", "learners.db")
+POOL_SIZE = 4
+FLUSH_INTERVAL = 1.0
+MAX_CACHED = 4096  # 메모리에 들고 있는 (학생, 시나리오) 프로필 수
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    student_id TEXT NOT NULL,
+    scenario_id TEXT NOT NULL,
+    plays INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (student_id, scenario_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS question_history (
+    student_id TEXT NOT NULL,
+    scenario_id TEXT NOT NULL,
+    question_id TEXT NOT NULL,
+    asked INTEGER NOT NULL,
+    missed INTEGER NOT NULL,
+    critical_missed_last INTEGER NOT NULL,
+    PRIMARY KEY (student_id, scenario_id, question_id)
+) WITHOUT ROWID;
+"""
+
+# 질문 여부 플래그 -> 질문 id (시나리오의 hints는 플래그로 질문을 가리킴)
+QUESTION_BY_FLAG = {question["flag"]: question_id for question_id, question in QUESTIONS.items()}
+
+_lock = threading.Lock()
+_cache = OrderedDict()  # (학생 id, 시나리오 id) -> 프로필
+_pool = queue.LifoQueue()
+_pool_lock = threading.Lock()
+_opened = 0
+_schema_ready = False
+
+
+def new_profile():
+    return {
+        "plays": 0,
+        "questions": {
+            question_id: {"asked": 0, "missed": 0, "critical_missed_last": False} for question_id in QUESTION_IDS
+        },
+    }
+
+
+# --- 연결 풀 ---
+def _connect():
+    """WAL 모드 연결을 엽니다. 처음 열 때 테이블을 만듭니다."""
+    global _schema_ready
+    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+    conn = sqlite3.connect(DB_PATH, timeout=5.0, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    if not _schema_ready:
+        conn.executescript(SCHEMA)
+        _schema_ready = True
+    return conn
+
+
+@contextmanager
+def _connection():
+    """풀에서 연결 하나를 빌립니다. 풀이 비어 있고 POOL_SIZE개 미만이면 새로 엽니다."""
+    global _opened
+    try:
+        conn = _pool.get_nowait()
+    except queue.Empty:
+        with _pool_lock:
+            can_open = _opened < POOL_SIZE
+            if can_open:
+                _opened += 1
+        conn = _connect() if can_open else _pool.get()
+    try:
+        yield conn
+    finally:
+        _pool.put(conn)
+
+
+# --- 읽기 ---
+def _read(student_id, scenario_id):
+    profile = new_profile()
+    with _connection() as conn:
+        row = conn.execute(
+            "SELECT plays FROM profiles WHERE student_id = ? AND scenario_id = ?", (student_id, scenario_id)
+        ).fetchone()
+        if row is None:
+            return profile
+        profile["plays"] = row[0]
+        rows = conn.execute(
+            "SELECT question_id, asked, missed, critical_missed_last FROM question_history "
+            "WHERE student_id = ? AND scenario_id = ?",
+            (student_id, scenario_id),
+        ).fetchall()
+    for question_id, asked, missed, critical in rows:
+        if question_id in profile["questions"]:
+            profile["questions"][question_id] = {"asked": asked, "missed": missed, "critical_missed_last": bool(critical)}
+    return profile
+
+
+def _copy(profile):
+    return {"plays": profile["plays"], "questions": {key: dict(value) for key, value in profile["questions"].items()}}
+
+
+def _cached(key):
+    """메모리의 프로필을 돌려줍니다. 없으면 None. (_lock 안에서 호출)"""
+    profile = _writes.pending.get(key) or _cache.get(key)
+    if profile is not None and key in _cache:
+        _cache.move_to_end(key)
+    return profile
+
+
+def _remember(key, profile):
+    """프로필을 메모리 캐시에 넣고 오래된 항목을 버립니다. (_lock 안에서 호출)"""
+    _cache[key] = profile
+    _cache.move_to_end(key)
+    while len(_cache) > MAX_CACHED:
+        _cache.popitem(last=False)
+
+
+def load(student_id, scenario_id):
+    """학생의 시나리오별 프로필을 돌려줍니다. 처음 보는 학생이면 빈 프로필입니다."""
+    key = (student_id, scenario_id)
+    with _lock:
+        profile = _cached(key)
+    if profile is None:
+        profile = _read(student_id, scenario_id)
+        with _lock:
+            # 읽는 사이에 record_play()가 먼저 고쳤다면 그 값을 씁니다.
+            profile = _cached(key) or profile
+            _remember(key, profile)
+    with _lock:
+        return _copy(profile)
+
+
+# --- 쓰기 (write-behind) ---
+def critical_misses(record, scenario):
+    """질문 id -> 이번 판에 이 질문을 빠뜨려 나쁜 결과가 났는지 (시나리오 hints 기준)."""
+    from engine import missed_hints
+
+    missed = missed_hints(record, scenario)
+    return {QUESTION_BY_FLAG[hint["flag"]]: missed[hint["state_key"]] for hint in scenario["hints"]}
+
+
+def record_play(student_id, scenario, record):
+    """끝난 판을 프로필에 반영하고 새 프로필을 돌려줍니다. 파일 쓰기는 백그라운드에서 합니다."""
+    critical = critical_misses(record, scenario)
+    key = (student_id, scenario["id"])
+    load(student_id, scenario["id"])  # 캐시에 없으면 파일에서 먼저 읽어 둠
+    with _lock:
+        profile = _copy(_cached(key) or new_profile())
+        profile["plays"] += 1
+        for question_id, question in scenario["questions"].items():  # 이 시나리오에 없는 질문은 빠뜨린 것이 아님
+            stats = profile["questions"][question_id]
+            asked = record.was_asked(question["flag"])
+            stats["asked" if asked else "missed"] += 1
+            stats["critical_missed_last"] = critical.get(question_id, False)
+        _remember(key, profile)
+        _writes.pending[key] = profile
+        result = _copy(profile)
+    _writes.wake()
+    return result
+
+
+def _write(batch):
+    """바뀐 프로필 묶음을 트랜잭션 하나로 씁니다."""
+    now = time.time()
+    with _connection() as conn, conn:
+        conn.executemany(
+            "INSERT INTO profiles (student_id, scenario_id, plays, updated_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (student_id, scenario_id) DO UPDATE SET plays = excluded.plays, updated_at = excluded.updated_at",
+            [(student_id, scenario_id, profile["plays"], now) for (student_id, scenario_id), profile in batch],
+        )
+        conn.executemany(
+            "INSERT INTO question_history (student_id, scenario_id, question_id, asked, missed, critical_missed_last) "
+            "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (student_id, scenario_id, question_id) DO UPDATE SET "
+            "asked = excluded.asked, missed = excluded.missed, critical_missed_last = excluded.critical_missed_last",
+            [
+                (student_id, scenario_id, question_id, stats["asked"], stats["missed"], int(stats["critical_missed_last"]))
+                for (student_id, scenario_id), profile in batch
+                for question_id, stats in profile["questions"].items()
+            ],
+        )
+
+
+_writes = WriteBehind("profiles-writer", _write, FLUSH_INTERVAL, lock=_lock)
+
+
+def flush():
+    """아직 쓰지 않은 프로필을 지금 씁니다. (프로세스 종료 시 자동 호출)"""
+    _writes.flush()
+
+
+atexit.register(flush)
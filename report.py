@@ -0,0 +1,229 @@
+"""끝난 상담 한 판을 HTML 보고서 파일 하나로 만드는 생성기.
+
+보고서는 상담 로그 한 줄(eventlog.play_entry 형식)만으로 만들어지므로, 결과 화면에서
+방금 끝난 판을 내려받을 때와 강사가 로그로 반 전체를 한꺼번에 내보낼 때 같은 코드를
+씁니다. 이미지는 REPORT_IMAGE_WIDTH로 줄인 JPEG를 data URI로 넣어 파일 하나로
+열리며, 인쇄용 스타일이 있어 브라우저의 '인쇄 → PDF로 저장'으로 PDF를 만들 수 있습니다.
+
+- 화면: submit()이 스레드 풀에서 보고서를 만들고 Future를 돌려줍니다.
+- 일괄 내보내기: 프로세스 풀로 여러 판을 나누어 만듭니다.
+
+    python report.py --class 3A                       # 오늘 로그에서 3A반의 모든 판
+    python report.py --log logs/plays-20261018.jsonl --out reports/1018 --workers 8
+"""
+
+import argparse
+import base64
+import html
+import os
+import re
+import threading
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import assets
+import engine
+import messages
+from scenario import get_scenario
+from session_record import SessionRecord
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+REPORT_DIR = os.path.join(BASE_DIR, "reports")
+REPORT_IMAGE_WIDTH = 480
+UI_WORKERS = 2
+
+# 결과 화면(ui.py)과 같은 이미지를 씁니다.
+IMAGE_PATH_PHARMACY = "image/pharmacy_counter.png"
+IMAGE_PATH_EMERGENCY = "image/emergency_room.png"
+
+STYLE = """
+body { font-family: sans-serif; max-width: 760px; margin: 2em auto; padding: 0 1em; color: #222; line-height: 1.6; }
+h1 { font-size: 1.5em; } h2 { font-size: 1.2em; margin-top: 1.5em; border-bottom: 1px solid #ddd; }
+.meta { color: #666; font-size: 0.9em; }
+.score { font-size: 2em; font-weight: bold; }
+figure { margin: 1em 0; text-align: center; } figure img { max-width: 100%; } figcaption { color: #666; font-size: 0.9em; }
+ol.journey li { margin: 0.4em 0; }
+.patient, .senior { margin-left: 1.5em; font-style: italic; }
+.result { font-weight: bold; }
+@media print { body { margin: 0; max-width: none; } figure { page-break-inside: avoid; } }
+"""
+
+_ui_pool = None
+_ui_pool_lock = threading.Lock()
+
+
+def _inline_markdown(text):
+    """화면용 문구의 **굵게** 표시만 HTML로 바꿉니다."""
+    return re.sub(r"\*\*(.+?)\*\*", r"<b>\1</b>", html.escape(text))
+
+
+def _label(key, locale, **values):
+    """scenario.UI_TEXTS의 안내 문구를 locale 언어로 바꿔 HTML로 이스케이프합니다."""
+    return html.escape(messages.ui_text(key, locale, **values))
+
+
+def _image(path, caption):
+    """이미지를 줄인 JPEG data URI로 넣습니다. 파일이 없으면 빈 문자열."""
+    try:
+        data = assets.get_image_bytes(path, REPORT_IMAGE_WIDTH)
+    except FileNotFoundError:
+        return ""
+    encoded = base64.b64encode(data).decode("ascii")
+    return (
+        f'<figure><img src="data:image/jpeg;base64,{encoded}" alt="{html.escape(caption)}">'
+        f"<figcaption>{html.escape(caption)}</figcaption></figure>"
+    )
+
+
+def record_from_entry(entry):
+    """로그 한 줄을 끝난 상담 레코드로 되돌립니다."""
+    record = SessionRecord(entry["conditions"])
+    record.history = array("H", entry["history"])
+    record.safety_score = entry["score"]
+    record.step = "simulation_result"
+    record.game_over = True
+    return record
+
+
+def _journey_item(item, locale):
+    content = html.escape(messages.text(item["content"], locale))
+    if item["type"] == "질문":
+        return f"<li><b>{_label('journey_question', locale)}</b> {content}</li>"
+    if item["type"] == "환자 답변":
+        return f'<li class="patient"><b>{_label("journey_patient", locale)}</b> 🗣️ {content}</li>'
+    if item["type"] == "약사 행동":
+        return f"<li><b>{_label('journey_action', locale)}</b> {content}</li>"
+    if item["type"] == "약물 추천":
+        return f"<li><b>{_label('journey_drug', locale)}</b> {content}</li>"
+    if item["type"] == "최종 결과":
+        change = _label("score_change", locale, change=item.get("score_change", 0))
+        return f'<li class="result"><b>{_label("journey_result", locale)}</b> {content} {change}</li>'
+    senior = html.escape(messages.text(item["content"], locale).replace(messages.ui_text("senior_prefix", locale), ""))
+    return f'<li class="senior"><b>{_label("journey_senior", locale)}</b> 🧑‍⚕️ {senior}</li>'
+
+
+def render_entry(entry, locale=messages.DEFAULT_LOCALE):
+    """상담 로그 한 줄을 완결된 HTML 문서 문자열로 만듭니다. 안내 문구, 환자 대사와 결과는 locale 언어로 씁니다."""
+    scenario = get_scenario(entry["scenario"])
+    record = record_from_entry(entry)
+    outcome = engine.play_summary(record)["outcome"]
+    effects = scenario["outcomes"]["effects"][outcome] if outcome is not None else ()
+    title = messages.text(messages.message_id(scenario["title"]), locale)
+
+    meta = [time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["ts"])), messages.ui_text("report_play", locale, play=entry["play"])]
+    if entry.get("class"):
+        meta.insert(0, messages.ui_text("report_class", locale, class_code=entry["class"]))
+    parts = [
+        "<!DOCTYPE html>",
+        f'<html lang="{html.escape(locale)}"><head><meta charset="utf-8">',
+        f"<title>{_label('report_title', locale, title=title)}</title>",
+        f"<style>{STYLE}</style></head><body>",
+        f"<h1>{_label('report_heading', locale)}</h1>",
+        f'<p class="meta">{html.escape(title)} · {html.escape(" · ".join(meta))}</p>',
+        _image(IMAGE_PATH_PHARMACY, messages.ui_text("pharmacy_caption", locale)),
+        f"<h2>{_label('result_header', locale)}</h2>",
+        f'<p>{_label("final_score", locale)} <span class="score">{entry["score"]}</span></p>',
+        f"<p>{_inline_markdown(messages.text(engine.grade(entry['score']), locale))}</p>",
+    ]
+    if "emergency_image" in effects:
+        parts.append(_image(IMAGE_PATH_EMERGENCY, messages.ui_text("emergency_caption", locale)))
+    parts.append(f"<h2>{_label('journey_header', locale)}</h2>")
+    parts.append('<ol class="journey">')
+    parts.extend(_journey_item(item, locale) for item in engine.expand_history(record, scenario))
+    parts.append("</ol>")
+    parts.append(f'<p class="meta">{_label("report_print", locale)}</p>')
+    parts.append("</body></html>")
+    return "\n".join(part for part in parts if part)
+
+
+def file_name(entry):
+    """보고서 파일 이름 (세션 앞 8자리, 도전 번호)."""
+    return f"consultation-{entry['session'][:8]}-{entry['play']}.html"
+
+
+# --- 화면에서 쓰는 스레드 풀 ---
+def submit(entry, locale=messages.DEFAULT_LOCALE):
+    """보고서 생성을 스레드 풀에 맡기고 HTML 바이트를 돌려줄 Future를 돌려줍니다."""
+    global _ui_pool
+    if _ui_pool is None:
+        with _ui_pool_lock:
+            if _ui_pool is None:
+                _ui_pool = ThreadPoolExecutor(max_workers=UI_WORKERS, thread_name_prefix="report")
+    return _ui_pool.submit(lambda: render_entry(entry, locale).encode("utf-8"))
+
+
+# --- 반 전체 일괄 내보내기 ---
+def _export_chunk(args):
+    """프로세스 풀 작업 단위: 로그 여러 줄을 out_dir에 보고서 파일로 씁니다."""
+    entries, out_dir, locale = args
+    names = []
+    for entry in entries:
+        name = file_name(entry)
+        with open(os.path.join(out_dir, name), "w", encoding="utf-8") as f:
+            f.write(render_entry(entry, locale))
+        names.append(name)
+    return names
+
+
+def _write_index(entries, names, out_dir, locale=messages.DEFAULT_LOCALE):
+    """보고서 목록 페이지(index.html)를 locale 언어로 씁니다."""
+    rows = "\n".join(
+        f'<tr><td>{html.escape(entry["session"][:8])}</td><td>{entry["play"]}</td><td>{entry["score"]}</td>'
+        f'<td><a href="{html.escape(name)}">{html.escape(name)}</a></td></tr>'
+        for entry, name in zip(entries, names)
+    )
+    with open(os.path.join(out_dir, "index.html"), "w", encoding="utf-8") as f:
+        f.write(
+            f'<!DOCTYPE html><html lang="{html.escape(locale)}"><head><meta charset="utf-8"><title>{_label("index_title", locale)}</title>'
+            f"<style>{STYLE} td, th {{ padding: 0.2em 0.8em; }}</style></head><body>"
+            f"<h1>{_label('index_heading', locale, plays=len(entries))}</h1><table><tr>"
+            + "".join(f"<th>{_label(key, locale)}</th>" for key in ("index_session", "index_play", "index_score", "index_report"))
+            + f"</tr>{rows}</table></body></html>"
+        )
+
+
+def export_entries(entries, out_dir, workers=os.cpu_count(), chunk_size=32, locale=messages.DEFAULT_LOCALE):
+    """로그 여러 줄을 프로세스 풀로 나누어 보고서로 쓰고 목록 페이지(index.html)를 만듭니다."""
+    os.makedirs(out_dir, exist_ok=True)
+    chunks = [(entries[start:start + chunk_size], out_dir, locale) for start in range(0, len(entries), chunk_size)]
+    if workers == 1:
+        results = list(map(_export_chunk, chunks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_export_chunk, chunks))
+    names = [name for chunk_names in results for name in chunk_names]
+    _write_index(entries, names, out_dir, locale)
+    return names
+
+
+def main():
+    from eventlog import log_path, read_entries
+
+    parser = argparse.ArgumentParser(description="상담 로그를 HTML 보고서로 일괄 내보내기")
+    parser.add_argument("--log", default=log_path(time.time()), help="상담 로그 파일 (기본: 오늘)")
+    parser.add_argument("--class", dest="class_code", help="이 반 코드의 판만 내보냄")
+    parser.add_argument("--scenario", help="이 시나리오의 판만 내보냄")
+    parser.add_argument("--out", help="출력 폴더 (기본: reports/<로그 날짜>[-반])")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--lang", default=messages.DEFAULT_LOCALE, choices=messages.locales(), help="보고서의 언어")
+    args = parser.parse_args()
+
+    entries = [
+        entry for entry in read_entries(args.log)
+        if (not args.class_code or entry.get("class") == args.class_code)
+        and (not args.scenario or entry["scenario"] == args.scenario)
+    ]
+    if not entries:
+        print("내보낼 상담 기록이 없습니다.")
+        return
+    out_dir = args.out or os.path.join(
+        REPORT_DIR, os.path.splitext(os.path.basename(args.log))[0] + (f"-{args.class_code}" if args.class_code else "")
+    )
+    started = time.perf_counter()
+    export_entries(entries, out_dir, args.workers, locale=args.lang)
+    print(f"{len(entries)}판 보고서 저장: {out_dir} ({time.perf_counter() - started:.2f}초, 프로세스 {args.workers}개)")
+
+
+if __name__ == "__main__":
+    main()
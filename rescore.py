@@ -0,0 +1,267 @@
+"""지난 상담 로그를 새 점수 규칙(후보 루브릭)으로 다시 채점해 비교하는 도구.
+
+점수 변동(예: warfarin_implant 결과 규칙의 -110/-130/+25)을 바꾸기 전에, 지금까지
+학생들이 한 상담이 새 규칙에서는 몇 점이었을지 확인하는 용도입니다. 로그의 이벤트
+기록(질문 답변, 선배 약사, 추천 약)만으로 점수를 다시 계산하므로 게임을 다시 실행할
+필요가 없습니다. 결과 규칙의 조건을 바꾼 경우에도 숨겨진 상태와 질문 여부로 새
+결과표를 다시 조회합니다.
+
+로그 파일은 줄 단위로 흘려 읽어 CHUNK_SIZE줄씩 프로세스 풀에 넘기고, 작업 단위는
+시나리오별 집계(점수 분포, 평가 등급 이동)만 돌려주므로 메모리는 로그 크기와
+무관합니다. 동시에 처리 중인 묶음은 작업자 수의 두 배까지만 둡니다.
+
+루브릭 파일 (JSON, 시나리오 id별로 바꿀 값만):
+
+    {"warfarin_implant": {
+        "outcome_scores": {"0": -120, "1": -150, "11": 30},   # 결과 규칙 번호 -> 점수 (--show-rules로 확인)
+        "question_scores": {"current_meds": {"yes": 40}},     # 질문 답변 분기별 점수
+        "senior_score": 20,                                   # 선배 약사 도움 점수
+        "outcome_rules": [...]                                 # 결과 규칙 전체를 바꿀 때 (scenario.py 형식)
+    }}
+
+    python rescore.py --rubric rubric.json                      # logs/의 모든 로그
+    python rescore.py --rubric rubric.json --log logs/plays-20261018.jsonl --workers 8
+    python rescore.py --show-rules --scenario warfarin_implant
+"""
+
+import argparse
+import glob
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import engine
+import messages
+import outcome_table
+from eventlog import LOG_DIR
+from scenario import OUTCOME_FEATURES, PAINKILLERS, SCENARIOS, get_scenario
+from session_record import CONDITION_KEYS, DRUG_IDS, EV_ANSWER, EV_DRUG, EV_SENIOR, QUESTION_IDS, decode_event
+
+CHUNK_SIZE = 20_000
+BAND_LABELS = ("훌륭함", "잘함", "아쉬움")  # engine.grade_band 순서
+SCORE_BIN = 10  # 점수 분포를 출력할 때 묶는 폭
+
+_rubrics = None  # 작업 프로세스마다 한 번 컴파일한 {시나리오 id: 채점표}
+
+
+# --- 루브릭 ---
+def compile_rubric(scenario, overrides=None):
+    """시나리오와 바꿀 값으로 채점표(답변 이벤트별 점수, 선배 약사 점수, 결과표)를 만듭니다."""
+    overrides = overrides or {}
+    question_scores = overrides.get("question_scores", {})
+    answer_scores = {}
+    for question_id, question in scenario["questions"].items():
+        for is_yes, branch_name in ((True, "yes"), (False, "no")):
+            branch = question.get(branch_name)
+            if branch is None:
+                continue
+            score = question_scores.get(question_id, {}).get(branch_name, branch["score"])
+            for again in (False, True):
+                answer_scores[QUESTION_IDS.index(question_id) << 2 | is_yes << 1 | again] = score
+
+    rules = [dict(rule) for rule in overrides.get("outcome_rules", scenario["outcome_rules"])]
+    for rule_id, score in overrides.get("outcome_scores", {}).items():
+        rules[int(rule_id)]["score"] = score
+    return {
+        "answer_scores": answer_scores,
+        "flags": {QUESTION_IDS.index(question_id): question["flag"] for question_id, question in scenario["questions"].items()},
+        "senior_score": overrides.get("senior_score", engine.SENIOR_SCORE),
+        "outcomes": outcome_table.build_outcome_table(rules, OUTCOME_FEATURES, tuple(PAINKILLERS)),
+        "start_score": engine.initialize_session(scenario).safety_score,
+    }
+
+
+def compile_rubrics(rubric):
+    """모든 시나리오의 (현재 규칙 채점표, 후보 규칙 채점표)."""
+    return {
+        scenario_id: (compile_rubric(get_scenario(scenario_id)), compile_rubric(get_scenario(scenario_id), rubric.get(scenario_id)))
+        for scenario_id in SCENARIOS
+    }
+
+
+def rescore(rubric, conditions, history):
+    """로그 한 판의 이벤트 기록을 채점표로 다시 채점한 최종 점수."""
+    score = rubric["start_score"]
+    values = dict(conditions)
+    for code in history:
+        kind, arg = decode_event(code)
+        if kind == EV_ANSWER:
+            score += rubric["answer_scores"][arg]
+            values[rubric["flags"][arg >> 2]] = True
+        elif kind == EV_SENIOR:
+            score += rubric["senior_score"]
+        elif kind == EV_DRUG:
+            table = rubric["outcomes"]
+            score += int(table["score"][outcome_table.outcome_index(table["features"], table["drug_codes"][DRUG_IDS[arg]], values)])
+    return score
+
+
+# --- 작업 단위 ---
+def _init_worker(rubric):
+    global _rubrics
+    _rubrics = compile_rubrics(rubric)
+
+
+def _new_summary():
+    return {"plays": 0, "mismatched": 0, "old": Counter(), "new": Counter(), "bands": Counter()}
+
+
+def _rescore_chunk(lines):
+    """로그 줄 묶음을 채점해 시나리오별 집계를 돌려줍니다. 잘린 줄과 모르는 시나리오는 건너뜁니다."""
+    summaries = {}
+    for line in lines:
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        rubrics = _rubrics.get(entry.get("scenario"))
+        if rubrics is None:
+            continue
+        current, candidate = rubrics
+        summary = summaries.get(entry["scenario"])
+        if summary is None:
+            summary = summaries[entry["scenario"]] = _new_summary()
+        conditions = {key: entry["conditions"][key] for key in CONDITION_KEYS}
+        old, new = entry["score"], rescore(candidate, conditions, entry["history"])
+        summary["plays"] += 1
+        summary["mismatched"] += rescore(current, conditions, entry["history"]) != old  # 지금 규칙과 다른 예전 규칙의 판
+        summary["old"][old] += 1
+        summary["new"][new] += 1
+        summary["bands"][engine.grade_band(old), engine.grade_band(new)] += 1
+    return summaries
+
+
+def _merge(total, summaries):
+    for scenario_id, summary in summaries.items():
+        merged = total.setdefault(scenario_id, _new_summary())
+        merged["plays"] += summary["plays"]
+        merged["mismatched"] += summary["mismatched"]
+        for key in ("old", "new", "bands"):
+            merged[key].update(summary[key])
+
+
+# --- 로그 흘려 읽기 ---
+def iter_lines(paths):
+    for path in paths:
+        with open(path, "rb") as f:
+            yield from f
+
+
+def iter_chunks(lines, size=CHUNK_SIZE):
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run(paths, rubric, workers=os.cpu_count(), chunk_size=CHUNK_SIZE):
+    """로그 파일들을 후보 루브릭으로 다시 채점해 시나리오별 집계를 돌려줍니다."""
+    chunks = iter_chunks(iter_lines(paths), chunk_size)
+    total = {}
+    if workers == 1:
+        _init_worker(rubric)
+        for chunk in chunks:
+            _merge(total, _rescore_chunk(chunk))
+        return total
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(rubric,)) as executor:
+        pending = set()
+        for chunk in chunks:
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    _merge(total, future.result())
+            pending.add(executor.submit(_rescore_chunk, chunk))
+        for future in pending:
+            _merge(total, future.result())
+    return total
+
+
+# --- 보고 ---
+def _mean(scores):
+    plays = sum(scores.values())
+    return sum(score * count for score, count in scores.items()) / plays if plays else 0.0
+
+
+def _binned(scores):
+    bins = Counter()
+    for score, count in scores.items():
+        bins[score // SCORE_BIN * SCORE_BIN] += count
+    return bins
+
+
+def print_report(total):
+    for scenario_id, summary in total.items():
+        plays = summary["plays"]
+        print(f"[{scenario_id}] {plays}판, 평균 {_mean(summary['old']):.1f} -> {_mean(summary['new']):.1f}")
+        if summary["mismatched"]:
+            print(f"  (지금 규칙으로 다시 채점해도 기록된 점수와 다른 판 {summary['mismatched']}개: 예전 규칙으로 한 상담)")
+        print("  점수 구간        지금    후보")
+        old_bins, new_bins = _binned(summary["old"]), _binned(summary["new"])
+        for low in sorted(set(old_bins) | set(new_bins)):
+            print(f"  {low:>5}~{low + SCORE_BIN - 1:<5} {old_bins[low]:>8} {new_bins[low]:>7}")
+        print("  평가 등급 이동 (지금 -> 후보)")
+        for old_band, old_label in enumerate(BAND_LABELS):
+            row = "  ".join(f"{new_label} {summary['bands'][old_band, new_band]:>6}" for new_band, new_label in enumerate(BAND_LABELS))
+            print(f"    {old_label:<4} -> {row}")
+        moved = sum(count for (old_band, new_band), count in summary["bands"].items() if old_band != new_band)
+        print(f"  등급이 바뀌는 판: {moved} ({moved / plays:.1%})")
+
+
+def to_json(total):
+    return {
+        scenario_id: {
+            "plays": summary["plays"],
+            "mismatched": summary["mismatched"],
+            "old_scores": {str(score): count for score, count in sorted(summary["old"].items())},
+            "new_scores": {str(score): count for score, count in sorted(summary["new"].items())},
+            "band_shifts": {f"{BAND_LABELS[old]}->{BAND_LABELS[new]}": count for (old, new), count in sorted(summary["bands"].items())},
+        }
+        for scenario_id, summary in total.items()
+    }
+
+
+def print_rules(scenario_id):
+    for rule_id, rule in enumerate(get_scenario(scenario_id)["outcome_rules"]):
+        print(f"{rule_id:>3} {rule['score']:>5}  {rule['when']}  {messages.text(rule['message'])[:40]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="지난 상담 로그를 새 점수 규칙으로 다시 채점")
+    parser.add_argument("--rubric", help="후보 루브릭 JSON 파일 (없으면 지금 규칙으로만 채점)")
+    parser.add_argument("--log", nargs="+", help="JSONL 로그 파일 (기본: logs/plays-*.jsonl)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--json", help="집계 결과를 JSON으로 저장할 경로")
+    parser.add_argument("--show-rules", action="store_true", help="결과 규칙 번호와 점수를 출력하고 끝냄")
+    parser.add_argument("--scenario", default="warfarin_implant", choices=list(SCENARIOS), help="--show-rules로 볼 시나리오")
+    args = parser.parse_args()
+
+    if args.show_rules:
+        print_rules(args.scenario)
+        return
+    rubric = {}
+    if args.rubric:
+        with open(args.rubric, encoding="utf-8") as f:
+            rubric = json.load(f)
+    paths = args.log or sorted(glob.glob(os.path.join(LOG_DIR, "plays-*.jsonl")))
+    if not paths:
+        print("다시 채점할 로그가 없습니다.")
+        return
+    started = time.perf_counter()
+    total = run(paths, rubric, args.workers)
+    elapsed = time.perf_counter() - started
+    print_report(total)
+    plays = sum(summary["plays"] for summary in total.values())
+    print(f"{plays}판 다시 채점: {elapsed:.2f}초 ({plays / elapsed:,.0f}판/초, 프로세스 {args.workers}개)")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(to_json(total), f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
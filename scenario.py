@@ -0,0 +1,449 @@
+"""약물 상담 시나리오 정의 및 컴파일.
+
+각 시나리오(환자 케이스)는 질문, 공개되는 정보, 점수 변동, 결과 규칙, 단계 전이를
+데이터로만 기술합니다. 각 시나리오는 get_scenario()로 처음 요청될 때 한 번만
+컴파일되어 조회용 사전으로 바뀌므로, Streamlit이 스크립트를 다시 실행해도 이 작업은
+반복되지 않고, 쓰지 않는 시나리오는 컴파일하지 않습니다.
+"""
+
+import threading
+
+from messages import to_ids
+from outcome_table import build_outcome_table
+
+# --- 공통 질문 정의 ---
+# condition: 답변을 결정하는 환자의 숨겨진 상태 (None이면 항상 "yes" 답변)
+# yes / no: 숨겨진 상태에 따른 답변, 점수 변동, 공개 정보, 피드백 메시지
+# again: 추가 질문 단계에서 물었을 때 덮어쓸 답변/피드백
+WARFARIN_ANSWER = "네, 의사 선생님이 처방해주셔서 '피를 묽게 하는 약(와파린)'을 매일 먹고 있어요. 심장이 좀 안 좋거든요."
+WARFARIN_WARNING = ("warning", "🚨 주요 정보 확인: 환자는 '피를 묽게 하는 약(와파린)' 복용 중!")
+IMPLANT_WARNING = ("warning", "🦷 주요 정보 확인: 환자 다음 주 임플란트 시술 예정!")
+
+QUESTIONS = {
+    "symptom_details": {
+        "text": "언제부터, 어떻게 아프기 시작했어요? (증상 구체화)",
+        "flag": "symptom_details_asked",
+        "condition": None,
+        "hint": "💡 **힌트 (지난 상담 복기):** 증상이 언제부터, 어떻게 시작되었는지 구체적으로 물어보면 환자의 상태를 더 정확히 파악할 수 있습니다.",
+        "yes": {
+            "score": 5,
+            "reveal": ("headache_details", "어제 저녁부터 지끈거리며 아픔"),
+            "answer": "어제 저녁부터 지끈거리면서 아프기 시작했어요.",
+            "notes": [],
+            "again": {"notes": [("info", "증상에 대한 상세 정보를 확인했습니다.")]},
+        },
+    },
+    "current_meds": {
+        "text": "혹시 지금 매일 드시고 있는 다른 약이 있으세요? (복용 약물 확인)",
+        "flag": "current_meds_asked",
+        "condition": "is_warfarin_user",
+        "hint": "💡 **힌트 (지난 상담 복기):** 환자가 현재 복용 중인 다른 약이 있는지 확인하는 것은 매우 중요합니다! 잊지 말고 질문하세요.",
+        "yes": {
+            "score": 30,
+            "reveal": ("warfarin_user_revealed", True),
+            "answer": WARFARIN_ANSWER,
+            "notes": [("success", "매우 중요한 질문입니다! 환자가 '피를 묽게 하는 약(와파린)'을 복용 중임을 확인했습니다."), WARFARIN_WARNING],
+            "again": {
+                "answer": "네, 아까도 말씀드렸지만 '피를 묽게 하는 약(와파린)'을 매일 먹고 있어요. 심장이 좀 안 좋거든요.",
+                "notes": [("success", "복용 약물 정보를 다시 확인했습니다."), WARFARIN_WARNING],
+            },
+        },
+        "no": {
+            "score": 0,
+            "answer": "아니요, 특별히 매일 먹는 약은 없어요.",
+            "notes": [("info", "환자는 현재 매일 복용 중인 약이 없다고 답변했습니다.")],
+        },
+    },
+    "history_headache": {
+        "text": "평소에도 머리가 자주 아프신 편인가요? (과거력 확인)",
+        "flag": "history_headache_asked",
+        "condition": None,
+        "hint": "💡 **힌트 (지난 상담 복기):** 평소에도 자주 아픈지(과거력) 확인하면 이번 두통이 평소와 다른지 판단하는 데 도움이 됩니다.",
+        "yes": {
+            "score": 5,
+            "reveal": ("headache_history_response", "가끔 스트레스 받으면 아픔"),
+            "answer": "네, 가끔씩 스트레스 받으면 머리가 아파요.",
+            "notes": [],
+            "again": {"notes": [("info", "두통 과거력 정보를 확인했습니다.")]},
+        },
+    },
+    "medical_history_check": {
+        "text": "혹시 다른 질병을 앓고 계시거나, 최근 또는 예정된 치과 치료/수술이 있으신가요? (병력 및 치료 계획 확인)",
+        "flag": "medical_history_asked",
+        "condition": "has_implant_soon",
+        "hint": "💡 **힌트 (지난 상담 복기):** 환자의 다른 질병 유무나 예정된 치료/수술 계획을 확인하는 것도 안전한 상담에 큰 도움이 됩니다.",
+        "yes": {
+            "score": 20,
+            "reveal": ("dental_implant_revealed", True),
+            "answer": "네, 사실 다음 주에 임플란트 시술이 예정되어 있어요.",
+            "notes": [("success", "중요한 질문입니다! 환자의 예정된 치료 계획을 확인했습니다."), IMPLANT_WARNING],
+            "again": {
+                "answer": "네, 다음 주에 임플란트 시술이 예정되어 있다고 말씀드렸어요.",
+                "notes": [("success", "병력 및 치료 계획 정보를 다시 확인했습니다."), IMPLANT_WARNING],
+            },
+        },
+        "no": {
+            "score": 0,
+            "answer": "아니요, 특별한 질병이나 예정된 치료는 없어요.",
+            "notes": [("info", "환자는 특별한 병력이나 치료 계획이 없다고 답변했습니다.")],
+        },
+    },
+}
+
+PAINKILLERS = {
+    "nsaids": "일반 소염진통제 (성분: 이부프로펜, 나프록센 등)",
+    "acetaminophen": "아세트아미노펜 계열 진통제 (성분: 아세트아미노펜 - 예: 타이레놀)",
+}
+
+# 숨겨진 상태 -> 약물 상호작용 지식 베이스(data/interactions.csv)의 위험 요인
+# (결과 화면에는 그 상태를 질문으로 알아냈을 때만 상호작용 설명이 나옵니다.)
+CONDITION_RISK_FACTORS = {
+    "is_warfarin_user": "anticoagulant",
+    "has_implant_soon": "dental_surgery",
+}
+
+FOLLOW_UP_OPTIONS = {
+    "go_to_drug_recommendation": "이 정보로 바로 약물 추천하기",
+    "go_to_action_decision": "추가 정보 수집 및 다른 행동 고려하기",
+    "ask_senior_pharmacist_early": "전문가(선배 약사)에게 도움 요청하기",
+}
+
+ACTION_OPTIONS = {
+    "recommend_drug": "진통제 종류 선택해서 추천하기",
+    "ask_senior": "전문가(선배 약사)에게 도움 요청하기",
+}
+
+INTRO_TEXT = """
+        안녕하세요! 여러분은 오늘 약사의 중요한 업무 중 하나인 **'안전한 약물 상담'**을 체험하게 됩니다.
+        환자에게 올바른 약을 추천하기 위해서는 마치 탐정이 사건의 단서를 찾듯, 질문을 통해 필요한 정보를 정확히 파악해야 합니다.
+        """
+
+# 직접 입력한 질문을 알아듣지 못했을 때의 환자 대사
+UNCLEAR_QUESTION_ANSWER = "네? 무슨 말씀이신지 잘 모르겠어요. 다시 한 번 말씀해 주시겠어요?"
+
+SUMMARY_FOOTER = "오늘 체험이 약물 상담의 중요성을 이해하고, 머신러닝이 우리 생활 속 문제를 어떻게 해결할 수 있는지에 대한 작은 실마리가 되었기를 바랍니다!"
+
+# 결과 화면(ui)과 보고서(report)의 안내 문구. 메시지 카탈로그에 들어가며
+# messages.ui_text(이름, 언어, **값)이 번역한 뒤 {이름} 자리를 채웁니다.
+UI_TEXTS = {
+    "patient": "환자:",
+    "senior": "선배 약사:",
+    "senior_prefix": "선배 약사: (환자 정보를 듣고) ",  # 여정의 [선배 약사] 줄에서는 떼고 보여줌
+    "pharmacy_caption": "약국 상담 데스크",
+    "emergency_caption": "응급 상황",
+    "extra_advice": "💡 추가 조언: 환자에게 주치의 또는 치과의사와의 상담을 권유하는 것이 좋습니다.",
+    "interaction": "💊 상호작용 정보 ({drug} × {risk}, {severity}): {explanation}",
+    "unclear_question": "약 복용, 증상, 병력처럼 지금 상담에 필요한 내용을 물어보세요.",
+    "case_caption": "반 {class_code} · 환자 케이스 #{number}",
+    "last_answer": "방금 환자 답변: \"{answer}\"",
+    "result_header": "상담 결과",
+    "final_score": "나의 최종 안전 상담 점수:",
+    "journey_header": "오늘의 상담 여정 돌아보기",
+    "journey_question": "[질문]",
+    "journey_patient": "[환자]",
+    "journey_action": "[나의 행동]",
+    "journey_drug": "[약물 추천]",
+    "journey_result": "[결과]",
+    "journey_senior": "[선배 약사]",
+    "score_change": "(점수 변동: {change})",
+    "optimal_header": "최적 전략과 비교하기",
+    "optimal_value": "최적 전략의 기대 점수",
+    "your_value": "내 선택의 기대 점수",
+    "optimal_caption": "기대 점수는 숨겨진 상태를 모르는 채로 이 시나리오에 올 수 있는 환자들을 상담했을 때의 평균 점수입니다.",
+    "all_optimal": "모든 결정이 최적 전략과 같았습니다!",
+    "mistake": "'{chosen}' 대신 **'{best}'**을(를) 골랐다면 기대 점수 +{loss:.1f}점",
+    "optimal_path": "이 환자에게 최적 전략을 따랐다면 (점수 {score})",
+    "report_download": "📄 나의 상담 기록 내려받기 (HTML, 인쇄해서 PDF로 저장 가능)",
+    "report_waiting": "📄 상담 기록 보고서를 만드는 중입니다...",
+    "tree_header": "🌳 우리 반 상담 기록으로 학습한 의사결정나무",
+    "tree_caption": "지금까지 끝난 상담들의 (숨겨진 상태, 한 질문, 추천한 약) → 결과를 학습한 나무입니다. 위쪽 갈림길일수록 결과를 크게 가른 정보입니다.",
+    "tree_waiting": "상담 기록이 {plays}판 이상 쌓이면 우리 반이 학습한 의사결정나무가 여기에 표시됩니다.",
+    "resume_linked": "🔗 지금 주소가 내 이어하기 링크입니다. 즐겨찾기해 두세요. (다른 사람과 나누지 마세요)",
+    "resume_button": "🔗 내 이어하기 링크 만들기",
+    "report_title": "상담 기록 - {title}",
+    "report_heading": "💊 약물 상담 시뮬레이션: 나의 상담 기록",
+    "report_class": "반 {class_code}",
+    "report_play": "{play}번째 도전",
+    "report_print": "PDF로 보관하려면 브라우저의 인쇄 메뉴에서 'PDF로 저장'을 고르세요.",
+    "index_title": "상담 기록 목록",
+    "index_heading": "상담 기록 목록 ({plays}판)",
+    "index_session": "세션",
+    "index_play": "도전",
+    "index_score": "점수",
+    "index_report": "보고서",
+}
+
+# --- 시나리오 1: 와파린 복용 환자 (기존 app.py) ---
+WARFARIN_SCENARIO = {
+    "title": "와파린 복용 환자",
+    "intro": INTRO_TEXT + """
+        **시나리오:** 두통을 호소하는 환자가 약국을 방문했습니다.
+        """,
+    "patient_greeting": "안녕하세요, 약사님. 머리가 너무 아파서 왔어요. 효과 빠른 진통제 하나 주세요.",
+    "conditions": {"is_warfarin_user": True, "has_implant_soon": False},
+    # 반별 케이스 풀(cases.py)에서 각 숨겨진 상태가 참일 확률
+    "case_rates": {"is_warfarin_user": 0.7, "has_implant_soon": 0.0},
+    "first_questions": ["symptom_details", "current_meds", "history_headache"],
+    "action_questions": ["current_meds"],
+    "question_overrides": {
+        "current_meds": {
+            "action_label": "추가 질문하기 (다른 약 복용 여부)",
+            "again": {
+                "answer": WARFARIN_ANSWER,
+                "notes": [("success", "중요한 추가 질문입니다! 환자가 '피를 묽게 하는 약(와파린)'을 복용 중임을 확인했습니다."), WARFARIN_WARNING],
+            },
+        },
+    },
+    "transitions": {
+        "start": {"begin": "patient_presentation"},
+        "patient_presentation": {"ask": "action_decision"},
+        "action_decision": {"recommend_drug": "drug_recommendation", "ask_senior": "simulation_result", "ask": "action_decision"},
+        "drug_recommendation": {"recommend": "simulation_result"},
+        "simulation_result": {"summary": "final_summary"},
+    },
+    "senior": {
+        "action": {
+            "prefix": "선배 약사: (환자 정보를 듣고) 아, 이 환자분은 와파린을 드시고 계실 가능성이 있겠네요. 꼭 확인하고 NSAIDs 계열 진통제는 피해야 합니다. 아세트아미노펜 성분이 더 안전하겠어요.",
+            "mode": "first",
+            "parts": [],
+            "suffix": "",
+            "history": "선배 약사 도움으로 와파린 복용 사실 인지 및 안전한 약 추천.",
+            "notes": [("success", "현명한 판단입니다!")],
+        },
+    },
+    # 위에서부터 처음으로 조건이 맞는 규칙이 적용됩니다. 로그의 결과 번호가 바뀌지 않도록
+    # 새 규칙은 맨 뒤에만 추가합니다. (반별 케이스 풀에서는 와파린을 먹지 않는 환자도 옴)
+    "outcome_rules": [
+        {"when": {"drug": "nsaids", "is_warfarin_user": True}, "score": -100,
+         "message": "🚨 치명적인 실수! 환자는 '피를 묽게 하는 약(와파린)'을 복용 중이었습니다. 이 약과 소염진통제가 만나 심각한 위장출혈을 일으켜 응급실로 긴급 후송되었습니다!",
+         "effects": ["emergency_image"]},
+        {"when": {"drug": "acetaminophen", "is_warfarin_user": True, "current_meds_asked": True}, "score": 50,
+         "message": "🎉 훌륭한 선택입니다! '피를 묽게 하는 약'을 복용 중인 환자에게 비교적 안전한 아세트아미노펜 계열 진통제를 추천하여 환자가 안전하게 회복했습니다.",
+         "effects": ["balloons"]},
+        {"when": {"drug": "nsaids", "current_meds_asked": False}, "score": -20,
+         "message": "⚠️ 아슬아슬한 선택! 다행히 이 환자는 와파린을 복용하고 있지 않았지만, 만약 복용 중이었다면 매우 위험했을 것입니다. 환자의 다른 약물 복용 여부를 확인하는 것을 놓쳤습니다."},
+        {"when": {"drug": "acetaminophen"}, "score": 10,
+         "message": "안전한 선택입니다. 환자는 증상이 호전되었습니다."},
+        {"when": {"drug": "nsaids"}, "score": 10,
+         "message": "적절한 선택입니다. 매일 복용하는 약이 없음을 확인했으므로 소염진통제를 써도 괜찮습니다. 환자는 증상이 호전되었습니다."},
+    ],
+    "hints": [],
+    "summary_markdown": """
+        의사결정나무는 스무고개처럼, 중요한 질문(정보)을 통해 데이터를 분류하고 예측합니다.
+        - **첫 번째 질문 '지금 매일 드시는 다른 약이 있으세요?'** 는 이 나무의 중요한 **첫 번째 갈림길(분기점)**이었습니다.
+        - 이 질문에 대한 답변('예' 또는 '아니오', 그리고 와파린 복용 여부)에 따라 다음 선택지와 결과가 크게 달라졌습니다.
+        - 만약 이 질문을 하지 않았거나, 얻은 정보를 잘못 해석했다면 위험한 결과로 이어질 수 있었습니다.
+
+        **머신러닝 모델은 수많은 과거 데이터를 학습하여, 어떤 질문을 어떤 순서로 하는 것이 가장 정확한 예측(또는 안전한 결정)을 하는지 스스로 규칙을 찾아냅니다.**
+        마치 여러분이 이 시뮬레이션을 여러 번 반복하면서 더 나은 상담 전략을 터득하는 것과 같습니다.
+
+        이처럼 데이터를 기반으로 최적의 판단 규칙을 찾아내는 것이 머신러닝의 핵심 원리 중 하나입니다.
+        """,
+}
+
+# --- 시나리오 2: 와파린 복용 + 임플란트 예정 환자 (기존 app2.py) ---
+BASE_ACETAMINOPHEN = "안전한 선택입니다. 환자는 증상이 호전될 수 있습니다."
+
+WARFARIN_IMPLANT_SCENARIO = {
+    "title": "와파린 복용 + 임플란트 예정 환자",
+    "intro": INTRO_TEXT + """
+        **시나리오:** 두통을 호소하는 환자가 약국을 방문했습니다. (환자는 여러분이 모르는 숨겨진 건강 상태를 가지고 있을 수 있습니다!)
+        """,
+    "patient_greeting": "안녕하세요, 약사님. 머리가 너무 아파서 왔어요. 효과 빠른 진통제 하나 주세요.",
+    # 교육 효과를 위해 항상 위험 요인이 있도록 설정합니다.
+    "conditions": {"is_warfarin_user": True, "has_implant_soon": True},
+    "case_rates": {"is_warfarin_user": 0.7, "has_implant_soon": 0.6},
+    "first_questions": ["symptom_details", "current_meds", "history_headache", "medical_history_check"],
+    "action_questions": ["symptom_details", "current_meds", "history_headache", "medical_history_check"],
+    "question_overrides": {},
+    "transitions": {
+        "start": {"begin": "patient_presentation"},
+        "patient_presentation": {"ask": "first_question_follow_up"},
+        "first_question_follow_up": {
+            "go_to_drug_recommendation": "drug_recommendation",
+            "go_to_action_decision": "action_decision",
+            "ask_senior_pharmacist_early": "simulation_result",
+        },
+        "action_decision": {"recommend_drug": "drug_recommendation", "ask_senior": "simulation_result", "ask": "action_decision"},
+        "drug_recommendation": {"recommend": "simulation_result"},
+        "simulation_result": {"summary": "final_summary"},
+    },
+    "senior": {
+        "early": {
+            "prefix": "선배 약사: (환자 정보를 듣고) 아직 정보가 부족하지만, ",
+            "mode": "all",
+            "parts": [
+                (["warfarin_user_revealed"], "와파린 복용 중이시라면 NSAIDs는 피해야 합니다. "),
+                (["dental_implant_revealed"], "임플란트 예정이시면 더욱 조심해야 하고요. "),
+            ],
+            "suffix": "두통 원인이나 다른 약물, 병력 등을 더 자세히 확인하는 것이 안전합니다.",
+            "notes": [("success", "현명한 판단입니다! 하지만 아직 정보가 부족할 수 있습니다.")],
+        },
+        "action": {
+            "prefix": "선배 약사: (환자 정보를 듣고) ",
+            "mode": "first",
+            "parts": [
+                (["warfarin_user_revealed", "dental_implant_revealed"], "와파린 복용 중이고 임플란트 예정이시군요! NSAIDs는 절대 안 됩니다. 아세트아미노펜이 안전하고, 반드시 주치의/치과의사와 와파린 조절 상담을 안내해야 합니다."),
+                (["warfarin_user_revealed"], "와파린 복용 중이시니 NSAIDs는 피하고 아세트아미노펜을 고려하세요."),
+                ([], "환자의 모든 정보를 종합적으로 고려하는 것이 중요합니다."),
+            ],
+            "suffix": "",
+            "notes": [("success", "현명한 판단입니다!")],
+        },
+    },
+    # 위에서부터 처음으로 조건이 맞는 규칙이 적용됩니다.
+    "outcome_rules": [
+        # NSAIDs 추천
+        {"when": {"drug": "nsaids", "is_warfarin_user": True, "current_meds_asked": False}, "score": -110,
+         "message": "🚨🚨🚨 치명적 상황! 환자가 알 수 없는 이유로 심각한 위장출혈을 일으켰습니다. 혹시 확인하지 않은 환자의 정보가 있었을까요?",
+         "effects": ["emergency_image"]},
+        {"when": {"drug": "nsaids", "is_warfarin_user": True, "has_implant_soon": True, "medical_history_asked": False}, "score": -130,
+         "message": "🚨🚨🚨 최악의 상황! 와파린 복용 사실을 알면서도 NSAIDs를 선택했고, 확인하지 않은 다른 문제(임플란트)까지 겹쳐 환자가 매우 위독해졌습니다.",
+         "effects": ["emergency_image"]},
+        {"when": {"drug": "nsaids", "is_warfarin_user": True, "has_implant_soon": True}, "score": -120,
+         "message": "🚨🚨🚨 매우 치명적인 실수! 와파린 복용 및 임플란트 시술 예정임을 알면서도 NSAIDs를 추천하여 심각한 출혈 위험을 초래했습니다!",
+         "effects": ["emergency_image"]},
+        {"when": {"drug": "nsaids", "is_warfarin_user": True}, "score": -100,
+         "message": "🚨🚨 치명적인 실수! 와파린 복용 사실을 알면서도 NSAIDs를 추천하여 위장출혈 위험을 크게 높였습니다!",
+         "effects": ["emergency_image"]},
+        {"when": {"drug": "nsaids", "has_implant_soon": True, "medical_history_asked": False}, "score": -50,
+         "message": "⚠️ 위험! 환자가 시술 후 예상치 못한 출혈 문제로 고생했습니다. 예정된 시술이 있는지 확인했어야 합니다."},
+        {"when": {"drug": "nsaids", "has_implant_soon": True}, "score": -40,
+         "message": "⚠️ 주의! 임플란트 시술 예정임을 알면서도 NSAIDs를 추천했습니다. 출혈 경향을 높일 수 있습니다."},
+        {"when": {"drug": "nsaids", "current_meds_asked": False, "medical_history_asked": False}, "score": -10,
+         "message": "다행히 환자에게 특이사항은 없었지만, 다른 약물 복용 여부와 병력/치료 계획을 모두 확인하는 것이 안전합니다."},
+        {"when": {"drug": "nsaids", "current_meds_asked": False}, "score": -5,
+         "message": "다행히 환자에게 특이사항은 없었지만, 다른 약물 복용 여부를 확인하는 것이 안전합니다."},
+        {"when": {"drug": "nsaids", "medical_history_asked": False}, "score": -5,
+         "message": "다행히 환자에게 특이사항은 없었지만, 병력/치료 계획을 확인하는 것이 안전합니다."},
+        {"when": {"drug": "nsaids"}, "score": 10,
+         "message": "적절한 선택으로 보입니다. 환자는 증상 완화에 도움을 받을 수 있습니다."},
+        # 아세트아미노펜 추천
+        {"when": {"drug": "acetaminophen", "is_warfarin_user": True, "current_meds_asked": False}, "score": 5,
+         "message": BASE_ACETAMINOPHEN + " (하지만, 환자가 실제 와파린 복용 중이라는 사실을 확인하지 못한 점은 매우 아쉽습니다. 우연히 안전한 약을 골랐습니다.)"},
+        {"when": {"drug": "acetaminophen", "is_warfarin_user": True, "has_implant_soon": True, "medical_history_asked": True}, "score": 25,
+         "message": "🎉 최선의 선택! 와파린 복용 및 임플란트 예정 환자에게 아세트아미노펜을 추천하고, 필요한 추가 상담 안내까지 고려하면 완벽합니다.",
+         "effects": ["balloons"]},
+        {"when": {"drug": "acetaminophen", "is_warfarin_user": True, "has_implant_soon": True}, "score": 15,
+         "message": BASE_ACETAMINOPHEN + " (환자의 임플란트 계획을 확인하지 않은 점은 아쉽습니다.)"},
+        {"when": {"drug": "acetaminophen", "is_warfarin_user": True}, "score": 10,
+         "message": BASE_ACETAMINOPHEN},
+        {"when": {"drug": "acetaminophen", "has_implant_soon": True, "medical_history_asked": False}, "score": 7,
+         "message": BASE_ACETAMINOPHEN + " (하지만, 환자의 임플란트 계획을 확인하지 못한 점은 아쉽습니다.)"},
+        {"when": {"drug": "acetaminophen", "has_implant_soon": True}, "score": 15,
+         "message": "안전한 약물 선택입니다. 임플란트 시술 관련해서는 치과의사와 상담하도록 안내하면 좋습니다.",
+         "effects": ["extra_advice"]},
+        {"when": {"drug": "acetaminophen"}, "score": 10,
+         "message": BASE_ACETAMINOPHEN},
+    ],
+    # 실제 위험이 있었는데 해당 질문을 안 해서 나쁜 결과가 나온 경우 (다음 판의 힌트 선택에서 가중치를 높임)
+    "hints": [
+        {"state_key": "missed_critical_med_question_last_time", "condition": "is_warfarin_user", "flag": "current_meds_asked"},
+        {"state_key": "missed_critical_history_question_last_time", "condition": "has_implant_soon", "flag": "medical_history_asked"},
+    ],
+    "summary_markdown": """
+        의사결정나무는 스무고개처럼, 중요한 질문(정보)을 통해 데이터를 분류하고 예측합니다.
+        - **상담 중 했던 질문들 ('다른 약 복용 여부', '다른 질병/치료 계획 여부' 등)** 은 이 나무의 중요한 **갈림길(분기점)**이었습니다. 이 질문에 대한 답변, 또는 질문을 했는지 여부 자체가 중요한 판단 기준이 되었습니다.
+        - 환자의 실제 숨겨진 상태(예: 와파린 복용, 임플란트 예정)를 파악하기 위한 적절한 질문을 하지 않으면, 마치 의사결정나무가 중요한 특징(feature)을 사용하지 못해 잘못된 예측을 하는 것과 같습니다.
+        - 최적의 약물 선택은 환자의 모든 관련 정보를 고려해야 하며, 누락된 정보는 예기치 않은 위험으로 이어질 수 있습니다.
+
+        **머신러닝 모델은 수많은 과거 데이터를 학습하여, 어떤 질문을 어떤 순서로 하는 것이 가장 정확한 예측(또는 안전한 결정)을 하는지 스스로 규칙을 찾아냅니다.**
+        마치 여러분이 이 시뮬레이션을 여러 번 반복하면서 (그리고 때로는 힌트를 얻으면서) 더 나은 상담 전략을 터득하는 것과 같습니다.
+        첫 시도에서 중요한 정보를 놓쳤더라도 ('환자가 알 수 없는 이유로 위독해짐'), 다음 시도에서는 그 경험을 바탕으로 더 나은 질문을 할 수 있게 되는 것처럼, 머신러닝도 반복적인 학습과 피드백을 통해 성능을 개선합니다.
+
+        이처럼 데이터를 기반으로 최적의 판단 규칙을 찾아내는 것이 머신러닝의 핵심 원리 중 하나입니다.
+        """,
+}
+
+# 결과 판단에 쓰이는 특징 순서 (숨겨진 상태 2개 + 질문 여부 2개)
+OUTCOME_FEATURES = ("is_warfarin_user", "has_implant_soon", "current_meds_asked", "medical_history_asked")
+
+
+def _merge_question(base, override):
+    """공통 질문 정의에 시나리오별 덮어쓰기를 적용합니다."""
+    question = dict(base)
+    if "action_label" in override:
+        question["action_label"] = override["action_label"]
+    if "again" in override:
+        question["yes"] = dict(base["yes"], again=override["again"])
+    return question
+
+
+def _branch_ids(branch):
+    """답변 분기의 답변/피드백 문장을 메시지 id로 바꿉니다."""
+    branch = dict(branch, answer=to_ids(branch["answer"]), notes=to_ids(branch["notes"]))
+    if "again" in branch:
+        branch["again"] = {key: to_ids(value) for key, value in branch["again"].items()}
+    return branch
+
+
+def _question_ids(question):
+    question = dict(question, hint=to_ids(question["hint"]))
+    for branch_name in ("yes", "no"):
+        if branch_name in question:
+            question[branch_name] = _branch_ids(question[branch_name])
+    return question
+
+
+def _senior_ids(senior):
+    senior = dict(
+        senior,
+        prefix=to_ids(senior["prefix"]),
+        suffix=to_ids(senior["suffix"]),
+        parts=[(required, to_ids(text)) for required, text in senior["parts"]],
+        notes=to_ids(senior["notes"]),
+    )
+    if "history" in senior:
+        senior["history"] = to_ids(senior["history"])
+    return senior
+
+
+def compile_scenario(scenario_id, spec):
+    """시나리오 정의를 단계별 조회가 O(1)인 형태로 컴파일합니다.
+
+    환자 대사, 피드백, 결과 메시지는 messages의 메시지 id로 바꾸어 두고, 화면에 그릴 때
+    언어별 카탈로그에서 꺼냅니다. (질문/선택지 문구는 위젯 값이라 문자열 그대로)
+    """
+    questions = {
+        question_id: _question_ids(_merge_question(QUESTIONS[question_id], spec["question_overrides"].get(question_id, {})))
+        for question_id in set(spec["first_questions"]) | set(spec["action_questions"])
+    }
+    outcome_rules = [dict(rule, message=to_ids(rule["message"])) for rule in spec["outcome_rules"]]
+    return dict(
+        spec,
+        id=scenario_id,
+        patient_greeting=to_ids(spec["patient_greeting"]),
+        questions=questions,
+        senior={timing: _senior_ids(senior) for timing, senior in spec["senior"].items()},
+        outcome_rules=outcome_rules,
+        first_options={questions[q]["text"]: q for q in spec["first_questions"]},
+        action_labels={
+            q: questions[q].get("action_label", f"[추가 질문] {questions[q]['text']}") for q in spec["action_questions"]
+        },
+        painkiller_options={text: drug for drug, text in PAINKILLERS.items()},
+        outcomes=build_outcome_table(outcome_rules, OUTCOME_FEATURES, tuple(PAINKILLERS)),
+    )
+
+
+# --- 시나리오 목록 (처음 요청될 때 프로세스당 한 번 컴파일) ---
+# 새 환자 케이스는 여기에 등록하면 app.py의 시나리오 선택지와 ?scenario= 주소에 나타납니다.
+# 등록 순서로 체크포인트의 시나리오 번호가 정해지므로 새 시나리오는 맨 뒤에 추가합니다.
+SCENARIOS = {
+    "warfarin": WARFARIN_SCENARIO,
+    "warfarin_implant": WARFARIN_IMPLANT_SCENARIO,
+}
+DEFAULT_SCENARIO = "warfarin"
+
+_compiled = {}
+_compile_lock = threading.Lock()
+
+
+def get_scenario(scenario_id):
+    """등록된 시나리오를 컴파일해 반환합니다. 한 번 컴파일한 결과는 모든 세션이 공유합니다."""
+    scenario = _compiled.get(scenario_id)
+    if scenario is None:
+        with _compile_lock:
+            scenario = _compiled.get(scenario_id)
+            if scenario is None:
+                scenario = _compiled[scenario_id] = compile_scenario(scenario_id, SCENARIOS[scenario_id])
+    return scenario
@@ -0,0 +1,163 @@
+"""학생 한 명의 상담 상태를 작게 담는 레코드.
+
+숨겨진 상태, 질문 여부, 알게 된 정보는 각각 정수 하나의 비트로 저장하고,
+상담 기록은 16비트 이벤트 코드 배열(최대 MAX_HISTORY개)로 저장합니다.
+이벤트 코드를 문장으로 바꾸는 일은 화면에 그릴 때만 engine.expand_history가 합니다.
+
+    python session_record.py   # 기존 dict 방식과 세션당 메모리 사용량 비교
+"""
+
+from array import array
+
+from scenario import ACTION_OPTIONS, FOLLOW_UP_OPTIONS, PAINKILLERS, QUESTIONS
+
+CONDITION_KEYS = ("is_warfarin_user", "has_implant_soon")
+QUESTION_IDS = tuple(QUESTIONS)
+FLAG_KEYS = tuple(question["flag"] for question in QUESTIONS.values())
+DISCOVERED_KEYS = tuple(question["yes"]["reveal"][0] for question in QUESTIONS.values())
+ACTION_IDS = tuple(FOLLOW_UP_OPTIONS) + tuple(ACTION_OPTIONS) + QUESTION_IDS
+DRUG_IDS = tuple(PAINKILLERS)
+
+MAX_HISTORY = 32
+
+# 이벤트 종류 (코드의 상위 4비트, 하위 12비트는 인자)
+EV_QUESTION = 0  # 인자: 질문 번호
+EV_ANSWER = 1    # 인자: 질문 번호 << 2 | "yes" 답변 여부 << 1 | 추가 질문 여부
+EV_ACTION = 2    # 인자: 행동 번호 (ACTION_IDS)
+EV_DRUG = 3      # 인자: 진통제 번호 (DRUG_IDS)
+EV_RESULT = 4    # 인자: 결과 메시지 번호 (결과표 message_id)
+EV_SENIOR = 5    # 인자: 조언 조각 일치 비트 << 1 | 시점 ("action"이면 1)
+
+
+def encode_event(kind, arg):
+    return kind << 12 | arg
+
+
+def decode_event(code):
+    return code >> 12, code & 0xFFF
+
+
+def _bit(keys, key):
+    return 1 << keys.index(key)
+
+
+class SessionRecord:
+    """한 판의 상담 상태 (단계, 비트 필드, 점수, 이벤트 기록)."""
+
+    __slots__ = ("step", "conditions", "asked", "discovered", "safety_score", "game_over", "history")
+
+    def __init__(self, conditions=None):
+        self.step = "start"
+        self.conditions = 0
+        self.asked = 0
+        self.discovered = 0
+        self.safety_score = 50
+        self.game_over = False
+        self.history = array("H")
+        for key, value in (conditions or {}).items():
+            self.set_condition(key, value)
+
+    # --- 비트 필드 ---
+    def condition(self, key):
+        return bool(self.conditions & _bit(CONDITION_KEYS, key))
+
+    def set_condition(self, key, value):
+        if value:
+            self.conditions |= _bit(CONDITION_KEYS, key)
+        else:
+            self.conditions &= ~_bit(CONDITION_KEYS, key)
+
+    def was_asked(self, flag):
+        return bool(self.asked & _bit(FLAG_KEYS, flag))
+
+    def mark_asked(self, flag):
+        self.asked |= _bit(FLAG_KEYS, flag)
+
+    def revealed(self, key):
+        return bool(self.discovered & _bit(DISCOVERED_KEYS, key))
+
+    def reveal(self, key):
+        self.discovered |= _bit(DISCOVERED_KEYS, key)
+
+    def feature_values(self):
+        """결과표 조회용 (숨겨진 상태 + 질문 여부) 사전."""
+        values = {key: self.condition(key) for key in CONDITION_KEYS}
+        values.update((flag, self.was_asked(flag)) for flag in FLAG_KEYS)
+        return values
+
+    # --- 이벤트 기록 ---
+    def add_event(self, kind, arg=0):
+        """이벤트를 기록합니다. MAX_HISTORY를 넘으면 가장 오래된 것부터 버립니다."""
+        if len(self.history) >= MAX_HISTORY:
+            del self.history[0]
+        self.history.append(encode_event(kind, arg))
+
+    def last_event(self):
+        return decode_event(self.history[-1]) if self.history else (None, None)
+
+    def copy(self):
+        clone = SessionRecord.__new__(SessionRecord)
+        for name in self.__slots__:
+            setattr(clone, name, getattr(self, name))
+        clone.history = array("H", self.history)
+        return clone
+
+
+# --- 메모리 사용량 측정 ---
+def deep_sizeof(obj, seen=None):
+    """객체가 참조하는 사전/리스트/문자열까지 포함한 대략적인 바이트 수."""
+    import sys
+
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(key, seen) + deep_sizeof(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, "__slots__"):
+        size += sum(deep_sizeof(getattr(obj, name), seen) for name in obj.__slots__)
+    return size
+
+
+def _measure():
+    """가장 긴 상담 경로 하나를 기존 dict 방식과 레코드 방식으로 비교합니다."""
+    import engine
+    import simulate
+    from scenario import get_scenario
+
+    scenario = get_scenario("warfarin_implant")
+    record = max(simulate.enumerate_paths(scenario), key=lambda final: len(final.history))
+    legacy = {
+        "step": record.step,
+        "true_patient_conditions": {key: record.condition(key) for key in CONDITION_KEYS},
+        "player_discovered_info": engine.discovered_info(record),
+        "questions_asked_flags": {flag: record.was_asked(flag) for flag in FLAG_KEYS},
+        "safety_score": record.safety_score,
+        "consultation_history": engine.expand_history(record, scenario),
+        "game_over": record.game_over,
+    }
+    # 문자열 상수는 여러 세션이 공유하므로, 세션마다 새로 생기는 객체만 셉니다.
+    shared = {id(text) for text in _scenario_strings(scenario)}
+    before = deep_sizeof(legacy, set(shared))
+    after = deep_sizeof(record, set(shared))
+    print(f"기록 이벤트 수: {len(record.history)}")
+    print(f"기존 dict 방식: {before:,} bytes/세션")
+    print(f"SessionRecord: {after:,} bytes/세션 ({after / before:.0%})")
+
+
+def _scenario_strings(value):
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _scenario_strings(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _scenario_strings(item)
+
+
+if __name__ == "__main__":
+    _measure()
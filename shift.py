@@ -0,0 +1,85 @@
+"""'바쁜 근무' 모드: 여러 환자가 줄을 선 약국 카운터.
+
+숨겨진 상태가 서로 다른 환자 여러 명을 SessionRecord 목록 하나로 들고, 학생은
+제한 시간 안에 환자를 오가며 상담합니다. 환자마다 상태는 기존 레코드 그대로(비트
+필드 + 이벤트 코드 배열)이고, 교대 근무 전체의 상태는 활성 환자 번호와 시작 시각뿐
+입니다. 환자를 바꾸는 일은 번호 하나를 바꾸는 O(1)이며, 화면은 활성 환자의 단계만
+그립니다. Streamlit에 의존하지 않습니다.
+"""
+
+import random
+import time
+
+import cases
+import engine
+
+SHIFT_PATIENTS = 3
+SHIFT_SECONDS = 300  # 근무 시간(초)
+
+
+class Shift:
+    """교대 근무 하나 (환자별 레코드, 활성 환자 번호, 시작 시각, 제한 시간)."""
+
+    __slots__ = ("records", "active", "started_at", "budget_s", "ended")
+
+    def __init__(self, records, budget_s=SHIFT_SECONDS, started_at=None):
+        self.records = records
+        self.active = 0
+        self.started_at = time.time() if started_at is None else started_at
+        self.budget_s = budget_s
+        self.ended = False
+
+    @property
+    def record(self):
+        """지금 상담 중인 환자의 레코드."""
+        return self.records[self.active]
+
+    def switch(self, index):
+        """다른 환자를 상담합니다. 그동안 다른 환자의 상담 상태는 그대로 기다립니다."""
+        self.active = index
+
+    def remaining(self, now=None):
+        """남은 근무 시간(초). 0보다 작아지지 않습니다."""
+        return max(0.0, self.budget_s - ((now or time.time()) - self.started_at))
+
+    def next_waiting(self):
+        """활성 환자 다음 순서부터 찾은, 아직 상담이 끝나지 않은 환자 번호. 없으면 None."""
+        count = len(self.records)
+        for offset in range(1, count + 1):
+            index = (self.active + offset) % count
+            if not self.records[index].game_over:
+                return index
+        return None
+
+    def end(self):
+        """학생이 근무를 마칩니다."""
+        self.ended = True
+
+    def is_over(self, now=None):
+        """근무를 마쳤거나 근무 시간이 지났으면 True (한 번 끝나면 계속 True)."""
+        if not self.ended and self.remaining(now) == 0:
+            self.ended = True
+        return self.ended
+
+    def served(self):
+        return sum(record.game_over for record in self.records)
+
+    def total_score(self):
+        """상담을 마친 환자들의 점수 합계."""
+        return sum(record.safety_score for record in self.records if record.game_over)
+
+
+def new_shift(scenario, conditions=None, patients=SHIFT_PATIENTS, budget_s=SHIFT_SECONDS, seed=None):
+    """환자들의 숨겨진 상태 목록(conditions)으로 근무를 시작합니다.
+
+    conditions가 없으면 시나리오의 숨겨진 상태 확률(case_rates)로 환자 patients명을 만듭니다.
+    """
+    if conditions is None:
+        seed = random.randrange(1 << 32) if seed is None else seed
+        conditions = [cases.mask_conditions(mask) for mask in cases.generate_masks(scenario["case_rates"], seed, patients)]
+    records = []
+    for patient_conditions in conditions:
+        record = engine.initialize_session(scenario, patient_conditions)
+        engine.transition(record, scenario, "begin")  # 줄을 선 환자는 시작 화면 없이 바로 상담
+        records.append(record)
+    return Shift(records, budget_s)
@@ -0,0 +1,196 @@
+"""Streamlit 없이 상담 경로를 대량으로 실행하는 시뮬레이터.
+
+점수 규칙을 바꾼 뒤 수업 전에 점수/결과 분포를 확인하는 용도입니다.
+
+    python simulate.py --scenario warfarin_implant --mode exhaustive
+    python simulate.py --mode random --plays 1000000 --workers 8 --seed 42
+
+exhaustive: 모든 질문 순서 × 진통제 선택 × 숨겨진 상태 조합을 빠짐없이 실행합니다.
+random: 각 단계에서 고를 수 있는 선택지 중 하나를 무작위로 골라 plays번 실행합니다.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import engine
+import messages
+import outcome_table
+from scenario import FOLLOW_UP_OPTIONS, PAINKILLERS, SCENARIOS, get_scenario
+from session_record import EV_RESULT
+
+SENIOR_OUTCOME = "선배 약사에게 도움 요청"
+
+
+# --- 상태 생성 ---
+def new_record(scenario, conditions=None):
+    """시나리오 시작 직후(환자 등장 단계)의 레코드를 만듭니다."""
+    record = engine.initialize_session(scenario, conditions)
+    engine.transition(record, scenario, "begin")
+    return record
+
+
+def condition_combinations(scenario):
+    """시나리오의 숨겨진 상태가 가질 수 있는 모든 조합입니다."""
+    keys = list(scenario["conditions"])
+    return [dict(zip(keys, values)) for values in itertools.product((False, True), repeat=len(keys))]
+
+
+# --- 한 단계에서 가능한 선택지 ---
+def step_choices(record, scenario):
+    """현재 단계에서 고를 수 있는 (engine 함수, 인자) 목록입니다."""
+    step = record.step
+    if step == "patient_presentation":
+        return [(engine.choose_first_question, q) for q in scenario["first_options"].values()]
+    if step == "first_question_follow_up":
+        return [(engine.choose_follow_up, action) for action in FOLLOW_UP_OPTIONS]
+    if step == "action_decision":
+        return [(engine.choose_action, action) for action in engine.available_actions(record, scenario)]
+    if step == "drug_recommendation":
+        return [(engine.recommend, drug) for drug in PAINKILLERS]
+    return []
+
+
+def outcome_label(record, scenario):
+    """끝난 상담의 결과 문구 (선배 약사 도움은 하나로 묶음)."""
+    kind, arg = record.last_event()
+    return messages.text(scenario["outcomes"]["messages"][arg]) if kind == EV_RESULT else SENIOR_OUTCOME
+
+
+# --- 경로 실행 ---
+def enumerate_paths(scenario, conditions=None):
+    """가능한 모든 상담 경로를 끝까지 실행한 상태를 하나씩 돌려줍니다."""
+    stack = [new_record(scenario, conditions)]
+    while stack:
+        record = stack.pop()
+        choices = step_choices(record, scenario)
+        if not choices:
+            yield record
+            continue
+        for func, arg in choices:
+            branch = record.copy()
+            func(branch, scenario, arg)
+            stack.append(branch)
+
+
+def play_random(scenario, rng, conditions=None):
+    """각 단계에서 무작위로 선택해 한 판을 끝까지 실행합니다."""
+    record = new_record(scenario, conditions)
+    choices = step_choices(record, scenario)
+    while choices:
+        func, arg = rng.choice(choices)
+        func(record, scenario, arg)
+        choices = step_choices(record, scenario)
+    return record
+
+
+def _run_random_chunk(args):
+    """프로세스 풀 작업 단위: 무작위 플레이 plays번의 점수/결과 집계."""
+    scenario_id, plays, seed, vary_conditions = args
+    scenario = get_scenario(scenario_id)
+    rng = random.Random(seed)
+    combinations = condition_combinations(scenario) if vary_conditions else [None]
+    scores, outcomes = Counter(), Counter()
+    for _ in range(plays):
+        record = play_random(scenario, rng, rng.choice(combinations))
+        scores[record.safety_score] += 1
+        outcomes[outcome_label(record, scenario)] += 1
+    return scores, outcomes
+
+
+def run_exhaustive(scenario_id, vary_conditions=True):
+    """모든 경로를 실행해 점수/결과 분포를 집계합니다."""
+    scenario = get_scenario(scenario_id)
+    combinations = condition_combinations(scenario) if vary_conditions else [None]
+    scores, outcomes = Counter(), Counter()
+    for conditions in combinations:
+        for record in enumerate_paths(scenario, conditions):
+            scores[record.safety_score] += 1
+            outcomes[outcome_label(record, scenario)] += 1
+    return scores, outcomes
+
+
+def run_random(scenario_id, plays, workers, seed, vary_conditions=True, chunk_size=50_000):
+    """무작위 플레이를 프로세스 풀에 나누어 실행하고 결과를 합칩니다."""
+    chunks = [
+        (scenario_id, min(chunk_size, plays - start), seed + index, vary_conditions)
+        for index, start in enumerate(range(0, plays, chunk_size))
+    ]
+    if workers == 1:
+        results = list(map(_run_random_chunk, chunks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_run_random_chunk, chunks))
+
+    scores, outcomes = Counter(), Counter()
+    for chunk_scores, chunk_outcomes in results:
+        scores.update(chunk_scores)
+        outcomes.update(chunk_outcomes)
+    return scores, outcomes
+
+
+def summarize(scores, outcomes, elapsed):
+    """집계 결과를 보고용 사전으로 정리합니다."""
+    total = sum(scores.values())
+    return {
+        "plays": total,
+        "seconds": round(elapsed, 3),
+        "plays_per_second": round(total / elapsed) if elapsed else None,
+        "mean_score": round(sum(score * count for score, count in scores.items()) / total, 2) if total else None,
+        "score_distribution": {str(score): scores[score] for score in sorted(scores)},
+        "outcome_distribution": dict(outcomes.most_common()),
+    }
+
+
+def print_report(report):
+    """집계 결과를 터미널에 표로 출력합니다."""
+    print(f"플레이 수: {report['plays']:,}  소요 시간: {report['seconds']}s  ({report['plays_per_second']:,}회/초)")
+    print(f"평균 점수: {report['mean_score']}")
+    print("\n[점수 분포]")
+    for score, count in report["score_distribution"].items():
+        print(f"{score:>6} : {count:>10,} ({count / report['plays']:6.1%})")
+    print("\n[결과 분포]")
+    for outcome, count in report["outcome_distribution"].items():
+        print(f"{count:>10,} ({count / report['plays']:6.1%})  {outcome[:70]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="약물 상담 시뮬레이션 경로를 일괄 실행합니다.")
+    parser.add_argument("--scenario", default="warfarin_implant", choices=sorted(SCENARIOS))
+    parser.add_argument("--mode", default="exhaustive", choices=["exhaustive", "random"])
+    parser.add_argument("--plays", type=int, default=1_000_000, help="random 모드의 플레이 수")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="random 모드의 프로세스 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fixed-conditions", action="store_true", help="숨겨진 상태를 시나리오 기본값으로 고정")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    parser.add_argument("--show-table", action="store_true", help="미리 계산된 결과표만 출력")
+    args = parser.parse_args()
+
+    if args.show_table:
+        table = get_scenario(args.scenario)["outcomes"]
+        print("약물           " + " ".join(feature[:4] for feature in table["features"]))
+        for row in outcome_table.table_rows(table):
+            flags = " ".join(f"{'O' if row[feature] else '.':<4}" for feature in table["features"])
+            print(f"{row['drug']:<14} {flags}  {row['score']:>5}  {row['severity']:<7}  {messages.text(row['message'])[:50]}")
+        return
+
+    started = time.perf_counter()
+    if args.mode == "exhaustive":
+        scores, outcomes = run_exhaustive(args.scenario, not args.fixed_conditions)
+    else:
+        scores, outcomes = run_random(args.scenario, args.plays, args.workers, args.seed, not args.fixed_conditions)
+    report = summarize(scores, outcomes, time.perf_counter() - started)
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""상담 경로 전체에서 기대 점수가 가장 높은 전략을 구하는 풀이기.
+
+학생은 환자의 숨겨진 상태를 모르므로, 학생이 아는 것(단계, 한 질문, 답변으로 알게 된
+정보)을 상태로 삼습니다. 이 상태는 SessionRecord의 (step, asked, discovered)로
+정해지며, 그 상태에서 가능한 숨겨진 상태들의 확률은 시나리오의 case_rates(반별
+케이스 풀과 같은 분포)를 사전 분포로 하고 지금까지의 답변과 맞지 않는 조합을 뺀
+것입니다. 각 선택의 결과는 engine 함수를 레코드 복사본에 그대로 실행해 구하므로
+점수 규칙이 게임과 항상 같습니다.
+
+상태마다 (남은 기대 점수, 가장 좋은 선택, 선택별 기대 점수)를 메모해 두는 표를
+시나리오마다 프로세스당 한 번 만들고, 결과 화면에서는 학생이 내린 결정들을 이 표에서
+찾아보기만 하고(비교 결과도 경로별로 메모), 학생의 손실(regret)은 결정마다 '가장 좋은 선택의 기대 점수 -
+고른 선택의 기대 점수'를 더한 값입니다.
+
+    python solver.py --scenario warfarin_implant
+"""
+
+import argparse
+import threading
+import time
+
+import engine
+import simulate
+from scenario import PAINKILLERS, SCENARIOS, get_scenario
+from session_record import ACTION_IDS, DRUG_IDS, EV_ACTION, EV_DRUG, EV_QUESTION, QUESTION_IDS, decode_event
+
+_solutions = {}
+_solve_lock = threading.Lock()
+_reviews = {}  # (시나리오 id, 숨겨진 상태, 기록 바이트) -> review 결과. 가능한 경로 수만큼만 쌓임
+
+
+def state_key(record):
+    """학생이 아는 상태 (단계, 질문 비트, 알게 된 정보 비트)."""
+    return record.step, record.asked, record.discovered
+
+
+def prior(scenario):
+    """case_rates로 만든 숨겨진 상태 조합별 확률 [(확률, 조합)]. 확률이 0인 조합은 뺍니다."""
+    weighted = []
+    for conditions in simulate.condition_combinations(scenario):
+        probability = 1.0
+        for key, value in conditions.items():
+            rate = scenario["case_rates"][key]
+            probability *= rate if value else 1 - rate
+        if probability > 0:
+            weighted.append((probability, conditions))
+    return weighted
+
+
+def _solve(scenario, group, table):
+    """같은 상태에 있는 (확률, 레코드) 묶음의 남은 기대 점수를 구하고 표에 적습니다."""
+    key = state_key(group[0][1])
+    if key in table:
+        return table[key]["value"]
+    choices = simulate.step_choices(group[0][1], scenario)
+    if not choices:
+        table[key] = {"value": 0.0, "best": None, "q": {}}
+        return 0.0
+
+    total = sum(probability for probability, _ in group)
+    q = {}
+    for func, arg in choices:
+        expected = 0.0
+        children = {}
+        for probability, record in group:
+            branch = record.copy()
+            func(branch, scenario, arg)
+            expected += probability * (branch.safety_score - record.safety_score)
+            children.setdefault(state_key(branch), []).append((probability, branch))
+        for child in children.values():
+            expected += sum(probability for probability, _ in child) * _solve(scenario, child, table)
+        q[arg] = expected / total
+    best = max(q, key=q.get)
+    table[key] = {"value": q[best], "best": best, "q": q}
+    return q[best]
+
+
+def solve(scenario):
+    """시나리오의 상태별 풀이표 {상태: {"value", "best", "q"}}를 만듭니다."""
+    table = {}
+    group = [(probability, simulate.new_record(scenario, conditions)) for probability, conditions in prior(scenario)]
+    _solve(scenario, group, table)
+    return table
+
+
+def solution(scenario):
+    """시나리오의 풀이표 (프로세스당 한 번 계산)."""
+    table = _solutions.get(scenario["id"])
+    if table is None:
+        with _solve_lock:
+            table = _solutions.get(scenario["id"])
+            if table is None:
+                table = _solutions[scenario["id"]] = solve(scenario)
+    return table
+
+
+def choice_label(scenario, step, arg):
+    """선택 하나를 화면 문구로 바꿉니다."""
+    if step == "patient_presentation":
+        return scenario["questions"][arg]["text"]
+    if step == "drug_recommendation":
+        return PAINKILLERS[arg]
+    return engine.action_label(scenario, arg)
+
+
+def decisions(record):
+    """끝난 상담 기록에서 학생이 내린 결정(선택 인자)들을 순서대로 꺼냅니다."""
+    chosen = []
+    for code in record.history:
+        kind, arg = decode_event(code)
+        if kind == EV_QUESTION:
+            chosen.append(QUESTION_IDS[arg])
+        elif kind == EV_ACTION:
+            chosen.append(ACTION_IDS[arg])
+        elif kind == EV_DRUG:
+            chosen.append(DRUG_IDS[arg])
+    return chosen
+
+
+def start_score(scenario):
+    """상담 시작 점수."""
+    return engine.initialize_session(scenario).safety_score
+
+
+def _replay(scenario, record):
+    """같은 숨겨진 상태의 새 레코드 (환자 등장 단계)."""
+    replay = simulate.new_record(scenario)
+    replay.conditions = record.conditions
+    return replay
+
+
+def _apply(record, scenario, arg):
+    """현재 단계의 선택 arg를 레코드에 실행합니다."""
+    for func, choice in simulate.step_choices(record, scenario):
+        if choice == arg:
+            return func(record, scenario, arg)
+    raise ValueError(f"{record.step} 단계에서 고를 수 없는 선택입니다: {arg}")
+
+
+def optimal_path(scenario, record):
+    """이 환자에게 최적 전략을 따랐을 때의 (선택 문구 목록, 최종 점수)."""
+    table = solution(scenario)
+    replay = _replay(scenario, record)
+    labels = []
+    while True:
+        entry = table.get(state_key(replay))
+        if entry is None or entry["best"] is None:
+            break
+        labels.append(choice_label(scenario, replay.step, entry["best"]))
+        _apply(replay, scenario, entry["best"])
+    return labels, replay.safety_score
+
+
+def review(scenario, record):
+    """끝난 상담을 최적 전략과 비교합니다. 사전 분포 밖의 환자라 표에 없는 상태가 나오면 None.
+
+    value는 시작 점수를 더한 최종 점수 기준의 기대값입니다. 같은 경로는 한 번만 계산합니다.
+    """
+    key = (scenario["id"], record.conditions, record.history.tobytes())
+    if key not in _reviews:
+        _reviews[key] = _review(scenario, record)
+    return _reviews[key]
+
+
+def _review(scenario, record):
+    table = solution(scenario)
+    replay = _replay(scenario, record)
+    start = table.get(state_key(replay))
+    if start is None:
+        return None
+    mistakes = []
+    for arg in decisions(record):
+        entry = table.get(state_key(replay))
+        if entry is None or arg not in entry["q"]:
+            return None
+        loss = entry["value"] - entry["q"][arg]
+        if loss > 1e-9:
+            mistakes.append({
+                "chosen": choice_label(scenario, replay.step, arg),
+                "best": choice_label(scenario, replay.step, entry["best"]),
+                "loss": loss,
+            })
+        _apply(replay, scenario, arg)
+    regret = sum(mistake["loss"] for mistake in mistakes)
+    path, score = optimal_path(scenario, record)
+    return {
+        "optimal_value": start_score(scenario) + start["value"],
+        "your_value": start_score(scenario) + start["value"] - regret,
+        "regret": regret,
+        "mistakes": mistakes,
+        "optimal_path": path,
+        "optimal_score": score,
+    }
+
+
+def print_policy(scenario, table):
+    """사전 분포의 가장 흔한 환자부터 최적 전략을 따라가며 보여줍니다."""
+    start = state_key(simulate.new_record(scenario))
+    print(f"[{scenario['id']}] 상태 {len(table)}개, 최적 전략의 기대 최종 점수 {start_score(scenario) + table[start]['value']:.1f}")
+    for probability, conditions in sorted(prior(scenario), key=lambda item: -item[0]):
+        record = simulate.new_record(scenario, conditions)
+        labels, score = optimal_path(scenario, record)
+        print(f"  환자 {conditions} (확률 {probability:.2f}) -> 점수 {score}")
+        for label in labels:
+            print(f"    - {label}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="상담 경로의 최적 전략과 기대 점수 계산")
+    parser.add_argument("--scenario", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS))
+    args = parser.parse_args()
+    for scenario_id in args.scenario:
+        scenario = get_scenario(scenario_id)
+        started = time.perf_counter()
+        table = solution(scenario)
+        elapsed = time.perf_counter() - started
+        print_policy(scenario, table)
+        print(f"  (풀이 {elapsed * 1000:.1f}ms)")
+
+
+if __name__ == "__main__":
+    main()
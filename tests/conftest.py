@@ -0,0 +1,6 @@
+"""저장소 최상위의 모듈(scenario, engine 등)을 테스트에서 바로 불러오도록 경로를 더합니다."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
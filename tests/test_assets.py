@@ -0,0 +1,15 @@
+"""이미지 디스크 캐시 파일 이름이 원본마다 따로 정해지는지 확인합니다."""
+
+import os
+
+import assets
+
+
+def test_same_basename_in_different_folders_does_not_collide():
+    assert assets._disk_path("image/a.png", 704) != assets._disk_path("image/old/a.png", 704)
+
+
+def test_absolute_and_relative_paths_share_a_cache_file():
+    absolute = os.path.join(assets.BASE_DIR, "image", "a.png")
+    assert assets._disk_path(absolute, 704) == assets._disk_path("image/a.png", 704)
+    assert assets._disk_path("image/a.png", 704) != assets._disk_path("image/a.png", 352)
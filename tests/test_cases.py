@@ -0,0 +1,22 @@
+"""주소에서 온 반 코드가 풀 메모리를 끝없이 늘리지 않는지 확인합니다."""
+
+import cases
+from scenario import get_scenario
+
+
+def test_class_codes_are_normalized():
+    assert cases.normalize_class_code(" 3A ") == "3A"
+    for value in (None, "", "   ", "x" * (cases.MAX_CLASS_CODE_LENGTH + 1), "3\tA"):
+        assert cases.normalize_class_code(value) is None
+
+
+def test_pools_are_bounded_and_reproducible(monkeypatch):
+    monkeypatch.setattr(cases, "MAX_POOLS", 4)
+    monkeypatch.setattr(cases, "_pools", type(cases._pools)())
+    scenario = get_scenario("warfarin")
+    first = cases.get_pool(scenario, "class-0")["masks"]
+    for number in range(1, 10):
+        cases.get_pool(scenario, f"class-{number}")
+    assert len(cases._pools) == 4
+    assert (scenario["id"], "class-0") not in cases._pools
+    assert (cases.get_pool(scenario, "class-0")["masks"] == first).all()  # 버린 풀도 같은 시드로 다시 만듦
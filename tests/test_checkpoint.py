@@ -0,0 +1,103 @@
+"""체크포인트 레코드가 저장 전 상태로 그대로 되돌아오는지 확인합니다."""
+
+import pytest
+
+import checkpoint
+import simulate
+from scenario import SCENARIOS, get_scenario
+
+
+def _state(record):
+    return (record.step, record.conditions, record.asked, record.discovered, record.safety_score, record.game_over,
+            list(record.history))
+
+
+def _every_record(scenario, conditions):
+    """시작부터 끝까지 거치는 모든 중간 상태의 레코드."""
+    stack = [simulate.new_record(scenario, conditions)]
+    while stack:
+        record = stack.pop()
+        yield record
+        for func, arg in simulate.step_choices(record, scenario):
+            branch = record.copy()
+            func(branch, scenario, arg)
+            stack.append(branch)
+
+
+@pytest.mark.parametrize("scenario_id", sorted(SCENARIOS))
+def test_pack_unpack_round_trip_at_every_step(scenario_id):
+    scenario = get_scenario(scenario_id)
+    for conditions in simulate.condition_combinations(scenario):
+        for record in _every_record(scenario, conditions):
+            for hint in (None, "current_meds"):
+                restored_id, restored, play, restored_hint = checkpoint.unpack(checkpoint.pack(scenario_id, record, 7, hint))
+                assert (restored_id, play, restored_hint) == (scenario_id, 7, hint)
+                assert _state(restored) == _state(record)
+
+
+def test_codes_cover_the_registry_and_keep_saved_numbers():
+    # 이미 저장된 체크포인트의 번호는 바뀌면 안 됨
+    assert checkpoint.SCENARIO_IDS[:2] == ("warfarin", "warfarin_implant")
+    assert checkpoint.STEP_IDS[:7] == (
+        "start", "patient_presentation", "first_question_follow_up", "action_decision",
+        "drug_recommendation", "simulation_result", "final_summary",
+    )
+    assert set(SCENARIOS) <= set(checkpoint.SCENARIO_IDS)
+    for spec in SCENARIOS.values():
+        for source, targets in spec["transitions"].items():
+            assert {source, *targets.values()} <= set(checkpoint.STEP_IDS)
+    # 새로 등록한 이름은 기존 번호 뒤에 붙음
+    assert checkpoint._codes(("a", "b"), ["b", "c", "a", "c"]) == ("a", "b", "c")
+
+
+def test_mid_play_round_trip():
+    scenario = get_scenario("warfarin_implant")
+    record = simulate.new_record(scenario, {"is_warfarin_user": True, "has_implant_soon": False})
+    simulate.step_choices(record, scenario)[1][0](record, scenario, "current_meds")
+    restored = checkpoint.unpack(checkpoint.pack(scenario["id"], record, 1, None))[1]
+    assert _state(restored) == _state(record)
+    assert not restored.game_over
+
+
+def test_unknown_version_is_ignored():
+    record = simulate.new_record(get_scenario("warfarin"))
+    data = bytearray(checkpoint.pack("warfarin", record, 1, None))
+    data[0] = checkpoint.VERSION + 1
+    assert checkpoint.unpack(bytes(data)) is None
+
+
+def test_unknown_scenario_code_is_ignored():
+    data = bytearray(checkpoint.pack("warfarin", simulate.new_record(get_scenario("warfarin")), 1, None))
+    data[1] = len(checkpoint.SCENARIO_IDS)
+    assert checkpoint.unpack(bytes(data)) is None
+
+
+def test_save_then_load(tmp_path, monkeypatch):
+    monkeypatch.setattr(checkpoint, "DB_PATH", str(tmp_path / "checkpoints.db"))
+    monkeypatch.setattr(checkpoint, "_conn", None)
+    scenario = get_scenario("warfarin")
+    record = next(simulate.enumerate_paths(scenario))
+    checkpoint.save("test-token", scenario["id"], record, 2, None)
+    checkpoint.flush()
+    checkpoint._cache.pop("test-token")
+    scenario_id, restored, play, _ = checkpoint.load("test-token")  # 메모리에 없으므로 SQLite에서 읽음
+    assert (scenario_id, play) == ("warfarin", 2) and _state(restored) == _state(record)
+    checkpoint._conn.close()
+
+
+def test_failed_write_is_retried(tmp_path, monkeypatch):
+    blocker = tmp_path / "not-a-folder"
+    blocker.write_text("")
+    monkeypatch.setattr(checkpoint, "DB_PATH", str(blocker / "checkpoints.db"))  # 폴더를 만들 수 없음
+    monkeypatch.setattr(checkpoint, "_conn", None)
+    record = simulate.new_record(get_scenario("warfarin"))
+    checkpoint.save("retry-token", "warfarin", record, 1, None)
+    with pytest.raises(OSError):
+        checkpoint.flush()
+    assert "retry-token" in checkpoint._writes.pending
+
+    monkeypatch.setattr(checkpoint, "DB_PATH", str(tmp_path / "checkpoints.db"))
+    checkpoint.flush()
+    checkpoint._cache.pop("retry-token")
+    assert checkpoint.load("retry-token")[0] == "warfarin"
+    checkpoint._conn.close()
@@ -0,0 +1,46 @@
+"""오늘 로그를 다시 읽을 때 잘못된 기록을 건너뛰고 나머지를 더하는지 확인합니다. (학급 통계, 힌트)"""
+
+import json
+
+import cohort
+import eventlog
+import simulate
+from scenario import get_scenario
+
+
+def test_load_log_skips_bad_entries(tmp_path):
+    scenario = get_scenario("warfarin")
+    record = next(record for record in simulate.enumerate_paths(scenario) if record.history)
+    good = eventlog.play_entry(record, "warfarin", "test-session", 1)
+    bad = [
+        dict(good, scenario="renamed_scenario"),
+        {key: value for key, value in good.items() if key != "asked_order"},
+        dict(good, outcome=len(scenario["outcome_rules"])),  # 예전 규칙의 번호
+        dict(good, outcome=-1),
+        dict(good, score=None),
+    ]
+    path = tmp_path / "plays.jsonl"
+    path.write_text("".join(json.dumps(entry) + "\n" for entry in [good, *bad, good]), encoding="utf-8")
+
+    before = cohort.snapshot("warfarin")
+    assert eventlog.replay(str(path), cohort.add_play) == (2, len(bad))
+    after = cohort.snapshot("warfarin")
+    assert after["plays"] - before["plays"] == 2
+    assert after["score_sum"] - before["score_sum"] == 2 * good["score"]
+    assert sum(after["outcomes"].values()) == after["plays"]
+
+
+def test_hint_counters_skip_bad_entries(tmp_path):
+    import hints
+
+    scenario = get_scenario("warfarin")
+    good = eventlog.play_entry(next(simulate.enumerate_paths(scenario)), "warfarin", "test-session", 1)
+    path = tmp_path / "plays.jsonl"
+    bad = [dict(good, scenario="renamed_scenario"), {key: value for key, value in good.items() if key != "asked_order"}]
+    path.write_text("".join(json.dumps(entry) + "\n" for entry in [*bad, good]), encoding="utf-8")
+
+    before = hints.snapshot("warfarin")
+    assert hints.load_log(str(path)) == 1
+    after = hints.snapshot("warfarin")
+    for question_id in scenario["questions"]:
+        assert after[question_id]["plays"] - before.get(question_id, {"plays": 0})["plays"] == 1
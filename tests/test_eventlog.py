@@ -0,0 +1,34 @@
+"""로그 파일을 쓸 수 없어도 쓰기 스레드가 살아 있고, 다시 쓸 수 있게 되면 밀린 기록을 쓰는지 확인합니다."""
+
+import os
+import time
+
+import eventlog
+
+
+def _wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_writer_survives_write_errors_and_bounds_the_backlog(tmp_path, monkeypatch):
+    blocker = tmp_path / "not-a-folder"
+    blocker.write_text("")
+    monkeypatch.setattr(eventlog, "LOG_DIR", str(blocker / "logs"))  # 폴더를 만들 수 없음
+    monkeypatch.setattr(eventlog, "FLUSH_INTERVAL", 0.05)
+    monkeypatch.setattr(eventlog, "MAX_PENDING", 3)
+    dropped_before = eventlog.dropped()
+
+    for number in range(5):
+        eventlog.append({"ts": time.time(), "n": number})
+    _wait_until(lambda: eventlog.dropped() - dropped_before == 2)
+    assert eventlog.flush(1.0) is False  # 실패하는 동안 기다리지 않음
+
+    monkeypatch.setattr(eventlog, "LOG_DIR", str(tmp_path / "logs"))
+    assert eventlog.flush(5.0) is True
+    assert eventlog._writer.is_alive()
+    path = eventlog.log_path(time.time())
+    assert os.path.exists(path)
+    assert [entry["n"] for entry in eventlog.read_entries(path)] == [2, 3, 4]
@@ -0,0 +1,57 @@
+"""상호작용 지식 베이스가 결과 규칙과 맞고, 묻지 않은 정보를 드러내지 않는지 확인합니다."""
+
+import itertools
+
+import pytest
+
+import engine
+import interactions
+import messages
+import outcome_table
+import simulate
+from scenario import CONDITION_RISK_FACTORS, OUTCOME_FEATURES, PAINKILLERS, SCENARIOS, get_scenario
+
+
+def _interaction_notes(notes, locale=messages.DEFAULT_LOCALE):
+    return [content for _, content in messages.notes(notes, locale) if isinstance(content, str) and content.startswith("💊")]
+
+
+@pytest.mark.parametrize("scenario_id", sorted(SCENARIOS))
+def test_major_interactions_are_penalised(scenario_id):
+    """지식 베이스에서 중대한 상호작용인 (약, 실제 위험 요인) 조합은 결과 규칙에서도 감점입니다."""
+    scenario = get_scenario(scenario_id)
+    for values in itertools.product((False, True), repeat=len(OUTCOME_FEATURES)):
+        values = dict(zip(OUTCOME_FEATURES, values))
+        factors = [factor for key, factor in CONDITION_RISK_FACTORS.items() if values[key]]
+        for drug in PAINKILLERS:
+            if any(item["severity"] == "major" for item in interactions.check(drug, factors)):
+                score, _, _ = outcome_table.lookup(scenario["outcomes"], drug, values)
+                assert score < 0, (drug, values)
+
+
+def test_notes_only_for_discovered_risk_factors():
+    scenario = get_scenario("warfarin_implant")
+    conditions = {"is_warfarin_user": True, "has_implant_soon": True}
+
+    record = simulate.new_record(scenario, conditions)
+    engine.choose_first_question(record, scenario, "symptom_details")
+    engine.choose_follow_up(record, scenario, "go_to_drug_recommendation")
+    assert _interaction_notes(engine.recommend(record, scenario, "nsaids")) == []
+
+    record = simulate.new_record(scenario, conditions)
+    engine.choose_first_question(record, scenario, "current_meds")
+    engine.choose_follow_up(record, scenario, "go_to_drug_recommendation")
+    notes = _interaction_notes(engine.recommend(record, scenario, "nsaids"))
+    assert len(notes) == 1 and "항응고제" in notes[0]
+
+
+def test_notes_are_localized():
+    scenario = get_scenario("warfarin_implant")
+    record = simulate.new_record(scenario, {"is_warfarin_user": True, "has_implant_soon": False})
+    engine.choose_first_question(record, scenario, "current_meds")
+    engine.choose_follow_up(record, scenario, "go_to_drug_recommendation")
+    notes = _interaction_notes(engine.recommend(record, scenario, "nsaids"), "en")
+    assert notes == [
+        "💊 Interaction info (NSAIDs × anticoagulants (e.g. warfarin), major): Taken with anticoagulants such as warfarin, "
+        "it greatly raises the risk of serious bleeding, including gastrointestinal bleeding."
+    ]
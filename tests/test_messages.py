@@ -0,0 +1,48 @@
+"""메시지 카탈로그가 원문을 그대로 돌려주고, 번역이 없으면 한국어로 보여주는지 확인합니다."""
+
+import string
+
+import pytest
+
+import messages
+from scenario import UI_TEXTS
+
+
+@pytest.fixture
+def catalogs(tmp_path, monkeypatch):
+    monkeypatch.setattr(messages, "CATALOG_DIR", str(tmp_path))
+    monkeypatch.setattr(messages, "_catalogs", {})
+    return tmp_path
+
+
+def test_every_source_message_round_trips(catalogs):
+    for source in messages.source_messages():
+        assert messages.text(messages.message_id(source)) == source
+
+
+def test_english_catalog_is_translated(catalogs):
+    assert "en" in messages.locales()
+    greeting = messages.source_messages()[0]
+    translated = messages.text(messages.message_id(greeting), "en")
+    assert translated and translated != greeting
+
+
+def test_unknown_locale_falls_back_to_korean(catalogs):
+    source = messages.source_messages()[0]
+    assert messages.text(messages.message_id(source), "fr") == source
+    assert not (catalogs / "fr.bin").exists()
+
+
+def test_stale_catalog_is_rebuilt(catalogs):
+    source = messages.source_messages()[0]
+    messages.build("ko")
+    (catalogs / "ko.bin").write_bytes(b"broken")
+    assert messages.text(messages.message_id(source)) == source
+
+
+def test_ui_texts_are_translated_with_the_same_fields(catalogs):
+    fields = lambda template: {name for _, name, _, _ in string.Formatter().parse(template) if name}
+    for key, source in UI_TEXTS.items():
+        translated = messages.text(messages.message_id(source), "en")
+        assert translated != source, key
+        assert fields(translated) == fields(source), key
@@ -0,0 +1,20 @@
+"""실행 측정이 스크립트 스레드에서 파일을 쓰지 않고, flush()가 바뀐 통계만 쓰는지 확인합니다."""
+
+import json
+
+import metrics
+
+
+def test_track_run_does_not_write_and_flush_writes_changes(tmp_path, monkeypatch):
+    path = tmp_path / "metrics.json"
+    monkeypatch.setattr(metrics, "METRICS_PATH", str(path))
+    monkeypatch.setattr(metrics, "FLUSH_INTERVAL", 3600.0)
+    metrics._flushed_version = metrics._version  # 이전 측정은 이 테스트와 무관
+
+    with metrics.track_run("test-session", "test_step"):
+        metrics.count("images")
+    assert not path.exists()  # 실행이 끝나도 파일은 쓰기 스레드가 씀
+
+    assert metrics.flush() is True
+    assert json.loads(path.read_text(encoding="utf-8"))["steps"]["test_step"]["images"] == 1
+    assert metrics.flush() is False  # 바뀐 것이 없으면 다시 쓰지 않음
@@ -0,0 +1,19 @@
+"""학생 프로필이 시나리오에 있는 질문만 세는지 확인합니다."""
+
+import profiles
+import simulate
+from scenario import get_scenario
+
+
+def test_record_play_counts_only_scenario_questions(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiles, "DB_PATH", str(tmp_path / "learners.db"))
+    scenario = get_scenario("warfarin")
+    record = next(simulate.enumerate_paths(scenario))
+
+    profile = profiles.record_play("test-student", scenario, record)
+    assert profile["plays"] == 1
+    assert profile["questions"]["medical_history_check"] == {"asked": 0, "missed": 0, "critical_missed_last": False}
+    for question_id in scenario["questions"]:
+        stats = profile["questions"][question_id]
+        assert stats["asked"] + stats["missed"] == 1
+    profiles.flush()  # 임시 DB에 써 두어 종료 시 실제 DB로 쓰이지 않게 함
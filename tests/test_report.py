@@ -0,0 +1,40 @@
+"""보고서의 안내 문구와 목록 페이지가 고른 언어로 만들어지는지 확인합니다."""
+
+import engine
+import eventlog
+import report
+import simulate
+from scenario import get_scenario
+
+
+def _entry(follow_up):
+    scenario = get_scenario("warfarin_implant")
+    record = simulate.new_record(scenario, {"is_warfarin_user": True, "has_implant_soon": False})
+    engine.choose_first_question(record, scenario, "current_meds")
+    engine.choose_follow_up(record, scenario, follow_up)
+    if not record.game_over:
+        engine.recommend(record, scenario, "nsaids")
+    return eventlog.play_entry(record, scenario["id"], "0123456789abcdef", 2, class_code="3A")
+
+
+def test_english_report_has_no_korean_captions():
+    document = report.render_entry(_entry("go_to_drug_recommendation"), "en")
+    assert '<html lang="en">' in document
+    assert "<title>Consultation record - Patient taking warfarin + implant scheduled</title>" in document
+    assert "Class 3A" in document and "Attempt 2" in document
+    for source in ("상담 결과", "오늘의 상담 여정", "[결과]", "점수 변동", "번째 도전", "PDF로 저장"):
+        assert source not in document
+
+
+def test_senior_prefix_is_stripped_in_each_locale():
+    entry = _entry("ask_senior_pharmacist_early")
+    assert "(환자 정보를 듣고)" not in report.render_entry(entry)
+    assert "(after hearing about the patient)" not in report.render_entry(entry, "en")
+
+
+def test_index_page_uses_the_locale(tmp_path):
+    entries = [_entry("go_to_drug_recommendation")]
+    report.export_entries(entries, str(tmp_path), workers=1, locale="en")
+    index = (tmp_path / "index.html").read_text(encoding="utf-8")
+    assert '<html lang="en">' in index
+    assert "Consultation records (1 plays)" in index and "<th>Session</th>" in index
@@ -0,0 +1,68 @@
+"""시나리오 결과 규칙이 숨겨진 상태와 어긋나지 않는지 확인합니다."""
+
+import itertools
+
+import pytest
+
+import messages
+import outcome_table
+import simulate
+from scenario import OUTCOME_FEATURES, PAINKILLERS, SCENARIOS, get_scenario
+
+
+def combinations():
+    """결과표의 모든 (숨겨진 상태 + 질문 여부) 조합."""
+    for values in itertools.product((False, True), repeat=len(OUTCOME_FEATURES)):
+        yield dict(zip(OUTCOME_FEATURES, values))
+
+
+def outcome(scenario, drug, values):
+    """(점수 변동, 결과 메시지 문장, 효과)."""
+    table = scenario["outcomes"]
+    score, _, message_id = outcome_table.lookup(table, drug, values)
+    return score, messages.text(table["messages"][message_id]), table["effects"][message_id]
+
+
+@pytest.fixture(params=sorted(SCENARIOS))
+def scenario(request):
+    return get_scenario(request.param)
+
+
+def test_every_combination_has_a_rule(scenario):
+    assert (scenario["outcomes"]["message_id"] >= 0).all()
+    assert len(scenario["outcomes"]["score"]) == len(PAINKILLERS) << len(OUTCOME_FEATURES)
+
+
+def test_nsaids_for_warfarin_user_is_an_emergency(scenario):
+    for values in combinations():
+        if values["is_warfarin_user"]:
+            score, _, effects = outcome(scenario, "nsaids", values)
+            assert score < -50 and "emergency_image" in effects, values
+
+
+def test_warfarin_outcomes_only_for_warfarin_users(scenario):
+    """와파린 복용을 전제로 한 결과(응급실, 칭찬 풍선)는 실제 복용 환자에게만 나옵니다."""
+    for values, drug in itertools.product(combinations(), PAINKILLERS):
+        if not values["is_warfarin_user"]:
+            _, message, effects = outcome(scenario, drug, values)
+            assert not {"emergency_image", "balloons"} & set(effects), (drug, values, message)
+            assert "복용 중이었습니다" not in message and "복용 중인 환자에게" not in message, (drug, values)
+
+
+def test_unasked_warfarin_user_is_not_told_otherwise(scenario):
+    for values in combinations():
+        if values["is_warfarin_user"]:
+            _, message, _ = outcome(scenario, "nsaids", values)
+            assert "복용하고 있지 않았" not in message, values
+
+
+def test_case_rates_cover_scenario_conditions(scenario):
+    assert set(scenario["case_rates"]) == set(scenario["conditions"])
+    assert all(0.0 <= rate <= 1.0 for rate in scenario["case_rates"].values())
+
+
+def test_every_path_ends_with_a_known_score(scenario):
+    for conditions in simulate.condition_combinations(scenario):
+        for record in simulate.enumerate_paths(scenario, conditions):
+            assert record.game_over
+            assert simulate.outcome_label(record, scenario)
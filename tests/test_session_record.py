@@ -0,0 +1,51 @@
+"""SessionRecord의 비트 필드와 이벤트 코드가 값을 잃지 않는지 확인합니다."""
+
+import pytest
+
+from session_record import (
+    CONDITION_KEYS, DISCOVERED_KEYS, EV_ANSWER, EV_RESULT, EV_SENIOR, FLAG_KEYS, MAX_HISTORY, SessionRecord,
+    decode_event, encode_event,
+)
+
+
+@pytest.mark.parametrize("kind", range(EV_SENIOR + 1))
+@pytest.mark.parametrize("arg", [0, 1, 0x7FF, 0xFFF])
+def test_event_code_round_trip(kind, arg):
+    code = encode_event(kind, arg)
+    assert 0 <= code <= 0xFFFF  # array("H")에 들어가야 함
+    assert decode_event(code) == (kind, arg)
+
+
+def test_bits_are_independent():
+    record = SessionRecord({CONDITION_KEYS[0]: True})
+    assert record.condition(CONDITION_KEYS[0]) and not record.condition(CONDITION_KEYS[1])
+    record.set_condition(CONDITION_KEYS[0], False)
+    record.set_condition(CONDITION_KEYS[1], True)
+    assert not record.condition(CONDITION_KEYS[0]) and record.condition(CONDITION_KEYS[1])
+
+    record.mark_asked(FLAG_KEYS[-1])
+    record.reveal(DISCOVERED_KEYS[0])
+    assert [record.was_asked(flag) for flag in FLAG_KEYS] == [flag == FLAG_KEYS[-1] for flag in FLAG_KEYS]
+    assert [record.revealed(key) for key in DISCOVERED_KEYS] == [key == DISCOVERED_KEYS[0] for key in DISCOVERED_KEYS]
+    assert record.feature_values()[FLAG_KEYS[-1]] is True
+
+
+def test_history_keeps_only_the_latest_events():
+    record = SessionRecord()
+    assert record.last_event() == (None, None)
+    for arg in range(MAX_HISTORY + 5):
+        record.add_event(EV_ANSWER, arg)
+    assert len(record.history) == MAX_HISTORY
+    assert decode_event(record.history[0]) == (EV_ANSWER, 5)
+    assert record.last_event() == (EV_ANSWER, MAX_HISTORY + 4)
+
+
+def test_copy_does_not_share_history():
+    record = SessionRecord({CONDITION_KEYS[0]: True})
+    record.add_event(EV_ANSWER, 1)
+    clone = record.copy()
+    clone.add_event(EV_RESULT, 2)
+    clone.mark_asked(FLAG_KEYS[0])
+    clone.safety_score -= 10
+    assert len(record.history) == 1 and not record.was_asked(FLAG_KEYS[0]) and record.safety_score == 50
+    assert clone.condition(CONDITION_KEYS[0]) and clone.last_event() == (EV_RESULT, 2)
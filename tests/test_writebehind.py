@@ -0,0 +1,46 @@
+"""쓰기에 실패해도 대기 중인 값이 남고 쓰기 스레드가 계속 도는지 확인합니다."""
+
+import sqlite3
+import threading
+
+import pytest
+
+from writebehind import WriteBehind
+
+
+def test_failed_flush_keeps_the_batch_and_newer_values_win():
+    written = []
+    fail = [True]
+
+    def write(batch):
+        if fail[0]:
+            raise sqlite3.OperationalError("database is locked")
+        written.extend(batch)
+
+    writes = WriteBehind("test-writer", write, 60.0)
+    writes.pending.update({"a": 1, "b": 1})
+    with pytest.raises(sqlite3.OperationalError):
+        writes.flush()
+    assert writes.pending == {"a": 1, "b": 1} and writes.failures == 1
+
+    writes.pending["a"] = 2  # 실패한 뒤 들어온 새 값
+    fail[0] = False
+    writes.flush()
+    assert sorted(written) == [("a", 2), ("b", 1)] and writes.pending == {}
+
+
+def test_writer_thread_survives_a_failed_write():
+    done = threading.Event()
+    calls = []
+
+    def write(batch):
+        calls.append(dict(batch))
+        if len(calls) == 1:
+            raise OSError("disk full")
+        done.set()
+
+    writes = WriteBehind("test-writer", write, 0.01)
+    writes.put("token", b"data")
+    assert done.wait(5.0)
+    assert calls == [{"token": b"data"}, {"token": b"data"}]
+    assert writes._thread.is_alive() and writes.pending == {}
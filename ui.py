@@ -0,0 +1,640 @@
+"""시나리오 데이터를 화면으로 그리는 Streamlit 렌더링 코드."""
+
+import uuid
+
+import streamlit as st
+
+import assets
+import checkpoint
+import engine
+import eventlog
+import messages
+import metrics
+from scenario import DEFAULT_SCENARIO, FOLLOW_UP_OPTIONS, SCENARIOS, SUMMARY_FOOTER, UNCLEAR_QUESTION_ANSWER, get_scenario
+
+# 특정 단계나 화면에서만 쓰는 모듈(cohort, cases, instructor, profiles, hints,
+# report, shift, intents, solver)은 그 단계에 처음 들어갈 때 함수 안에서 불러옵니다. 첫 화면을 그리는
+# 데 필요 없는 작업(오늘 로그 복원, 나무 학습 모듈 로드 등)을 콜드 스타트에서 빼기
+# 위해서입니다.
+
+# --- 이미지 파일 경로 (실제 파일 준비 필요) ---
+# 이미지는 그 이미지를 쓰는 단계에 처음 들어갈 때 인코딩되어 assets 캐시에 남습니다.
+IMAGE_PATH_PHARMACY = "image/pharmacy_counter.png"
+IMAGE_PATH_EMERGENCY = "image/emergency_room.png"
+IMAGE_PATH_DECISION_TREE = "image/simple_decision_tree.png"
+
+# 바쁜 근무 모드의 결과표에 쓰는 숨겨진 상태 이름
+CONDITION_LABELS = {"is_warfarin_user": "와파린 복용", "has_implant_soon": "임플란트 예정"}
+
+
+# --- 공통 표시 함수 ---
+def localized(value):
+    """메시지 id(환자 대사, 피드백, 결과)를 이 세션의 언어(?lang=)로 바꿉니다. 문자열은 그대로."""
+    return messages.text(value, st.session_state.get("locale", messages.DEFAULT_LOCALE))
+
+
+def ui_text(key, **values):
+    """scenario.UI_TEXTS의 안내 문구를 이 세션의 언어로 바꾸고 {이름} 자리를 채웁니다."""
+    return messages.ui_text(key, st.session_state.get("locale", messages.DEFAULT_LOCALE), **values)
+
+
+def show_image(path, caption, missing_message):
+    """캐시된 이미지를 표시하고, 파일이 없으면 안내 문구를 보여줍니다."""
+    try:
+        st.image(assets.get_image_bytes(path), caption=caption)
+        metrics.count("images")
+    except FileNotFoundError:
+        st.info(missing_message)
+
+
+def show_markdown(body, **kwargs):
+    """st.markdown과 같지만 표시 횟수를 측정합니다."""
+    st.markdown(body, **kwargs)
+    metrics.count("markdowns")
+
+
+def show_notes(notes):
+    """engine 함수가 돌려준 피드백 목록을 화면에 표시합니다."""
+    for kind, content in notes:
+        if kind == "patient":
+            show_markdown(f"#### {ui_text('patient')}\n> {localized(content)}", unsafe_allow_html=True)
+        elif kind == "senior":
+            show_markdown(f"#### {ui_text('senior')}\n> {localized(content)}", unsafe_allow_html=True)
+        elif kind == "emergency_image":
+            show_image(IMAGE_PATH_EMERGENCY, ui_text("emergency_caption"), "[이미지 경고] 'image/emergency_room.png' 파일을 찾을 수 없습니다.")
+        elif kind == "balloons":
+            st.balloons()
+        elif kind == "extra_advice":
+            st.info(ui_text("extra_advice"))
+        else:
+            getattr(st, kind)(localized(content))
+
+
+# --- 단계 전이 콜백 ---
+# 버튼의 on_click 콜백은 스크립트 실행 전에 호출되므로, 상태를 여기서 바꾸면
+# st.rerun() 없이 한 번의 실행으로 다음 단계가 그려집니다. 피드백은
+# st.session_state.flash에 쌓아 두었다가 다음 화면 맨 위에 표시합니다.
+# 한 판이 끝나면(결과 화면으로 넘어가면) 상담 기록을 이벤트 로그, 학급 통계,
+# 학생 프로필에 넘기고, 내려받을 보고서를 백그라운드에서 만들기 시작합니다.
+def _queue(scenario, notes):
+    st.session_state.flash = notes
+    record = st.session_state.record
+    if record.game_over:
+        import cohort
+        import hints
+        import profiles
+        import report
+
+        case = st.session_state.case
+        entry = eventlog.play_entry(
+            record, scenario["id"], st.session_state.session_id, st.session_state.playthrough_count,
+            st.session_state.hint, case["class"] if case else None,
+        )
+        eventlog.append(entry)
+        cohort.add_play(entry)
+        hints.add_entry(entry)
+        profiles.record_play(st.session_state.student_id, scenario, record)  # 파일 쓰기는 백그라운드에서
+        st.session_state.report = (report.file_name(entry), report.submit(entry, st.session_state.locale))
+        if st.session_state.get("shift"):
+            st.session_state.playthrough_count += 1  # 근무 중에는 환자 한 명이 한 판
+
+
+def _case_conditions():
+    case = st.session_state.case
+    return case["conditions"] if case else None
+
+
+def _start_play(scenario):
+    import hints
+    import profiles
+
+    # 학생 기록과 학급 통계로 이번 판에 보여줄 힌트를 판마다 한 번 고릅니다.
+    st.session_state.hint = hints.choose(scenario, profiles.load(st.session_state.student_id, scenario["id"]))
+    st.session_state.record = record = engine.initialize_session(scenario, _case_conditions())
+    engine.transition(record, scenario, "begin")
+
+
+def _start_shift(scenario):
+    import cases
+    import hints
+    import profiles
+    import shift
+
+    st.session_state.hint = hints.choose(scenario, profiles.load(st.session_state.student_id, scenario["id"]))
+    conditions = None
+    case = st.session_state.case
+    if case:  # 반 코드가 있으면 줄을 선 환자들도 반의 케이스 풀에서 차례로 배정
+        conditions = [cases.assign_case(scenario, case["class"])[1] for _ in range(shift.SHIFT_PATIENTS)]
+    st.session_state.shift = current_shift = shift.new_shift(scenario, conditions)
+    st.session_state.record = current_shift.record
+
+
+def _on_switch_patient(index):
+    current_shift = st.session_state.shift
+    current_shift.switch(index)
+    st.session_state.record = current_shift.record
+
+
+def _on_end_shift():
+    st.session_state.shift.end()
+
+
+def _on_leave_shift(scenario):
+    del st.session_state.shift
+    st.session_state.record = engine.initialize_session(scenario, _case_conditions())
+
+
+def _on_first_question(scenario):
+    question_id = scenario["first_options"][st.session_state.q1_choice_final_v2]
+    _queue(scenario, engine.choose_first_question(st.session_state.record, scenario, question_id))
+
+
+def _on_free_text(scenario, allowed, choose):
+    """직접 입력한 질문을 가장 가까운 질문으로 연결해 목록에서 고른 것과 똑같이 처리합니다."""
+    import intents
+
+    text = st.session_state.free_text_question.strip()
+    if not text:
+        return
+    matched = intents.match(text, allowed)
+    if matched is None:  # 단계는 그대로 두고 다시 물어보게 합니다.
+        st.session_state.flash = [
+            ("patient", messages.message_id(UNCLEAR_QUESTION_ANSWER)),
+            ("caption", messages.Template("unclear_question", {})),
+        ]
+        return
+    question_id = matched[0]
+    st.session_state.free_text_question = ""
+    asked = f"✍️ \"{text}\" → {scenario['questions'][question_id]['text']}"
+    _queue(scenario, [("caption", asked)] + choose(st.session_state.record, scenario, question_id))
+
+
+def _on_follow_up(scenario, options):
+    action = options[st.session_state.follow_up_choice_final_v2]
+    _queue(scenario, engine.choose_follow_up(st.session_state.record, scenario, action))
+
+
+def _on_action(scenario, labels):
+    action = labels[st.session_state.action_choice_dynamic_final_v2]
+    _queue(scenario, engine.choose_action(st.session_state.record, scenario, action))
+
+
+def _on_recommend(scenario):
+    drug = scenario["painkiller_options"][st.session_state.pk_choice_radio_final_v2]
+    _queue(scenario, engine.recommend(st.session_state.record, scenario, drug))
+
+
+def _on_restart(scenario):
+    st.session_state.playthrough_count += 1
+    _start_play(scenario)
+
+
+def _on_summary(scenario):
+    engine.transition(st.session_state.record, scenario, "summary")
+
+
+def _on_scenario_change():
+    """시나리오를 바꾸면 주소(?scenario=)를 맞추고 이번 판과 배정된 환자를 버립니다."""
+    scenario_id = st.session_state.scenario_choice
+    st.session_state.scenario_id = scenario_id
+    st.query_params["scenario"] = scenario_id
+    st.session_state.pop("record", None)
+    st.session_state.pop("case", None)
+
+
+def _on_locale_change():
+    st.session_state.locale = st.session_state.locale_choice
+    st.query_params["lang"] = st.session_state.locale
+
+
+def _on_resume_link():
+    """지금 주소에 학생 id와 체크포인트 토큰을 붙여, 이 주소로 다시 들어오면 하던 판과 기록이 이어지게 합니다."""
+    st.query_params["student"] = st.session_state.student_id
+    st.query_params["resume"] = st.session_state.resume_token
+
+
+def _on_new_session():
+    for key in list(st.session_state.keys()):
+        del st.session_state[key]
+    st.query_params.pop("resume", None)  # 끝난 판으로 되돌아가지 않도록 새 토큰을 받음 (링크는 다시 만듦)
+
+
+# --- 1. 시작 화면 ---
+def render_start(scenario, record):
+    st.title("💊 약물 상담 시뮬레이션: 숨겨진 단서를 찾아라!")
+    show_image(IMAGE_PATH_PHARMACY, ui_text("pharmacy_caption"), "[이미지: 약국 상담 데스크] 'image/pharmacy_counter.png' 파일을 찾을 수 없습니다.")
+    locale = st.session_state.locale
+    st.selectbox(
+        "환자 케이스를 고르세요:",
+        list(SCENARIOS),
+        index=list(SCENARIOS).index(scenario["id"]),
+        format_func=lambda scenario_id: messages.text(messages.message_id(SCENARIOS[scenario_id]["title"]), locale),
+        key="scenario_choice",
+        on_change=_on_scenario_change,
+    )
+    if len(messages.locales()) > 1:
+        st.selectbox(
+            "환자 대사 언어 (Language):", messages.locales(),
+            index=messages.locales().index(locale), key="locale_choice", on_change=_on_locale_change,
+        )
+    show_markdown(scenario["intro"])
+    case = st.session_state.case
+    if case:
+        st.caption(ui_text("case_caption", class_code=case["class"], number=case["number"] + 1))
+    st.button("시뮬레이션 시작하기", type="primary", on_click=_start_play, args=(scenario,))
+    st.button("⏱️ 바쁜 근무 모드로 시작하기 (여러 환자를 제한 시간 안에 상담)", on_click=_start_shift, args=(scenario,))
+
+
+# --- 직접 질문 입력 ---
+def render_free_text_question(scenario, allowed, choose):
+    """목록 대신 질문을 직접 입력하는 칸. allowed 질문 중 가장 가까운 것으로 choose를 부릅니다."""
+    st.text_input("또는 환자에게 할 질문을 직접 입력하세요:", key="free_text_question", placeholder="예: 요즘 드시는 약 있으세요?")
+    st.button(
+        "입력한 질문하기", key=f"ask_free_text_{st.session_state.record.step}",
+        on_click=_on_free_text, args=(scenario, allowed, choose),
+    )
+
+
+# --- 2. 환자 등장 및 초기 질문 ---
+def render_patient_presentation(scenario, record):
+    st.header("환자 방문")
+    show_markdown(f"### 환자:\n> {localized(scenario['patient_greeting'])}", unsafe_allow_html=True)
+
+    hint = st.session_state.hint
+    if hint:
+        st.info(localized(scenario["questions"][hint]["hint"]))
+
+    show_markdown("어떤 질문으로 상담을 시작하시겠습니까? (하나만 선택 가능)")
+    st.radio(
+        "첫 번째 질문을 선택하세요:",
+        list(scenario["first_options"].keys()),
+        key="q1_choice_final_v2"
+    )
+    st.button("선택한 질문하기", key="ask_q1_final_v2", on_click=_on_first_question, args=(scenario,))
+    render_free_text_question(scenario, set(scenario["first_options"].values()), engine.choose_first_question)
+
+
+# --- 2.5 첫 질문 후 행동 결정 ---
+def render_first_question_follow_up(scenario, record):
+    st.header("첫 질문 후 행동 선택")
+    st.write("환자의 첫 번째 답변을 들었습니다. 다음 행동을 선택하세요:")
+
+    if record.history:
+        last_entry = engine.expand_event(scenario, record.history[-1])
+        if last_entry["type"] == "환자 답변":
+            st.caption(ui_text("last_answer", answer=localized(last_entry["content"])))
+
+    options = {text: action for action, text in FOLLOW_UP_OPTIONS.items()}
+    st.radio(
+        "다음 행동을 선택하세요:",
+        list(options.keys()),
+        key="follow_up_choice_final_v2"
+    )
+    st.button("결정", key="confirm_follow_up_final_v2", on_click=_on_follow_up, args=(scenario, options))
+
+
+# --- 3. 추가 정보 수집 및 행동 결정 단계 ---
+def render_action_decision(scenario, record):
+    st.header("추가 정보 수집 및 행동 결정")
+    show_markdown("**현재까지 내가 알게 된 환자 정보 요약:**")
+    discovered = engine.discovered_info(record)
+    summary_texts = []
+    if discovered["warfarin_user_revealed"]:
+        summary_texts.append("와파린 복용 중")
+    if discovered["dental_implant_revealed"]:
+        summary_texts.append("다음 주 임플란트 예정")
+    if discovered["headache_details"]:
+        summary_texts.append(f"두통: {discovered['headache_details']}")
+    if discovered["headache_history_response"]:
+        summary_texts.append(f"두통 과거력: {discovered['headache_history_response']}")
+
+    if summary_texts:
+        for text in summary_texts:
+            st.success(f"- {text}")
+    else:
+        st.info("- 아직 환자에 대해 알게 된 주요 정보가 없습니다.")
+
+    show_markdown("어떤 행동을 하시겠습니까?")
+    actions = engine.available_actions(record, scenario)
+    if not any(action in scenario["action_labels"] for action in actions):
+        st.info("모든 주요 질문을 통해 정보를 수집한 것으로 보입니다. 이제 약물 추천 또는 전문가 상담을 고려하세요.")
+
+    labels = {engine.action_label(scenario, action): action for action in actions}
+    st.selectbox(
+        "행동을 선택하세요:",
+        list(labels.keys()),
+        key="action_choice_dynamic_final_v2"
+    )
+    st.button("선택한 행동 실행하기", key="execute_action_dynamic_final_v2", on_click=_on_action, args=(scenario, labels))
+    questions = {action for action in actions if action in scenario["questions"]}
+    if questions:
+        render_free_text_question(scenario, questions, engine.choose_action)
+
+
+# --- 4. 약물 추천 단계 ---
+def render_drug_recommendation(scenario, record):
+    st.header("진통제 추천")
+    show_markdown("어떤 종류의 진통제를 추천하시겠습니까?")
+    st.radio(
+        "추천할 진통제를 선택하세요:",
+        list(scenario["painkiller_options"].keys()),
+        key="pk_choice_radio_final_v2"
+    )
+    st.button("이 약으로 추천하기", key="confirm_pk_final_v2", on_click=_on_recommend, args=(scenario,))
+
+
+# --- 5. 시뮬레이션 결과 (게임 한 판 종료) ---
+def render_simulation_result(scenario, record):
+    if not record.game_over:
+        return
+    st.header(ui_text("result_header"))
+    st.metric(ui_text("final_score"), record.safety_score)
+    st.write(localized(engine.grade(record.safety_score)))
+
+    st.subheader(ui_text("journey_header"))
+    for entry in engine.expand_history(record, scenario):
+        content = localized(entry["content"])
+        if entry["type"] == "질문":
+            show_markdown(f"- **{ui_text('journey_question')}** {content}")
+        elif entry["type"] == "환자 답변":
+            show_markdown(f"  - <div style='font-size: 1.1em; margin-left: 20px;'><b>{ui_text('journey_patient')}</b> 🗣️ <i>{content}</i></div>", unsafe_allow_html=True)
+        elif entry["type"] == "약사 행동":
+            show_markdown(f"- **{ui_text('journey_action')}** {content}")
+        elif entry["type"] == "약물 추천":
+            show_markdown(f"- **{ui_text('journey_drug')}** {content}")
+        elif entry["type"] == "최종 결과":
+            show_markdown(f"- **{ui_text('journey_result')}** {content} {ui_text('score_change', change=entry.get('score_change', 0))}")
+        elif entry["type"] == "결과":
+            show_markdown(f"- <div style='font-size: 1.1em; margin-left: 20px;'><b>{ui_text('journey_senior')}</b> 🧑‍⚕️ <i>{content.replace(ui_text('senior_prefix'), '')}</i></div>", unsafe_allow_html=True)
+
+    render_optimal_comparison(scenario, record)
+    render_report_download()
+
+    current_shift = st.session_state.get("shift")
+    col1, col2 = st.columns(2)
+    if current_shift:
+        next_patient = current_shift.next_waiting()
+        with col1:
+            if next_patient is not None:
+                st.button(f"다음 환자 상담하기 (환자 {next_patient + 1})", key="next_patient", on_click=_on_switch_patient, args=(next_patient,))
+        with col2:
+            st.button("근무 마치고 결과 보기", key="end_shift", on_click=_on_end_shift)
+        return
+    with col1:
+        st.button("처음부터 다시 도전하기", key="restart_game_final_v2", on_click=_on_restart, args=(scenario,))
+    with col2:
+        st.button("학습 내용 정리 보기 및 시뮬레이션 종료", key="view_summary_and_exit_final_v2", on_click=_on_summary, args=(scenario,))
+
+
+def render_optimal_comparison(scenario, record):
+    """학생의 결정들을 최적 전략(solver의 풀이표)과 비교해 보여줍니다."""
+    import solver
+
+    review = solver.review(scenario, record)
+    if review is None:
+        return
+    st.subheader(ui_text("optimal_header"))
+    col1, col2 = st.columns(2)
+    col1.metric(ui_text("optimal_value"), f"{review['optimal_value']:.1f}")
+    col2.metric(ui_text("your_value"), f"{review['your_value']:.1f}", delta=f"{-review['regret']:.1f}" if review["mistakes"] else None)
+    st.caption(ui_text("optimal_caption"))
+    if not review["mistakes"]:
+        st.success(ui_text("all_optimal"))
+    for mistake in review["mistakes"]:
+        show_markdown(f"- {ui_text('mistake', **mistake)}")
+    with st.expander(ui_text("optimal_path", score=review["optimal_score"])):
+        show_markdown("\n".join(f"{index}. {label}" for index, label in enumerate(review["optimal_path"], 1)))
+
+
+def render_report_download():
+    """상담 기록 보고서가 다 만들어졌으면 내려받기 버튼을, 아직이면 안내 문구를 보여줍니다."""
+    name, future = st.session_state.report
+    if future.done():
+        st.download_button(
+            ui_text("report_download"),
+            future.result(),
+            file_name=name,
+            mime="text/html",
+            key="download_report",
+            on_click="ignore",  # 내려받기만 하고 화면은 다시 그리지 않음
+        )
+    else:
+        _wait_for_report(future)
+
+
+@st.fragment(run_every=0.5)
+def _wait_for_report(future):
+    """보고서가 준비될 때까지 이 부분만 다시 그리다가, 준비되면 화면 전체를 한 번 다시 그립니다."""
+    if future.done():
+        st.rerun()
+    st.caption(ui_text("report_waiting"))
+
+
+# --- 6. 최종 학습 정리 페이지 ---
+def render_final_summary(scenario, record):
+    st.header("학습 내용 정리: 머신러닝과의 연결")
+    show_markdown("""
+        여러 번의 시뮬레이션을 통해 환자 상담 과정을 경험해보셨습니다.
+        이러한 상담 과정은 머신러닝의 **'의사결정나무(Decision Tree)'** 모델이 작동하는 방식과 매우 유사합니다.
+        """)
+    show_image(IMAGE_PATH_DECISION_TREE, "간단한 의사결정나무 예시", "[이미지: 의사결정나무] 'image/simple_decision_tree.png' 파일을 찾을 수 없습니다.")
+    show_markdown(scenario["summary_markdown"])
+
+    import cohort
+
+    st.subheader(ui_text("tree_header"))
+    dot = cohort.learned_tree_dot(scenario["id"])
+    if dot:
+        st.caption(ui_text("tree_caption"))
+        st.graphviz_chart(dot)
+    else:
+        st.info(ui_text("tree_waiting", plays=cohort.MIN_TREE_PLAYS))
+    st.info(SUMMARY_FOOTER)
+
+    st.button("새로운 시뮬레이션 세션 시작하기 (모든 기록 초기화)", key="restart_new_session_final_v2", on_click=_on_new_session)
+
+
+# --- 바쁜 근무 모드 ---
+@st.fragment(run_every=1)
+def _shift_timer(current_shift):
+    """남은 근무 시간만 1초마다 다시 그립니다. 시간이 다 되면 화면 전체를 다시 그려 근무를 끝냅니다."""
+    remaining = current_shift.remaining()
+    if remaining == 0:
+        st.rerun()
+    minutes, seconds = divmod(int(remaining), 60)
+    st.progress(remaining / current_shift.budget_s, text=f"⏱️ 남은 근무 시간 {minutes}:{seconds:02d}")
+
+
+def render_shift_queue(current_shift):
+    """카운터에 줄을 선 환자들의 상태와 환자 바꾸기 버튼을 그립니다. (환자별 내용은 그리지 않음)"""
+    _shift_timer(current_shift)
+    for index, (column, patient) in enumerate(zip(st.columns(len(current_shift.records)), current_shift.records)):
+        if index == current_shift.active:
+            label, disabled = f"환자 {index + 1} · 🟢 상담 중", True
+        elif patient.game_over:
+            label, disabled = f"환자 {index + 1} · ✅ {patient.safety_score}점", True
+        else:
+            label, disabled = f"환자 {index + 1} · ⏳ 대기", False
+        column.button(label, key=f"shift_patient_{index}", disabled=disabled, on_click=_on_switch_patient, args=(index,))
+
+
+def render_shift_summary(scenario, current_shift):
+    """근무가 끝나면 환자별 결과와 합계를 보여줍니다."""
+    st.header("⏱️ 근무 결과")
+    used = current_shift.budget_s - current_shift.remaining()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("상담을 마친 환자", f"{current_shift.served()} / {len(current_shift.records)}")
+    col2.metric("점수 합계", current_shift.total_score())
+    col3.metric("근무 시간", f"{int(used) // 60}:{int(used) % 60:02d}")
+    st.dataframe(
+        [
+            {
+                "환자": f"환자 {index + 1}",
+                "숨겨진 상태": ", ".join(label for key, label in CONDITION_LABELS.items() if patient.condition(key)) or "없음",
+                "결과": f"{patient.safety_score}점" if patient.game_over else "상담 못 함 (시간 초과)",
+            }
+            for index, patient in enumerate(current_shift.records)
+        ],
+        hide_index=True,
+    )
+    st.button("일반 모드로 돌아가기", key="leave_shift", on_click=_on_leave_shift, args=(scenario,))
+
+
+def render_shift(scenario, current_shift):
+    """근무 중이면 대기열과 활성 환자의 단계만, 근무가 끝났으면 근무 결과를 그립니다."""
+    if current_shift.is_over():
+        render_shift_summary(scenario, current_shift)
+        return
+    render_shift_queue(current_shift)
+    STEP_RENDERERS[current_shift.record.step](scenario, current_shift.record)
+
+
+# --- 이어하기 링크 ---
+def render_resume_link():
+    """학생이 원할 때만 자기 기록을 이어 갈 주소를 만들어 줍니다."""
+    with st.sidebar:
+        linked = (st.query_params.get("student"), st.query_params.get("resume"))
+        if linked == (st.session_state.student_id, st.session_state.resume_token):
+            st.caption(ui_text("resume_linked"))
+        else:
+            st.button(ui_text("resume_button"), key="make_resume_link", on_click=_on_resume_link)
+
+
+# --- 관리자용 측정 패널 (?admin=1) ---
+def render_admin_panel():
+    """단계별/세션별 실행 비용을 사이드바에 표시합니다."""
+    with st.sidebar:
+        st.subheader("⏱️ 실행 비용 (프로세스 전체)")
+        st.dataframe(metrics.step_rows(), hide_index=True)
+        stats = metrics.session_stats(st.session_state.session_id)
+        st.caption(
+            f"이 세션: 실행 {stats['runs']}회 (st.rerun {stats['reruns']}회), "
+            f"이미지 {stats['images']}회, 마크다운 {stats['markdowns']}회, 총 {stats['total_s'] * 1000:.0f} ms"
+        )
+        if st.button("지금 파일로 저장", key="admin_flush_metrics"):
+            metrics.flush()
+            st.caption(f"저장됨: {metrics.METRICS_PATH}")
+
+
+# 단계 이름 -> 렌더링 함수 (단계 수와 관계없이 O(1) 조회)
+STEP_RENDERERS = {
+    "start": render_start,
+    "patient_presentation": render_patient_presentation,
+    "first_question_follow_up": render_first_question_follow_up,
+    "action_decision": render_action_decision,
+    "drug_recommendation": render_drug_recommendation,
+    "simulation_result": render_simulation_result,
+    "final_summary": render_final_summary,
+}
+
+
+# --- 페이지 렌더링 함수 ---
+def _resume(scenario):
+    """체크포인트가 있으면 이번 세션에 되살리고 True를 돌려줍니다. 다른 시나리오의 체크포인트는 무시합니다."""
+    saved = checkpoint.load(st.session_state.resume_token)
+    if saved is None or saved[0] != scenario["id"]:
+        return False
+    _, record, play, hint = saved
+    st.session_state.record = record
+    st.session_state.playthrough_count = play
+    st.session_state.hint = hint
+    if record.game_over:  # 로그와 통계에는 이미 들어갔으므로 내려받을 보고서만 다시 만듭니다.
+        import report
+
+        case = st.session_state.case
+        entry = eventlog.play_entry(record, scenario["id"], st.session_state.session_id, play, hint, case["class"] if case else None)
+        st.session_state.report = (report.file_name(entry), report.submit(entry, st.session_state.locale))
+    return True
+
+
+def render_page(default_scenario=DEFAULT_SCENARIO):
+    """현재 단계에 해당하는 렌더링 함수만 호출합니다.
+
+    시나리오는 ?scenario= 주소 또는 시작 화면의 선택지로 정하며, 없으면 default_scenario입니다.
+    """
+    if "scenario_id" not in st.session_state:
+        requested = st.query_params.get("scenario")
+        st.session_state.scenario_id = requested if requested in SCENARIOS else default_scenario
+    scenario = get_scenario(st.session_state.scenario_id)
+    # ?lang=언어 로 환자 대사/피드백/결과의 언어를 고릅니다. 번역 파일이 없는 언어는 기본 언어.
+    if "locale" not in st.session_state:
+        requested = st.query_params.get("lang")
+        st.session_state.locale = requested if requested in messages.locales() else messages.DEFAULT_LOCALE
+    if st.query_params.get("instructor") == "1":
+        import instructor
+
+        instructor.render_instructor_page(scenario)
+        return
+
+    # 익명 학생 id로 판 수와 힌트 기록을 구분합니다. 주소에 자동으로 붙이지 않으므로
+    # (강사가 주소를 반 전체에 나눠 주면 모두 같은 프로필이 되므로) 학생이 '이어하기
+    # 링크'를 만들었을 때만 ?student=로 주소에 남고, 그 주소로 다시 들어오면 기록이 이어집니다.
+    if "student_id" not in st.session_state:
+        st.session_state.student_id = st.query_params.get("student") or uuid.uuid4().hex[:12]
+    profile_key = (st.session_state.student_id, scenario["id"])
+    if st.session_state.get("profile_key") != profile_key:
+        import profiles
+
+        st.session_state.playthrough_count = profiles.load(*profile_key)["plays"] + 1
+        st.session_state.hint = None
+        st.session_state.profile_key = profile_key
+
+    # ?class=반코드 가 있으면 반별 케이스 풀에서 세션마다 환자를 한 명 배정합니다.
+    if "case" not in st.session_state:
+        class_code = st.query_params.get("class")
+        if class_code:
+            import cases
+
+            class_code = cases.normalize_class_code(class_code)
+        if class_code:
+            number, conditions = cases.assign_case(scenario, class_code)
+            st.session_state.case = {"class": class_code, "number": number, "conditions": conditions}
+        else:
+            st.session_state.case = None
+
+    if "session_id" not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
+
+    # 화면이 바뀔 때마다 진행 중인 판을 세션의 토큰으로 체크포인트에 남깁니다. 토큰도
+    # 이어하기 링크를 만들 때만 ?resume=로 주소에 붙으므로, 나눠 받은 주소를 연 여러
+    # 학생이 한 체크포인트를 이어 받거나 덮어쓰지 않습니다.
+    if "resume_token" not in st.session_state:
+        st.session_state.resume_token = st.query_params.get("resume") or uuid.uuid4().hex[:16]
+    if "record" not in st.session_state and not _resume(scenario):
+        st.session_state.record = engine.initialize_session(scenario, _case_conditions())
+
+    record = st.session_state.record
+    current_shift = st.session_state.get("shift")
+    if not current_shift:  # 바쁜 근무 모드의 여러 환자는 저장하지 않음
+        checkpoint.save(st.session_state.resume_token, scenario["id"], record, st.session_state.playthrough_count, st.session_state.hint)
+    step = "shift_summary" if current_shift and current_shift.is_over() else record.step
+    with metrics.track_run(st.session_state.session_id, step):
+        show_notes(st.session_state.pop("flash", []))
+        if current_shift:
+            render_shift(scenario, current_shift)
+        else:
+            STEP_RENDERERS[record.step](scenario, record)
+
+    render_resume_link()
+    if st.query_params.get("admin") == "1":
+        render_admin_panel()
@@ -0,0 +1,84 @@
+"""바뀐 값을 모아 두었다가 백그라운드 스레드가 한 번에 쓰는 write-behind 도우미.
+
+화면을 그리는 스레드는 put()으로 메모리의 대기 사전만 고치고 바로 돌아옵니다.
+쓰기 스레드는 깨어난 뒤 interval초 동안 더 모은 다음, 대기 중인 (키, 값) 묶음을
+write(batch) 한 번으로 씁니다 (보통 SQLite 트랜잭션 하나).
+
+쓰기가 실패하면(디스크 가득 참, DB 잠김 등) 그 묶음을 대기 사전에 되돌려 놓고
+로그를 남긴 뒤 interval초 뒤에 다시 씁니다. 그 사이에 같은 키로 새 값이 들어왔으면
+새 값이 남습니다. 쓰기 스레드는 실패해도 멈추지 않습니다.
+"""
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehind:
+    """키 -> 최신 값 대기 사전과 그것을 비우는 쓰기 스레드.
+
+    lock은 대기 사전을 지키는 잠금입니다. 모듈이 자기 메모리 캐시와 대기 사전을 함께
+    고쳐야 하면 모듈의 잠금을 넘기고, 그 잠금 안에서 pending을 직접 읽어도 됩니다.
+    """
+
+    def __init__(self, name, write, interval, lock=None):
+        self.name = name
+        self.write = write
+        self.interval = interval
+        self.lock = lock or threading.Lock()
+        self.pending = {}   # 아직 쓰지 않은 키 -> 값 (self.lock 안에서 읽고 씀)
+        self.failures = 0   # 실패한 쓰기 횟수
+        self._flush_lock = threading.Lock()  # 쓰기 스레드와 flush()가 겹치지 않도록
+        self._wake = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def put(self, key, value):
+        """값을 대기 사전에 넣고 쓰기 스레드를 깨웁니다. (self.lock 밖에서 호출)"""
+        with self.lock:
+            self.pending[key] = value
+        self.wake()
+
+    def wake(self):
+        """pending을 직접 고친 뒤 쓰기 스레드를 깨웁니다."""
+        self._ensure_thread()
+        self._wake.set()
+
+    def flush(self):
+        """대기 중인 값을 지금 씁니다. 실패하면 묶음을 되돌려 놓고 예외를 다시 일으킵니다."""
+        with self._flush_lock:
+            with self.lock:
+                batch = list(self.pending.items())
+                self.pending.clear()
+            if not batch:
+                return
+            try:
+                self.write(batch)
+            except Exception:
+                with self.lock:
+                    for key, value in batch:
+                        self.pending.setdefault(key, value)  # 그 사이 들어온 새 값이 우선
+                    self.failures += 1
+                raise
+
+    def _run(self):
+        """깨어나면 interval초 동안 더 모았다가 씁니다. 실패하면 interval초 뒤에 다시 씁니다."""
+        while True:
+            self._wake.wait()
+            time.sleep(self.interval)  # 그 사이에 바뀐 값들을 한 번에 모음
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("%s: 쓰기 실패, %d개를 다음에 다시 씁니다", self.name, len(self.pending))
+                self._wake.set()
+
+    def _ensure_thread(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()